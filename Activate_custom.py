@@ -62,6 +62,66 @@ def GetCustomActions(
 
     actions = []
 
+    # Toolchains registered for lazy extraction during Setup (see _lazy_toolchain.py) that haven't
+    # been extracted completely are made available via shims; the archive is extracted the first
+    # time that a shim is invoked. Verification is performed once the content exists (the
+    # completion marker is written after the verification manifest).
+    lazy_dirs = set()
+
+    for name, version, path_parts in _CUSTOM_DATA:
+        this_dir = os.path.join(*([_script_dir] + path_parts))
+
+        if (
+            os.path.isfile(os.path.join(this_dir, ".lazy_toolchain.json"))
+            and not os.path.isfile(os.path.join(this_dir, ".lazy_toolchain.complete"))
+        ):
+            actions.append(
+                CurrentShell.Commands.AugmentPath(
+                    os.path.join(_script_dir, "Generated", "LazyToolchainShims", "_".join(path_parts)),
+                ),
+            )
+
+            lazy_dirs.add(this_dir)
+
+    # npm uses a cache directory managed by this repository rather than the user's default
+    # cache; see Scripts/NpmCache.py for its size budget and hit rates.
+    actions.append(
+        CurrentShell.Commands.Set(
+            "npm_config_cache",
+            os.path.join(_script_dir, "Generated", "NpmCache"),
+        ),
+    )
+
+    # The code produced by V8 when compiling modules can be persisted and reused by subsequent
+    # invocations of Node (see Scripts/Impl/CompileCache.js). The cache is opt-in, as it replaces
+    # the way that Node compiles CommonJS modules in every Node process within the environment;
+    # it is enabled by setting 'COMMON_NODEJS_COMPILE_CACHE' before activation, either to the
+    # cache directory or to '1' for a directory (specific to the Node toolchain) within this
+    # repository. The script further partitions the cache by Node version and V8 flags.
+    node_options = os.getenv("NODE_OPTIONS", "")
+
+    # Node parses NODE_OPTIONS with its own rules, where a backslash within quotes escapes the
+    # character that follows it; forward slashes are used so that Windows paths aren't mangled.
+    require_option = '--require "{}"'.format(
+        os.path.join(_script_dir, "Scripts", "Impl", "CompileCache.js").replace("\\", "/"),
+    )
+
+    # Remove the option added by a previous activation, as the cache may have been disabled since
+    node_options = " ".join(node_options.replace(require_option, "").split())
+
+    compile_cache_dir = os.getenv("COMMON_NODEJS_COMPILE_CACHE", "")
+    if compile_cache_dir:
+        if compile_cache_dir == "1":
+            _, _, path_parts = _CUSTOM_DATA[-1]
+
+            compile_cache_dir = os.path.join(*([_script_dir, "Generated", "CompileCache"] + path_parts[1:]))
+
+            actions.append(CurrentShell.Commands.Set("COMMON_NODEJS_COMPILE_CACHE", compile_cache_dir))
+
+        node_options = "{} {}".format(node_options, require_option).strip()
+
+    actions.append(CurrentShell.Commands.Set("NODE_OPTIONS", node_options))
+
     if fast:
         actions.append(
             CurrentShell.Commands.Message(
@@ -71,20 +131,20 @@ def GetCustomActions(
             ),
         )
     else:
-        # Verify installations
+        # Verify installations. The verification manifest created during Setup is used to
+        # avoid re-hashing the content; the full verification performed by AcquireBinaries.py
+        # is used when the manifest doesn't exist.
         for name, version, path_parts in _CUSTOM_DATA:
             this_dir = os.path.join(*([_script_dir] + path_parts))
             assert os.path.isdir(this_dir), this_dir
 
+            if this_dir in lazy_dirs:
+                continue
+
             actions += [
                 CurrentShell.Commands.Execute(
                     'python "{script}" Verify "{name}" "{dir}" "{version}"'.format(
-                        script=os.path.join(
-                            os.getenv("DEVELOPMENT_ENVIRONMENT_FUNDAMENTAL"),
-                            "RepositoryBootstrap",
-                            "SetupAndActivate",
-                            "AcquireBinaries.py",
-                        ),
+                        script=os.path.join(_script_dir, "_verification_manifest.py"),
                         name=name,
                         dir=this_dir,
                         version=version,
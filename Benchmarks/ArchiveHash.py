@@ -0,0 +1,160 @@
+# ----------------------------------------------------------------------
+# |
+# |  ArchiveHash.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 14:06:13
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Compares the archive hashing engine used by Setup_custom.py with a single-threaded read loop"""
+
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import CommonEnvironment
+from CommonEnvironment import CommandLine
+from CommonEnvironment.StreamDecorator import StreamDecorator
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = CommonEnvironment.ThisFullpath()
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+sys.path.insert(0, os.path.dirname(_script_dir))
+import _archive_hash
+del sys.path[0]
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    size_mb=CommandLine.EntryPoint.Parameter("Size of the generated file"),
+    filename=CommandLine.EntryPoint.Parameter("Hash this file rather than a generated one"),
+    iterations=CommandLine.EntryPoint.Parameter("Number of times each method is run; the best time is reported"),
+)
+@CommandLine.Constraints(
+    size_mb=CommandLine.IntTypeInfo(
+        min=1,
+        arity="?",
+    ),
+    filename=CommandLine.FilenameTypeInfo(
+        arity="?",
+    ),
+    iterations=CommandLine.IntTypeInfo(
+        min=1,
+        arity="?",
+    ),
+    output_stream=None,
+)
+def EntryPoint(
+    size_mb=512,
+    filename=None,
+    iterations=3,
+    output_stream=sys.stdout,
+):
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        temp_dir = tempfile.mkdtemp()
+
+        try:
+            if filename is None:
+                filename = os.path.join(temp_dir, "Install.7z")
+
+                dm.stream.write("Generating a {} MB file...".format(size_mb))
+                with dm.stream.DoneManager():
+                    block = os.urandom(1024 * 1024)
+
+                    with open(filename, "wb") as f:
+                        for _ in range(size_mb):
+                            f.write(block)
+
+            cache_filename = os.path.join(temp_dir, "cache.json")
+
+            methods = [
+                ("Single-threaded (64 KB reads)", lambda: _HashSingleThreaded(filename)),
+                ("Pipelined reads", lambda: _archive_hash.HashFilePipelined(filename)),
+                ("Memory map", lambda: _archive_hash.HashFileMmap(filename)),
+                (
+                    "Cached",
+                    lambda: _archive_hash.HashFile(filename, cache_filename=cache_filename),
+                ),
+            ]
+
+            size = os.path.getsize(filename)
+
+            dm.stream.write("Hashing...")
+            with dm.stream.DoneManager() as this_dm:
+                this_dm.stream.write("\n{:<32} {:>10} {:>10}\n".format("Method", "ms", "MB/s"))
+
+                expected = None
+
+                for name, func in methods:
+                    best_time = None
+
+                    for _ in range(iterations):
+                        start = time.perf_counter()
+                        digest = func()
+                        elapsed = time.perf_counter() - start
+
+                        if best_time is None or elapsed < best_time:
+                            best_time = elapsed
+
+                    if expected is None:
+                        expected = digest
+                    elif digest != expected:
+                        this_dm.stream.write("ERROR: '{}' produced a different hash.\n".format(name))
+                        this_dm.result = -1
+
+                    this_dm.stream.write(
+                        "{:<32} {:>10.1f} {:>10.1f}\n".format(
+                            name,
+                            best_time * 1000,
+                            size / (1024.0 * 1024.0) / max(best_time, 1e-9),
+                        ),
+                    )
+
+        finally:
+            shutil.rmtree(temp_dir)
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _HashSingleThreaded(filename):
+    hasher = hashlib.sha256()
+
+    with open(filename, "rb") as f:
+        while True:
+            content = f.read(64 * 1024)
+            if not content:
+                break
+
+            hasher.update(content)
+
+    return hasher.hexdigest()
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(
+            CommandLine.Main()
+        )
+    except KeyboardInterrupt:
+        pass
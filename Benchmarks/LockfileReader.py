@@ -0,0 +1,167 @@
+# ----------------------------------------------------------------------
+# |
+# |  LockfileReader.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 10:05:38
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Compares the parse time and peak memory of the streaming lockfile reader with json.load"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import CommonEnvironment
+from CommonEnvironment import CommandLine
+from CommonEnvironment.StreamDecorator import StreamDecorator
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = CommonEnvironment.ThisFullpath()
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+import SyntheticLockfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(_script_dir), "Scripts"))
+from Impl.LockfileReader import ReadLockfile
+del sys.path[0]
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    num_packages=CommandLine.EntryPoint.Parameter("Sizes of the synthetic lockfiles to generate"),
+    iterations=CommandLine.EntryPoint.Parameter("Number of times each lockfile is parsed; the best time is reported"),
+)
+@CommandLine.Constraints(
+    num_packages=CommandLine.IntTypeInfo(
+        min=1,
+        arity="*",
+    ),
+    iterations=CommandLine.IntTypeInfo(
+        min=1,
+        arity="?",
+    ),
+    output_stream=None,
+)
+def EntryPoint(
+    num_packages=None,
+    iterations=3,
+    output_stream=sys.stdout,
+):
+    num_packages = num_packages or [1000, 10000, 50000]
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        temp_dir = tempfile.mkdtemp()
+
+        try:
+            fixtures = [("Templates", SyntheticLockfile.TEMPLATES_LOCKFILE)]
+
+            dm.stream.write("Generating lockfiles...")
+            with dm.stream.DoneManager():
+                for count in num_packages:
+                    for nested in [False, True]:
+                        for lockfile_version in [1, 3]:
+                            name = "{}{}_v{}".format(count, "_nested" if nested else "", lockfile_version)
+                            filename = os.path.join(temp_dir, "{}.json".format(name))
+
+                            SyntheticLockfile.Write(
+                                filename,
+                                count,
+                                nested=nested,
+                                lockfile_version=lockfile_version,
+                            )
+
+                            fixtures.append((name, filename))
+
+            dm.stream.write("Parsing...")
+            with dm.stream.DoneManager() as this_dm:
+                this_dm.stream.write(
+                    "\n{:<24} {:>10}  {:>12} {:>12}  {:>12} {:>12}\n".format(
+                        "Fixture",
+                        "Size (KB)",
+                        "json (ms)",
+                        "json (KB)",
+                        "stream (ms)",
+                        "stream (KB)",
+                    ),
+                )
+
+                for name, filename in fixtures:
+                    json_time, json_memory = _Measure(_JsonLoad, filename, iterations)
+                    stream_time, stream_memory = _Measure(ReadLockfile, filename, iterations)
+
+                    this_dm.stream.write(
+                        "{:<24} {:>10}  {:>12.1f} {:>12}  {:>12.1f} {:>12}\n".format(
+                            name,
+                            os.path.getsize(filename) // 1024,
+                            json_time * 1000,
+                            json_memory // 1024,
+                            stream_time * 1000,
+                            stream_memory // 1024,
+                        ),
+                    )
+
+        finally:
+            shutil.rmtree(temp_dir)
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _JsonLoad(filename):
+    with open(filename) as f:
+        return json.load(f)
+
+
+# ----------------------------------------------------------------------
+def _Measure(func, filename, iterations):
+    """Returns the best time and the peak memory allocated while invoking the function"""
+
+    best_time = None
+
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func(filename)
+        elapsed = time.perf_counter() - start
+
+        if best_time is None or elapsed < best_time:
+            best_time = elapsed
+
+    # Measure memory separately, as tracing allocations skews the timing results
+    tracemalloc.start()
+    try:
+        func(filename)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return best_time, peak
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(
+            CommandLine.Main()
+        )
+    except KeyboardInterrupt:
+        pass
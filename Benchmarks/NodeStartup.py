@@ -0,0 +1,235 @@
+# ----------------------------------------------------------------------
+# |
+# |  NodeStartup.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 19:43:52
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Measures the startup time of Node CLI tools in the Templates project (or another project with
+installed packages) with and without the persistent compile cache ('Scripts/Impl/CompileCache.js').
+
+Each command is run:
+
+    Uncached:   Without the compile cache
+    Cold:       With an empty compile cache (which includes the cost of writing the cache)
+    Warm:       With a compile cache populated by a previous run
+
+The tools are invoked with 'node' directly (rather than via npm or npx) so that only the
+startup of the tool itself is measured; the best time of each is reported.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import CommonEnvironment
+from CommonEnvironment import CommandLine
+from CommonEnvironment.StreamDecorator import StreamDecorator
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = CommonEnvironment.ThisFullpath()
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+DEFAULT_WORKING_DIR                         = os.path.join(os.path.dirname(_script_dir), "Templates")
+
+COMPILE_CACHE_SCRIPT                        = os.path.join(os.path.dirname(_script_dir), "Scripts", "Impl", "CompileCache.js")
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    command=CommandLine.EntryPoint.Parameter("Commands to measure; the first word of each is the name of an executable provided by an installed package"),
+    working_dir=CommandLine.EntryPoint.Parameter("Project whose packages have been installed"),
+    iterations=CommandLine.EntryPoint.Parameter("Number of times each command is run in each configuration; the best results are reported"),
+)
+@CommandLine.Constraints(
+    command=CommandLine.StringTypeInfo(
+        arity="*",
+    ),
+    working_dir=CommandLine.DirectoryTypeInfo(
+        arity="?",
+    ),
+    iterations=CommandLine.IntTypeInfo(
+        min=1,
+        arity="?",
+    ),
+    output_stream=None,
+)
+def EntryPoint(
+    command=None,
+    working_dir=DEFAULT_WORKING_DIR,
+    iterations=5,
+    output_stream=sys.stdout,
+):
+    commands = command or ["svelte-check", "snowpack build"]
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        if not os.path.isdir(os.path.join(working_dir, "node_modules")):
+            dm.stream.write(
+                "ERROR: The packages in '{}' have not been installed; run 'NpmInstall.py' first.\n".format(working_dir),
+            )
+            dm.result = -1
+
+            return dm.result
+
+        temp_dir = tempfile.mkdtemp()
+
+        try:
+            dm.stream.write("Measuring...")
+            with dm.stream.DoneManager() as this_dm:
+                this_dm.stream.write(
+                    "\n{:<30} {:>14} {:>14} {:>14} {:>10}\n".format(
+                        "Command",
+                        "Uncached (ms)",
+                        "Cold (ms)",
+                        "Warm (ms)",
+                        "Warm vs.",
+                    ),
+                )
+
+                for index, this_command in enumerate(commands):
+                    args = this_command.split()
+
+                    script = _FindBinScript(working_dir, args[0])
+                    if script is None:
+                        this_dm.stream.write("ERROR: '{}' is not provided by an installed package.\n".format(args[0]))
+                        this_dm.result = -1
+
+                        continue
+
+                    command_line = ["node", script] + args[1:]
+
+                    uncached_env = _CreateEnvironment(None)
+
+                    # ----------------------------------------------------------------------
+                    def RunCold():
+                        cache_dir = tempfile.mkdtemp(dir=temp_dir)
+
+                        try:
+                            return _Run(command_line, working_dir, _CreateEnvironment(cache_dir))
+                        finally:
+                            shutil.rmtree(cache_dir)
+
+                    # ----------------------------------------------------------------------
+
+                    warm_env = _CreateEnvironment(os.path.join(temp_dir, "warm_{}".format(index)))
+
+                    # Populate the cache used by the warm runs
+                    _Run(command_line, working_dir, warm_env)
+
+                    times = [
+                        min(_Run(command_line, working_dir, uncached_env) for _ in range(iterations)),
+                        min(RunCold() for _ in range(iterations)),
+                        min(_Run(command_line, working_dir, warm_env) for _ in range(iterations)),
+                    ]
+
+                    this_dm.stream.write(
+                        "{:<30} {:>14.1f} {:>14.1f} {:>14.1f} {:>10}\n".format(
+                            this_command,
+                            *(times + ["{:+.0f}%".format((times[2] - times[0]) / max(times[0], 1e-6) * 100)])
+                        ),
+                    )
+
+        finally:
+            shutil.rmtree(temp_dir)
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _FindBinScript(working_dir, bin_name):
+    """Returns the JavaScript file of the executable provided by a top-level package"""
+
+    node_modules_dir = os.path.join(working_dir, "node_modules")
+
+    package_dirs = []
+
+    for item in os.listdir(node_modules_dir):
+        fullpath = os.path.join(node_modules_dir, item)
+
+        if item.startswith("@"):
+            package_dirs += [os.path.join(fullpath, child) for child in os.listdir(fullpath)]
+        elif not item.startswith("."):
+            package_dirs.append(fullpath)
+
+    for package_dir in package_dirs:
+        try:
+            with open(os.path.join(package_dir, "package.json"), encoding="utf-8") as f:
+                content = json.load(f)
+        except (IOError, ValueError):
+            continue
+
+        bin_value = content.get("bin", None)
+
+        if isinstance(bin_value, str):
+            # The executable's name is the package name (without the scope)
+            bin_value = {content.get("name", "").split("/")[-1]: bin_value}
+
+        if isinstance(bin_value, dict) and bin_name in bin_value:
+            return os.path.join(package_dir, bin_value[bin_name])
+
+    return None
+
+
+# ----------------------------------------------------------------------
+def _CreateEnvironment(cache_dir):
+    env = dict(os.environ)
+
+    # Remove the compile cache configured by activation
+    env.pop("NODE_OPTIONS", None)
+    env.pop("COMMON_NODEJS_COMPILE_CACHE", None)
+
+    if cache_dir is not None:
+        env["NODE_OPTIONS"] = '--require "{}"'.format(COMPILE_CACHE_SCRIPT.replace("\\", "/"))
+        env["COMMON_NODEJS_COMPILE_CACHE"] = cache_dir
+
+    return env
+
+
+# ----------------------------------------------------------------------
+def _Run(command_line, working_dir, env):
+    """Returns the wall time in milliseconds"""
+
+    start = time.perf_counter()
+
+    # The result isn't checked, as tools like 'svelte-check' return non-zero values when they
+    # find problems in the project.
+    subprocess.call(
+        command_line,
+        cwd=working_dir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    return (time.perf_counter() - start) * 1000
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(
+            CommandLine.Main()
+        )
+    except KeyboardInterrupt:
+        pass
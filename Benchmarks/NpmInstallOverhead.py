@@ -0,0 +1,346 @@
+# ----------------------------------------------------------------------
+# |
+# |  NpmInstallOverhead.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 15:12:44
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Measures the overhead of NpmInstall.py (everything other than npm itself) for synthetic
+lockfiles and the Templates lockfile.
+
+A stub 'npm' executable is placed at the front of the PATH so that the benchmark runs offline
+and only measures the work done by NpmInstall.py. Times are measured without tracing memory
+allocations; the peak memory of each phase is measured during a separate run with tracemalloc
+enabled. Results can be saved as a baseline and compared against in subsequent runs.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import textwrap
+import tracemalloc
+
+from collections import OrderedDict
+
+import six
+
+import CommonEnvironment
+from CommonEnvironment import CommandLine
+from CommonEnvironment.StreamDecorator import StreamDecorator
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = CommonEnvironment.ThisFullpath()
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+import SyntheticLockfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(_script_dir), "Scripts"))
+import NpmInstall
+del sys.path[0]
+
+# ----------------------------------------------------------------------
+DEFAULT_BASELINE_FILENAME                   = os.path.join(os.path.dirname(_script_dir), "Generated", "Benchmarks", "NpmInstallOverhead.json")
+
+# Changes smaller than these are considered noise, regardless of the threshold
+_MIN_SIGNIFICANT_MS                         = 5.0
+_MIN_SIGNIFICANT_MB                         = 1.0
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    num_packages=CommandLine.EntryPoint.Parameter("Sizes of the synthetic lockfiles to generate"),
+    lockfile_version=CommandLine.EntryPoint.Parameter("Format version of the synthetic lockfiles"),
+    iterations=CommandLine.EntryPoint.Parameter("Number of times each install is run; the best results are reported"),
+    baseline_filename=CommandLine.EntryPoint.Parameter("Baseline results to compare against"),
+    update_baseline=CommandLine.EntryPoint.Parameter("Save these results as the new baseline"),
+    threshold=CommandLine.EntryPoint.Parameter("Percentage increase over the baseline that is considered a regression"),
+)
+@CommandLine.Constraints(
+    num_packages=CommandLine.IntTypeInfo(
+        min=1,
+        arity="*",
+    ),
+    lockfile_version=CommandLine.IntTypeInfo(
+        min=1,
+        max=3,
+        arity="?",
+    ),
+    iterations=CommandLine.IntTypeInfo(
+        min=1,
+        arity="?",
+    ),
+    baseline_filename=CommandLine.FilenameTypeInfo(
+        ensure_exists=False,
+        arity="?",
+    ),
+    threshold=CommandLine.IntTypeInfo(
+        min=0,
+        arity="?",
+    ),
+    output_stream=None,
+)
+def EntryPoint(
+    num_packages=None,
+    lockfile_version=1,
+    iterations=3,
+    baseline_filename=DEFAULT_BASELINE_FILENAME,
+    update_baseline=False,
+    threshold=20,
+    output_stream=sys.stdout,
+):
+    num_packages = num_packages or [100, 1000, 10000, 50000]
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        if os.path.isfile(baseline_filename) and not update_baseline:
+            with open(baseline_filename) as f:
+                baseline = json.load(f)
+        else:
+            baseline = {}
+
+        temp_dir = tempfile.mkdtemp()
+        original_path = os.environ.get("PATH", "")
+
+        try:
+            stub_dir = os.path.join(temp_dir, "bin")
+            _CreateStubNpm(stub_dir)
+
+            os.environ["PATH"] = os.pathsep.join([stub_dir, original_path])
+
+            fixtures = [("Templates", SyntheticLockfile.TEMPLATES_LOCKFILE)]
+
+            dm.stream.write("Generating lockfiles...")
+            with dm.stream.DoneManager():
+                for count in num_packages:
+                    for nested in [False, True]:
+                        name = "{}{}_v{}".format(count, "_nested" if nested else "", lockfile_version)
+                        filename = os.path.join(temp_dir, "{}.json".format(name))
+
+                        SyntheticLockfile.Write(
+                            filename,
+                            count,
+                            nested=nested,
+                            lockfile_version=lockfile_version,
+                        )
+
+                        fixtures.append((name, filename))
+
+            results = OrderedDict()
+            regressions = []
+
+            dm.stream.write("Installing...")
+            with dm.stream.DoneManager() as this_dm:
+                this_dm.stream.write(
+                    "\n{:<20} {:<24} {:>10} {:>10} {:>10}  {:>12} {:>12}\n".format(
+                        "Fixture",
+                        "Phase",
+                        "Wall (ms)",
+                        "CPU (ms)",
+                        "Peak (MB)",
+                        "Wall vs.",
+                        "Peak vs.",
+                    ),
+                )
+
+                for name, lockfile_filename in fixtures:
+                    project_dir = os.path.join(temp_dir, "projects", name)
+                    os.makedirs(project_dir)
+
+                    shutil.copyfile(lockfile_filename, os.path.join(project_dir, "package-lock.json"))
+
+                    phases = _Measure(project_dir, iterations)
+                    if phases is None:
+                        this_dm.stream.write("ERROR: The install of '{}' failed.\n".format(name))
+                        this_dm.result = -1
+
+                        continue
+
+                    results[name] = phases
+
+                    for phase_name, values in phases.items():
+                        baseline_values = baseline.get(name, {}).get(phase_name, {})
+
+                        comparisons = []
+
+                        for key, min_significant in [
+                            ("wall_ms", _MIN_SIGNIFICANT_MS),
+                            ("peak_mb", _MIN_SIGNIFICANT_MB),
+                        ]:
+                            value = values[key]
+                            baseline_value = baseline_values.get(key, None)
+
+                            if value is None or baseline_value is None:
+                                comparisons.append("-")
+                                continue
+
+                            comparison = "{:+.0f}%".format(
+                                (value - baseline_value) / max(baseline_value, 1e-6) * 100,
+                            )
+
+                            if (
+                                value - baseline_value > min_significant
+                                and value > baseline_value * (1 + threshold / 100.0)
+                            ):
+                                comparison += " !"
+                                regressions.append("{} / {} ({})".format(name, phase_name, key))
+
+                            comparisons.append(comparison)
+
+                        this_dm.stream.write(
+                            "{:<20} {:<24} {:>10.1f} {:>10.1f} {:>10}  {:>12} {:>12}\n".format(
+                                name,
+                                phase_name,
+                                values["wall_ms"],
+                                values["cpu_ms"],
+                                "-" if values["peak_mb"] is None else "{:.1f}".format(values["peak_mb"]),
+                                *comparisons
+                            ),
+                        )
+
+                    shutil.rmtree(project_dir)
+
+            if regressions:
+                dm.stream.write(
+                    "\nThe following phases regressed by more than {}%:\n{}\n".format(
+                        threshold,
+                        "".join("    - {}\n".format(regression) for regression in regressions),
+                    ),
+                )
+                dm.result = -1
+
+            if update_baseline:
+                dm.stream.write("Writing the baseline...")
+                with dm.stream.DoneManager():
+                    dirname = os.path.dirname(baseline_filename)
+                    if not os.path.isdir(dirname):
+                        os.makedirs(dirname)
+
+                    with open(baseline_filename, "w") as f:
+                        json.dump(results, f, indent=2)
+
+        finally:
+            os.environ["PATH"] = original_path
+            shutil.rmtree(temp_dir)
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _CreateStubNpm(stub_dir):
+    """Creates an 'npm' executable that does nothing more than create 'node_modules'"""
+
+    os.makedirs(stub_dir)
+
+    if sys.platform.startswith("win"):
+        with open(os.path.join(stub_dir, "npm.cmd"), "w") as f:
+            f.write(
+                textwrap.dedent(
+                    """\
+                    @echo off
+                    if not exist node_modules mkdir node_modules
+                    exit /b 0
+                    """,
+                ),
+            )
+    else:
+        filename = os.path.join(stub_dir, "npm")
+
+        with open(filename, "w") as f:
+            f.write(
+                textwrap.dedent(
+                    """\
+                    #!/bin/sh
+                    mkdir -p node_modules
+                    exit 0
+                    """,
+                ),
+            )
+
+        os.chmod(filename, 0o755)
+
+
+# ----------------------------------------------------------------------
+def _Measure(project_dir, iterations):
+    """Returns the best results for each phase or None if the install failed"""
+
+    metrics_filename = os.path.join(project_dir, "metrics.json")
+
+    # A private npm cache, so that the benchmark doesn't record usage in the user's npm cache
+    npm_cache_dir = os.path.join(project_dir, "npm_cache")
+    results = OrderedDict()
+
+    for iteration in range(iterations + 1):
+        # The last run measures memory, as tracing allocations skews the timing results
+        trace_memory = iteration == iterations
+
+        if trace_memory:
+            tracemalloc.start()
+
+        try:
+            result = NpmInstall.EntryPoint(
+                working_dir=[project_dir],
+                metrics_filename=metrics_filename,
+                npm_cache_dir=npm_cache_dir,
+                output_stream=six.moves.StringIO(),
+            )
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+
+        if result != 0:
+            return None
+
+        with open(metrics_filename) as f:
+            phases = json.load(f)["phases"]
+
+        for phase in phases:
+            phase_name = phase["labels"].get("npm_command", phase["phase"])
+
+            if trace_memory:
+                peak = phase["peak_traced_bytes"]
+                results[phase_name]["peak_mb"] = None if peak is None else peak / (1024.0 * 1024.0)
+
+                continue
+
+            values = {
+                "wall_ms": phase["wall_seconds"] * 1000,
+                "cpu_ms": phase["cpu_seconds"] * 1000,
+            }
+
+            existing = results.get(phase_name, None)
+            if existing is None:
+                results[phase_name] = values
+                continue
+
+            for key, value in values.items():
+                existing[key] = min(existing[key], value)
+
+    return results
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(
+            CommandLine.Main()
+        )
+    except KeyboardInterrupt:
+        pass
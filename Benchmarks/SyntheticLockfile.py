@@ -0,0 +1,274 @@
+# ----------------------------------------------------------------------
+# |
+# |  SyntheticLockfile.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 09:41:53
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Generates synthetic 'package-lock.json' files for use in benchmarks"""
+
+import base64
+import hashlib
+import json
+import os
+import sys
+
+from collections import OrderedDict
+
+import CommonEnvironment
+from CommonEnvironment import CommandLine
+from CommonEnvironment.StreamDecorator import StreamDecorator
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = CommonEnvironment.ThisFullpath()
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+TEMPLATES_LOCKFILE                          = os.path.join(os.path.dirname(_script_dir), "Templates", "package-lock.json")
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    num_packages=CommandLine.EntryPoint.Parameter("Total number of packages in the lockfile"),
+    nested=CommandLine.EntryPoint.Parameter("Generate deeply nested dependencies rather than a flat list"),
+    lockfile_version=CommandLine.EntryPoint.Parameter("Lockfile format version"),
+)
+@CommandLine.Constraints(
+    output_filename=CommandLine.FilenameTypeInfo(
+        ensure_exists=False,
+    ),
+    num_packages=CommandLine.IntTypeInfo(
+        min=1,
+    ),
+    lockfile_version=CommandLine.IntTypeInfo(
+        min=1,
+        max=3,
+        arity="?",
+    ),
+    output_stream=None,
+)
+def EntryPoint(
+    output_filename,
+    num_packages,
+    nested=False,
+    lockfile_version=1,
+    output_stream=sys.stdout,
+):
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        dm.stream.write("Writing '{}'...".format(output_filename))
+        with dm.stream.DoneManager():
+            Write(
+                output_filename,
+                num_packages,
+                nested=nested,
+                lockfile_version=lockfile_version,
+            )
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def Write(
+    output_filename,
+    num_packages,
+    nested=False,
+    lockfile_version=1,
+):
+    dirname = os.path.dirname(output_filename)
+    if dirname and not os.path.isdir(dirname):
+        os.makedirs(dirname)
+
+    with open(output_filename, "w") as f:
+        json.dump(
+            Generate(
+                num_packages,
+                nested=nested,
+                lockfile_version=lockfile_version,
+            ),
+            f,
+            indent=2,
+        )
+
+
+# ----------------------------------------------------------------------
+def Generate(
+    num_packages,
+    nested=False,
+    lockfile_version=1,
+    max_depth=8,
+):
+    """\
+    Returns the content of a lockfile with `num_packages` packages.
+
+    Flat lockfiles contain only top-level packages. Nested lockfiles contain top-level
+    packages for half of the total and place conflicting versions of those packages in
+    nested 'node_modules' directories (up to `max_depth` levels deep) for the remainder.
+    """
+
+    num_top_level = num_packages if not nested else max(1, (num_packages + 1) // 2)
+
+    names = ["synthetic-pkg-{:05}".format(index) for index in range(num_top_level)]
+
+    # path -> entry (v2-style)
+    packages = OrderedDict()
+
+    for index, name in enumerate(names):
+        entry = _CreateEntry(name, "1.0.{}".format(index % 10), index)
+
+        # Create a DAG by requiring a handful of packages that appear later in the list
+        requires = OrderedDict()
+
+        for offset in (1, 7, 31):
+            if index + offset < num_top_level and (index + offset) % 3 != 0:
+                requires[names[index + offset]] = "^1.0.0"
+
+        if requires:
+            entry["requires"] = requires
+
+        packages["node_modules/{}".format(name)] = entry
+
+    if nested:
+        parents = list(packages.keys())
+        index = 0
+
+        while len(packages) < num_packages:
+            index += 1
+
+            # Prefer recently added packages as parents so that the hierarchy gets deep
+            parent_path = parents[len(parents) - 1 - (index % 3)]
+
+            if parent_path.count("node_modules/") >= max_depth:
+                parent_path = parents[index % num_top_level]
+
+            name = names[(index * 13 + 5) % num_top_level]
+            path = "{}/node_modules/{}".format(parent_path, name)
+
+            if path in packages:
+                continue
+
+            packages[parent_path].setdefault("requires", OrderedDict())[name] = "^2.0.0"
+            packages[path] = _CreateEntry(name, "2.0.{}".format(index % 10), index)
+
+            parents.append(path)
+
+    dependencies = _ToDependencies(packages)
+
+    content = OrderedDict(
+        [
+            ("name", "synthetic"),
+            ("version", "1.0.0"),
+            ("lockfileVersion", lockfile_version),
+            ("requires", True),
+        ],
+    )
+
+    if lockfile_version >= 2:
+        packages_section = OrderedDict()
+
+        packages_section[""] = OrderedDict(
+            [
+                ("name", "synthetic"),
+                ("version", "1.0.0"),
+                (
+                    "dependencies",
+                    OrderedDict(
+                        (name, "^1.0.0") for index, name in enumerate(names) if index % 2 == 0
+                    ),
+                ),
+                (
+                    "devDependencies",
+                    OrderedDict(
+                        (name, "^1.0.0") for index, name in enumerate(names) if index % 2 == 1
+                    ),
+                ),
+            ],
+        )
+
+        for path, entry in packages.items():
+            entry = OrderedDict(entry)
+
+            requires = entry.pop("requires", None)
+            if requires:
+                entry["dependencies"] = requires
+
+            packages_section[path] = entry
+
+        content["packages"] = packages_section
+
+    if lockfile_version <= 2:
+        content["dependencies"] = dependencies
+
+    return content
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _CreateEntry(name, version, index):
+    integrity = base64.b64encode(
+        hashlib.sha512("{}@{}".format(name, version).encode("utf-8")).digest(),
+    ).decode("ascii")
+
+    entry = OrderedDict(
+        [
+            ("version", version),
+            (
+                "resolved",
+                "https://registry.npmjs.org/{name}/-/{name}-{version}.tgz".format(
+                    name=name,
+                    version=version,
+                ),
+            ),
+            ("integrity", "sha512-{}".format(integrity)),
+        ],
+    )
+
+    if index % 2 == 1:
+        entry["dev"] = True
+
+    return entry
+
+
+# ----------------------------------------------------------------------
+def _ToDependencies(packages):
+    """Converts v2-style paths into the v1 nested 'dependencies' structure"""
+
+    root = OrderedDict()
+
+    for path, entry in packages.items():
+        parts = path.split("/node_modules/")
+        parts[0] = parts[0][len("node_modules/"):]
+
+        container = root
+
+        for part in parts[:-1]:
+            container = container[part].setdefault("dependencies", OrderedDict())
+
+        container[parts[-1]] = OrderedDict(entry)
+
+    return root
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(
+            CommandLine.Main()
+        )
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,297 @@
+# ----------------------------------------------------------------------
+# |
+# |  BuildBudget.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 20:24:17
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Reports the raw, gzip, and brotli sizes of the chunks in a project's build output (created by
+'npm run build' or 'SnowpackBuild.py') and the modules that are included in more than one
+chunk, and checks the results against the budgets declared in the project's 'budgets.json'
+file (see 'Templates/budgets.json').
+
+Brotli sizes are only available when the 'brotli' python module is installed.
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+
+import CommonEnvironment
+from CommonEnvironment import CommandLine
+from CommonEnvironment.StreamDecorator import StreamDecorator
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = CommonEnvironment.ThisFullpath()
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+from Impl.BundleAnalyzer import AnalyzeChunks, BudgetException, CheckBudgets, FindDuplicateModules, ReadBudgets
+
+# ----------------------------------------------------------------------
+BUDGETS_FILENAME                            = "budgets.json"
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    working_dir=CommandLine.EntryPoint.Parameter("Directory of the project"),
+    build_dir=CommandLine.EntryPoint.Parameter("Name of the directory (relative to the project) that contains the build output"),
+    budgets_filename=CommandLine.EntryPoint.Parameter("Budgets to check against; '<working_dir>/budgets.json' is used if not provided"),
+    report_filename=CommandLine.EntryPoint.Parameter("Write the sizes, duplicate modules, and budget violations to this JSON file"),
+    max_duplicates=CommandLine.EntryPoint.Parameter("Maximum number of duplicate modules to display"),
+    jobs=CommandLine.EntryPoint.Parameter("Number of processes used to compress files"),
+)
+@CommandLine.Constraints(
+    working_dir=CommandLine.DirectoryTypeInfo(
+        arity="?",
+    ),
+    build_dir=CommandLine.StringTypeInfo(
+        arity="?",
+    ),
+    budgets_filename=CommandLine.FilenameTypeInfo(
+        arity="?",
+    ),
+    report_filename=CommandLine.FilenameTypeInfo(
+        ensure_exists=False,
+        arity="?",
+    ),
+    max_duplicates=CommandLine.IntTypeInfo(
+        min=0,
+        arity="?",
+    ),
+    jobs=CommandLine.IntTypeInfo(
+        min=1,
+        arity="?",
+    ),
+    output_stream=None,
+)
+def EntryPoint(
+    working_dir=None,
+    build_dir="build",
+    budgets_filename=None,
+    report_filename=None,
+    max_duplicates=20,
+    jobs=multiprocessing.cpu_count(),
+    output_stream=sys.stdout,
+    verbose=False,
+):
+    working_dir = working_dir or os.getcwd()
+    build_dir = os.path.join(working_dir, build_dir)
+
+    if budgets_filename is None:
+        budgets_filename = os.path.join(working_dir, BUDGETS_FILENAME)
+
+        if not os.path.isfile(budgets_filename):
+            budgets_filename = None
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        if not os.path.isdir(build_dir):
+            dm.stream.write("ERROR: '{}' does not exist; build the project first.\n".format(build_dir))
+            dm.result = -1
+
+            return dm.result
+
+        budgets = None
+
+        if budgets_filename is not None:
+            try:
+                budgets = ReadBudgets(budgets_filename)
+            except BudgetException as ex:
+                dm.stream.write("ERROR: {}.\n".format(ex))
+                dm.result = -1
+
+                return dm.result
+
+        dm.stream.write("Measuring chunks...")
+        with dm.stream.DoneManager() as this_dm:
+            chunks = AnalyzeChunks(build_dir, jobs=jobs)
+
+            this_dm.stream.write("{} files measured.\n".format(len(chunks)))
+
+        dm.stream.write("Finding duplicate modules...")
+        with dm.stream.DoneManager() as this_dm:
+            duplicates, num_mapped_chunks = FindDuplicateModules(build_dir, chunks)
+
+            if not num_mapped_chunks:
+                this_dm.stream.write("No source maps were found; duplicate modules can't be detected.\n")
+            else:
+                this_dm.stream.write(
+                    "{} duplicate modules found in {} chunks with source maps.\n".format(
+                        len(duplicates),
+                        num_mapped_chunks,
+                    ),
+                )
+
+        # Display the sizes
+        dm.stream.write(
+            "\n    {:<50} {:>12} {:>12} {:>12}\n".format("Chunk", "Raw (KB)", "Gzip (KB)", "Brotli (KB)"),
+        )
+
+        displayed_chunks = sorted(chunks, key=lambda chunk: (-chunk.gzip, chunk.path))
+        if not verbose:
+            # Markup and the like aren't interesting unless we are being verbose
+            displayed_chunks = [chunk for chunk in displayed_chunks if not chunk.path.endswith(".html")]
+
+        for chunk in displayed_chunks:
+            dm.stream.write(
+                "    {:<50} {:>12} {:>12} {:>12}\n".format(
+                    chunk.path,
+                    _FormatKB(chunk.raw),
+                    _FormatKB(chunk.gzip),
+                    _FormatKB(chunk.brotli),
+                ),
+            )
+
+        dm.stream.write(
+            "    {:<50} {:>12} {:>12} {:>12}\n".format(
+                "Total",
+                _FormatKB(sum(chunk.raw for chunk in chunks)),
+                _FormatKB(sum(chunk.gzip for chunk in chunks)),
+                _FormatKB(None if any(chunk.brotli is None for chunk in chunks) else sum(chunk.brotli for chunk in chunks)),
+            ),
+        )
+
+        if duplicates:
+            dm.stream.write(
+                "\nModules included in multiple chunks{}:\n\n".format(
+                    "" if len(duplicates) <= max_duplicates else " (displaying the first {})".format(max_duplicates),
+                ),
+            )
+
+            for module in duplicates[:max_duplicates]:
+                dm.stream.write(
+                    "    {}{}: {}\n".format(
+                        module.name,
+                        " ({} KB)".format(_FormatKB(module.size)) if module.size is not None else "",
+                        ", ".join(module.chunk_paths),
+                    ),
+                )
+
+        violations = []
+        unchecked = []
+
+        if budgets is None:
+            dm.stream.write("\nBudgets were not checked, as '{}' does not exist.\n".format(BUDGETS_FILENAME))
+        else:
+            violations, unchecked = CheckBudgets(
+                budgets,
+                chunks,
+                duplicates,
+                has_source_maps=num_mapped_chunks != 0,
+            )
+
+            if unchecked:
+                dm.stream.write("\n")
+
+                for description in unchecked:
+                    dm.stream.write("WARNING: The budget for {}.\n".format(description))
+
+            if not violations:
+                dm.stream.write("\nAll budgets in '{}' were met.\n".format(budgets_filename))
+            else:
+                dm.stream.write(
+                    "\n{} budgets in '{}' were exceeded:\n\n    {:<60} {:>12} {:>12} {:>24}\n".format(
+                        len(violations),
+                        budgets_filename,
+                        "Budget",
+                        "Actual",
+                        "Limit",
+                        "Difference",
+                    ),
+                )
+
+                for violation in violations:
+                    if violation.is_size:
+                        actual = "{} KB".format(_FormatKB(violation.actual))
+                        limit = "{} KB".format(_FormatKB(violation.limit))
+                        difference = "+{} KB".format(_FormatKB(violation.actual - violation.limit))
+                    else:
+                        actual = str(violation.actual)
+                        limit = str(violation.limit)
+                        difference = "+{}".format(violation.actual - violation.limit)
+
+                    if violation.limit:
+                        difference += " (+{:.1f}%)".format((violation.actual - violation.limit) * 100.0 / violation.limit)
+
+                    dm.stream.write(
+                        "    {:<60} {:>12} {:>12} {:>24}\n".format(
+                            violation.description,
+                            actual,
+                            limit,
+                            difference,
+                        ),
+                    )
+
+                dm.result = -1
+
+        if report_filename:
+            with open(report_filename, "w") as f:
+                json.dump(
+                    {
+                        "chunks": [
+                            {
+                                "path": chunk.path,
+                                "raw": chunk.raw,
+                                "gzip": chunk.gzip,
+                                "brotli": chunk.brotli,
+                            }
+                            for chunk in chunks
+                        ],
+                        "duplicate_modules": [
+                            {
+                                "name": module.name,
+                                "chunks": module.chunk_paths,
+                                "size": module.size,
+                            }
+                            for module in duplicates
+                        ],
+                        "violations": [
+                            {
+                                "budget": violation.description,
+                                "actual": violation.actual,
+                                "limit": violation.limit,
+                            }
+                            for violation in violations
+                        ],
+                        "unchecked": unchecked,
+                    },
+                    f,
+                    indent=2,
+                )
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _FormatKB(size):
+    if size is None:
+        return "-"
+
+    return "{:.1f}".format(size / 1024.0)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(
+            CommandLine.Main()
+        )
+    except KeyboardInterrupt:
+        pass
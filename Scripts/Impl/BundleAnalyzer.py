@@ -0,0 +1,361 @@
+# ----------------------------------------------------------------------
+# |
+# |  BundleAnalyzer.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 20:06:33
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Measures the chunks in build output, finds modules that are included in more than one chunk
+(via the chunks' source maps), and checks the results against budgets.
+"""
+
+import fnmatch
+import json
+import os
+import re
+import zlib
+
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import brotli
+except ImportError:
+    # Brotli sizes are not available
+    brotli = None
+
+# ----------------------------------------------------------------------
+# Files in the build output that are measured
+CHUNK_EXTENSIONS                            = [".js", ".mjs", ".css", ".html", ".wasm"]
+
+SIZE_TYPES                                  = ["raw", "gzip", "brotli"]
+
+# ----------------------------------------------------------------------
+class BudgetException(Exception):
+    pass
+
+
+# ----------------------------------------------------------------------
+class ChunkInfo(object):
+    """Sizes of a file in the build output"""
+
+    # ----------------------------------------------------------------------
+    def __init__(self, path, raw, gzip, brotli_size):
+        self.path                           = path          # Relative to the build dir, with '/' separators
+        self.raw                            = raw
+        self.gzip                           = gzip
+        self.brotli                         = brotli_size   # None if brotli isn't available
+
+
+# ----------------------------------------------------------------------
+class DuplicateModule(object):
+    """A module that is included in more than one chunk"""
+
+    # ----------------------------------------------------------------------
+    def __init__(self, name, chunk_paths, size):
+        self.name                           = name
+        self.chunk_paths                    = chunk_paths
+        self.size                           = size          # Size of the module's source (or None if unknown)
+
+
+# ----------------------------------------------------------------------
+class Violation(object):
+    """A budget that was exceeded"""
+
+    # ----------------------------------------------------------------------
+    def __init__(self, description, actual, limit, is_size=True):
+        self.description                    = description
+        self.actual                         = actual
+        self.limit                          = limit
+        self.is_size                        = is_size       # Values are in bytes if True and counts if False
+
+
+# ----------------------------------------------------------------------
+def AnalyzeChunks(build_dir, jobs=None):
+    """Returns [ChunkInfo, ...] for the files in the build output, sorted by path"""
+
+    filenames = []
+
+    for root, directories, items in os.walk(build_dir):
+        directories.sort()
+
+        for item in sorted(items):
+            if os.path.splitext(item)[1] in CHUNK_EXTENSIONS:
+                filenames.append(os.path.join(root, item))
+
+    # Compression is CPU bound
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        sizes = list(executor.map(_MeasureFile, filenames, chunksize=8))
+
+    return [
+        ChunkInfo(
+            os.path.relpath(filename, build_dir).replace(os.path.sep, "/"),
+            *these_sizes
+        )
+        for filename, these_sizes in zip(filenames, sizes)
+    ]
+
+
+# ----------------------------------------------------------------------
+def FindDuplicateModules(build_dir, chunks):
+    """\
+    Returns ([DuplicateModule, ...], number of chunks with source maps).
+
+    Modules are identified by the 'sources' in each chunk's source map; modules within
+    'node_modules' are identified by their path relative to the (innermost) 'node_modules'
+    directory, so that the same module bundled from different locations is detected.
+    """
+
+    chunk_paths_by_module = defaultdict(set)
+    sizes = {}
+
+    num_mapped_chunks = 0
+
+    for chunk in chunks:
+        source_map = _ReadSourceMap(build_dir, chunk.path)
+        if source_map is None:
+            continue
+
+        num_mapped_chunks += 1
+
+        sources = source_map.get("sources", None) or []
+        sources_content = source_map.get("sourcesContent", None) or []
+
+        for index, source in enumerate(sources):
+            if not isinstance(source, str):
+                continue
+
+            name = _NormalizeSource(source)
+            if name is None:
+                continue
+
+            chunk_paths_by_module[name].add(chunk.path)
+
+            if index < len(sources_content) and isinstance(sources_content[index], str):
+                sizes[name] = len(sources_content[index].encode("utf-8"))
+
+    duplicates = [
+        DuplicateModule(name, sorted(chunk_paths), sizes.get(name, None))
+        for name, chunk_paths in chunk_paths_by_module.items()
+        if len(chunk_paths) > 1
+    ]
+
+    duplicates.sort(key=lambda module: (-(module.size or 0) * len(module.chunk_paths), module.name))
+
+    return duplicates, num_mapped_chunks
+
+
+# ----------------------------------------------------------------------
+def ReadBudgets(filename):
+    """\
+    Reads and validates a budgets file:
+
+        {
+            "chunks": [                     # Applied to each file that matches the pattern
+                { "pattern": "*.js", "gzip_kb": 100 }
+            ],
+            "totals": [                     # Applied to the sum of all files that match the pattern
+                { "pattern": "*.js", "raw_kb": 600, "gzip_kb": 200, "brotli_kb": 175 }
+            ],
+            "max_duplicate_modules": 0
+        }
+
+    Patterns are matched against paths relative to the build dir (with '/' separators) using
+    fnmatch, where '*' also matches '/'.
+    """
+
+    with open(filename, encoding="utf-8") as f:
+        try:
+            content = json.load(f)
+        except ValueError as ex:
+            raise BudgetException("'{}' is not valid JSON ({})".format(filename, ex))
+
+    if not isinstance(content, dict):
+        raise BudgetException("'{}' must contain an object".format(filename))
+
+    for key in ["chunks", "totals"]:
+        for budget in content.get(key, []):
+            if not isinstance(budget, dict) or not isinstance(budget.get("pattern", None), str):
+                raise BudgetException("Each '{}' budget must be an object with a 'pattern'".format(key))
+
+            for name, value in budget.items():
+                if name == "pattern":
+                    continue
+
+                if not name.endswith("_kb") or name[:-len("_kb")] not in SIZE_TYPES:
+                    raise BudgetException("'{}' is not a supported budget ({})".format(name, key))
+
+                if not isinstance(value, (int, float)) or value < 0:
+                    raise BudgetException("The '{}' budget must be a number that isn't negative ({})".format(name, key))
+
+    max_duplicates = content.get("max_duplicate_modules", None)
+    if max_duplicates is not None and (not isinstance(max_duplicates, int) or max_duplicates < 0):
+        raise BudgetException("'max_duplicate_modules' must be an integer that isn't negative")
+
+    return content
+
+
+# ----------------------------------------------------------------------
+def CheckBudgets(budgets, chunks, duplicates, has_source_maps=True):
+    """\
+    Returns ([Violation, ...], [unchecked description, ...]).
+
+    Budgets are unchecked when no files match their pattern, when their size isn't available
+    (brotli sizes when the 'brotli' module isn't installed), or when duplicate modules can't be
+    detected (`has_source_maps` is False).
+    """
+
+    violations = []
+    unchecked = []
+
+    for budget in budgets.get("chunks", []):
+        matches = [chunk for chunk in chunks if fnmatch.fnmatchcase(chunk.path, budget["pattern"])]
+
+        for size_type, limit in _EnumLimits(budget):
+            description = "chunk '{}' ({})".format(budget["pattern"], size_type)
+
+            if not matches:
+                unchecked.append("{} was not checked, as no files match".format(description))
+                continue
+
+            for chunk in matches:
+                actual = getattr(chunk, size_type)
+
+                if actual is None:
+                    unchecked.append("{} was not checked, as {} sizes are not available".format(description, size_type))
+                    break
+
+                if actual > limit:
+                    violations.append(
+                        Violation(
+                            "chunk '{}' ({})".format(chunk.path, size_type),
+                            actual,
+                            limit,
+                        ),
+                    )
+
+    for budget in budgets.get("totals", []):
+        matches = [chunk for chunk in chunks if fnmatch.fnmatchcase(chunk.path, budget["pattern"])]
+
+        for size_type, limit in _EnumLimits(budget):
+            description = "total '{}' ({})".format(budget["pattern"], size_type)
+
+            if not matches:
+                unchecked.append("{} was not checked, as no files match".format(description))
+                continue
+
+            sizes = [getattr(chunk, size_type) for chunk in matches]
+
+            if any(size is None for size in sizes):
+                unchecked.append("{} was not checked, as {} sizes are not available".format(description, size_type))
+                continue
+
+            actual = sum(sizes)
+
+            if actual > limit:
+                violations.append(Violation(description, actual, limit))
+
+    max_duplicates = budgets.get("max_duplicate_modules", None)
+    if max_duplicates is not None and not has_source_maps:
+        unchecked.append("duplicate modules was not checked, as there aren't any source maps")
+    elif max_duplicates is not None and len(duplicates) > max_duplicates:
+        violations.append(
+            Violation(
+                "duplicate modules",
+                len(duplicates),
+                max_duplicates,
+                is_size=False,
+            ),
+        )
+
+    return violations, unchecked
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _MeasureFile(filename):
+    with open(filename, "rb") as f:
+        content = f.read()
+
+    return (
+        len(content),
+        # 'gzip -9': the deflate stream with a gzip header and trailer (18 bytes) rather than a
+        # zlib header and trailer (6 bytes)
+        len(zlib.compress(content, 9)) - 6 + 18,
+        len(brotli.compress(content)) if brotli is not None else None,
+    )
+
+
+# ----------------------------------------------------------------------
+def _EnumLimits(budget):
+    for size_type in SIZE_TYPES:
+        value = budget.get("{}_kb".format(size_type), None)
+        if value is not None:
+            yield size_type, value * 1024
+
+
+# ----------------------------------------------------------------------
+_source_mapping_url_regex                   = re.compile(r"[#@]\s*sourceMappingURL\s*=\s*(\S+)")
+
+def _ReadSourceMap(build_dir, chunk_path):
+    chunk_filename = os.path.join(build_dir, *chunk_path.split("/"))
+
+    map_filename = "{}.map".format(chunk_filename)
+
+    if not os.path.isfile(map_filename):
+        # Look for the comment that references the map (it appears at the end of the file)
+        with open(chunk_filename, "rb") as f:
+            f.seek(max(0, os.path.getsize(chunk_filename) - 1024))
+            match = None
+
+            for match in _source_mapping_url_regex.finditer(f.read().decode("utf-8", errors="replace")):
+                pass
+
+        if match is None or match.group(1).startswith("data:"):
+            return None
+
+        map_filename = os.path.join(os.path.dirname(chunk_filename), *match.group(1).split("?")[0].split("/"))
+
+        if not os.path.isfile(map_filename):
+            return None
+
+    try:
+        with open(map_filename, encoding="utf-8") as f:
+            content = json.load(f)
+    except (IOError, ValueError):
+        return None
+
+    return content if isinstance(content, dict) else None
+
+
+# ----------------------------------------------------------------------
+def _NormalizeSource(source):
+    """'webpack:///./node_modules/svelte/internal/index.mjs?abcd' -> 'svelte/internal/index.mjs'"""
+
+    source = source.split("?")[0]
+
+    source = re.sub(r"^webpack://[^/]*/", "", source)
+    source = source.replace("\\", "/")
+
+    # Modules generated by the bundler (runtime, externals, etc.)
+    if source.startswith(("webpack/", "(webpack)", "external ")) or not source:
+        return None
+
+    index = source.rfind("node_modules/")
+    if index != -1:
+        return source[index + len("node_modules/"):]
+
+    while source.startswith(("./", "../")):
+        source = source[source.index("/") + 1:]
+
+    return source
@@ -0,0 +1,405 @@
+// ----------------------------------------------------------------------
+// |
+// |  CompileCache.js
+// |
+// |  David Brownell <db@DavidBrownell.com>
+// |      2026-10-18 19:21:08
+// |
+// ----------------------------------------------------------------------
+// |
+// |  Copyright David Brownell 2026
+// |  Distributed under the Boost Software License, Version 1.0. See
+// |  accompanying file LICENSE_1_0.txt or copy at
+// |  http://www.boost.org/LICENSE_1_0.txt.
+// |
+// ----------------------------------------------------------------------
+//
+// Preloaded (via 'NODE_OPTIONS=--require <this file>') by the activated environment when
+// 'COMMON_NODEJS_COMPILE_CACHE' is set before activation (see Activate_custom.py) so that
+// the V8 code produced when compiling CommonJS modules is persisted and reused by subsequent
+// processes, which avoids parsing and compiling tools (snowpack, svelte-check, tsc, etc.) from
+// scratch each time that they are started.
+//
+// Code is cached in the directory specified by the 'COMMON_NODEJS_COMPILE_CACHE' environment
+// variable, in a subdirectory specific to the Node version, architecture, and V8 flags. Each
+// module's entry is keyed by its filename and records the hash of its source; an entry is
+// replaced when the source changes (for example, when a tool is updated to a new version).
+// New and updated entries are written when the process exits.
+//
+// The cache is pruned when a process exits, at most once per day: entries for modules that no
+// longer exist (deleted or moved) are removed, and the least recently used entries are removed
+// until the cache is within its size limit (256 MB by default; override with the
+// 'COMMON_NODEJS_COMPILE_CACHE_MAX_SIZE_MB' environment variable).
+//
+// Node 22.1 and later provide this functionality natively ('module.enableCompileCache'),
+// which is used when it is available; the size limit applies to the native cache as well.
+//
+"use strict";
+
+const crypto = require("crypto");
+const fs = require("fs");
+const Module = require("module");
+const path = require("path");
+const vm = require("vm");
+
+// ----------------------------------------------------------------------
+function Initialize() {
+    const rootDir = process.env.COMMON_NODEJS_COMPILE_CACHE;
+    if (!rootDir) {
+        return;
+    }
+
+    const cacheDir = path.join(
+        rootDir,
+        [
+            process.version,
+            process.arch,
+            Hash(process.execArgv.concat(process.env.NODE_OPTIONS || "").join(" ")).substr(0, 8),
+        ].join("-"),
+    );
+
+    if (typeof Module.enableCompileCache === "function") {
+        Module.enableCompileCache(cacheDir);
+
+        process.once("exit", function () {
+            PruneIfNecessary(cacheDir, false);
+        });
+
+        return;
+    }
+
+    try {
+        fs.mkdirSync(cacheDir, { recursive: true });
+    } catch (ex) {
+        // The cache isn't available; modules are compiled as usual
+        return;
+    }
+
+    // filename -> { filename: <entry filename>, content: <Buffer> }
+    const pending = new Map();
+
+    // Entries that were used; their modification times are updated so that the least recently
+    // used entries are pruned first.
+    const used = [];
+
+    const originalCompile = Module.prototype._compile;
+
+    Module.prototype._compile = function (content, filename) {
+        // Modules that don't exist on disk (for example, code passed via '-e') aren't cached
+        if (!path.isAbsolute(filename)) {
+            return originalCompile.call(this, content, filename);
+        }
+
+        const entryFilename = path.join(cacheDir, Hash(filename));
+        const sourceHash = Hash(content);
+
+        const cachedData = ReadEntry(entryFilename, sourceHash);
+
+        let script;
+
+        try {
+            script = new vm.Script(Module.wrap(content), {
+                filename: filename,
+                cachedData: cachedData,
+            });
+        } catch (ex) {
+            // Let Node report the error (with its usual diagnostics)
+            return originalCompile.call(this, content, filename);
+        }
+
+        const compiledWrapper = script.runInThisContext({ displayErrors: true });
+
+        const dirname = path.dirname(filename);
+        const require = CreateRequire(this);
+
+        const result = compiledWrapper.call(
+            this.exports,
+            this.exports,
+            require,
+            this,
+            filename,
+            dirname,
+        );
+
+        // Create the code cache after the module has executed, so that it includes the functions
+        // that were compiled while the module was being initialized.
+        if (cachedData === undefined || script.cachedDataRejected) {
+            try {
+                pending.set(filename, {
+                    filename: entryFilename,
+                    content: CreateEntry(sourceHash, filename, script.createCachedData()),
+                });
+            } catch (ex) {
+                // The code can't be cached
+            }
+        } else {
+            used.push(entryFilename);
+        }
+
+        return result;
+    };
+
+    process.once("exit", function () {
+        for (const entry of pending.values()) {
+            WriteEntry(entry.filename, entry.content);
+        }
+
+        const now = new Date();
+
+        for (const entryFilename of used) {
+            try {
+                fs.utimesSync(entryFilename, now, now);
+            } catch (ex) {
+                // The entry was removed by another process
+            }
+        }
+
+        PruneIfNecessary(cacheDir, true);
+    });
+}
+
+// ----------------------------------------------------------------------
+// ----------------------------------------------------------------------
+// ----------------------------------------------------------------------
+const HASH_LENGTH = 40;
+
+// Entries are '<source hash><filename length (uint32, big endian)><filename (utf8)><cached data>'
+const HEADER_LENGTH = HASH_LENGTH + 4;
+
+const PRUNE_INTERVAL_MS = 24 * 60 * 60 * 1000;
+const PRUNE_FILENAME = ".last_prune";
+
+// Temporary files older than this were left behind by processes that were killed
+const TEMP_FILE_MAX_AGE_MS = 60 * 60 * 1000;
+
+const DEFAULT_MAX_SIZE_MB = 256;
+
+function Hash(value) {
+    return crypto.createHash("sha1").update(value).digest("hex");
+}
+
+// ----------------------------------------------------------------------
+function ReadEntry(entryFilename, sourceHash) {
+    let content;
+
+    try {
+        content = fs.readFileSync(entryFilename);
+    } catch (ex) {
+        return undefined;
+    }
+
+    if (content.length <= HEADER_LENGTH || content.toString("latin1", 0, HASH_LENGTH) !== sourceHash) {
+        return undefined;
+    }
+
+    const dataOffset = HEADER_LENGTH + content.readUInt32BE(HASH_LENGTH);
+    if (dataOffset >= content.length) {
+        return undefined;
+    }
+
+    return content.slice(dataOffset);
+}
+
+// ----------------------------------------------------------------------
+function CreateEntry(sourceHash, filename, cachedData) {
+    const filenameBuffer = Buffer.from(filename, "utf8");
+
+    const header = Buffer.alloc(HEADER_LENGTH);
+    header.write(sourceHash, 0, HASH_LENGTH, "latin1");
+    header.writeUInt32BE(filenameBuffer.length, HASH_LENGTH);
+
+    return Buffer.concat([header, filenameBuffer, cachedData]);
+}
+
+// ----------------------------------------------------------------------
+function ReadEntryFilename(entryFilename) {
+    // Returns the filename of the module that the entry was created for (or undefined if the
+    // entry isn't valid); only the entry's header is read.
+    let fd;
+
+    try {
+        fd = fs.openSync(entryFilename, "r");
+    } catch (ex) {
+        return undefined;
+    }
+
+    try {
+        const header = Buffer.alloc(HEADER_LENGTH);
+        if (fs.readSync(fd, header, 0, HEADER_LENGTH, 0) !== HEADER_LENGTH) {
+            return undefined;
+        }
+
+        const filenameBuffer = Buffer.alloc(header.readUInt32BE(HASH_LENGTH));
+        if (
+            filenameBuffer.length === 0
+            || fs.readSync(fd, filenameBuffer, 0, filenameBuffer.length, HEADER_LENGTH) !== filenameBuffer.length
+        ) {
+            return undefined;
+        }
+
+        return filenameBuffer.toString("utf8");
+    } catch (ex) {
+        return undefined;
+    } finally {
+        fs.closeSync(fd);
+    }
+}
+
+// ----------------------------------------------------------------------
+function WriteEntry(entryFilename, content) {
+    // Write to a temporary file and rename it so that concurrent processes never read a
+    // partially written entry.
+    const tempFilename = entryFilename + "." + process.pid + ".tmp";
+
+    try {
+        fs.writeFileSync(tempFilename, content);
+        fs.renameSync(tempFilename, entryFilename);
+    } catch (ex) {
+        try {
+            fs.unlinkSync(tempFilename);
+        } catch (ex) {
+            // The file wasn't created
+        }
+    }
+}
+
+// ----------------------------------------------------------------------
+function PruneIfNecessary(cacheDir, isManaged) {
+    // Pruning is skipped when the cache was pruned recently (by this or any other process)
+    const pruneFilename = path.join(cacheDir, PRUNE_FILENAME);
+    const now = Date.now();
+
+    try {
+        if (now - fs.statSync(pruneFilename).mtimeMs < PRUNE_INTERVAL_MS) {
+            return;
+        }
+    } catch (ex) {
+        // The cache hasn't been pruned
+    }
+
+    try {
+        fs.writeFileSync(pruneFilename, "");
+    } catch (ex) {
+        return;
+    }
+
+    let maxSize = parseFloat(process.env.COMMON_NODEJS_COMPILE_CACHE_MAX_SIZE_MB);
+    if (!(maxSize > 0)) {
+        maxSize = DEFAULT_MAX_SIZE_MB;
+    }
+
+    maxSize *= 1024 * 1024;
+
+    // [ { filename, size, mtimeMs }, ... ] for the entries that remain
+    const entries = [];
+    let totalSize = 0;
+
+    const pending = [cacheDir];
+
+    while (pending.length) {
+        const directory = pending.pop();
+
+        let names;
+
+        try {
+            names = fs.readdirSync(directory);
+        } catch (ex) {
+            continue;
+        }
+
+        for (const name of names) {
+            if (name === PRUNE_FILENAME) {
+                continue;
+            }
+
+            const filename = path.join(directory, name);
+
+            let stat;
+
+            try {
+                stat = fs.lstatSync(filename);
+            } catch (ex) {
+                continue;
+            }
+
+            if (stat.isDirectory()) {
+                pending.push(filename);
+                continue;
+            }
+
+            let isValid;
+
+            if (name.endsWith(".tmp")) {
+                isValid = now - stat.mtimeMs < TEMP_FILE_MAX_AGE_MS;
+            } else if (isManaged && directory === cacheDir) {
+                // Entries for modules that were deleted or moved will never be used again
+                const sourceFilename = ReadEntryFilename(filename);
+                isValid = sourceFilename !== undefined && fs.existsSync(sourceFilename);
+            } else {
+                isValid = true;
+            }
+
+            if (!isValid) {
+                RemoveFile(filename);
+                continue;
+            }
+
+            entries.push({ filename: filename, size: stat.size, mtimeMs: stat.mtimeMs });
+            totalSize += stat.size;
+        }
+    }
+
+    if (totalSize <= maxSize) {
+        return;
+    }
+
+    entries.sort(function (a, b) { return a.mtimeMs - b.mtimeMs; });
+
+    for (const entry of entries) {
+        if (totalSize <= maxSize) {
+            break;
+        }
+
+        if (RemoveFile(entry.filename)) {
+            totalSize -= entry.size;
+        }
+    }
+}
+
+// ----------------------------------------------------------------------
+function RemoveFile(filename) {
+    try {
+        fs.unlinkSync(filename);
+        return true;
+    } catch (ex) {
+        // The file was removed by another process
+        return false;
+    }
+}
+
+// ----------------------------------------------------------------------
+function CreateRequire(mod) {
+    // Equivalent to the 'require' function that Node creates for each module
+    function require(id) {
+        return mod.require(id);
+    }
+
+    require.resolve = function (request, options) {
+        return Module._resolveFilename(request, mod, false, options);
+    };
+
+    require.resolve.paths = function (request) {
+        return Module._resolveLookupPaths(request, mod);
+    };
+
+    require.main = process.mainModule;
+    require.extensions = Module._extensions;
+    require.cache = Module._cache;
+
+    return require;
+}
+
+// ----------------------------------------------------------------------
+// ----------------------------------------------------------------------
+// ----------------------------------------------------------------------
+Initialize();
@@ -0,0 +1,618 @@
+# ----------------------------------------------------------------------
+# |
+# |  DedupePlanner.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 16:58:37
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Finds duplicate package versions in a lockfile and plans their consolidation.
+
+Two kinds of changes are planned:
+
+    Removal:    A nested copy of a package is removed when the copy that node would resolve in
+                its place (found in an ancestor's 'node_modules' directory) satisfies the
+                declared range of every package that currently resolves to the nested copy.
+                Only copies without nested dependencies of their own are removed, which ensures
+                that the removal doesn't change how any other package resolves its dependencies.
+
+    Hoist:      When a single version of a package satisfies the declared ranges of every
+                package that depends on any of its copies, a copy with that version is moved
+                (with its nested dependencies) to the top-level 'node_modules' directory and all
+                other copies (with theirs) are removed. A hoist is only planned when every
+                dependency of the moved packages still resolves to a version that satisfies its
+                declared range from the new location.
+
+Hoists that don't involve the same packages are planned in a single pass; passes are repeated
+(along with removals) until nothing changes.
+"""
+
+import json
+import os
+
+from collections import defaultdict
+
+from Impl import Semver
+
+# ----------------------------------------------------------------------
+class DuplicateInfo(object):
+    """Information about a package name that appears more than once in the lockfile"""
+
+    # ----------------------------------------------------------------------
+    def __init__(self, name, versions, num_instances, hoist_version):
+        self.name                           = name
+        self.versions                       = versions          # Sorted list of distinct versions
+        self.num_instances                  = num_instances
+        self.hoist_version                  = hoist_version     # Version that satisfies all declared ranges (or None)
+
+
+# ----------------------------------------------------------------------
+class DedupePlan(object):
+    """Results of planning"""
+
+    # ----------------------------------------------------------------------
+    def __init__(self, removals, hoists, updated_records, duplicates, operations):
+        self.removals                       = removals          # [(removed record, replacement record or None if removed with its parent), ...]
+        self.hoists                         = hoists            # [(hoisted record, original path), ...]
+        self.updated_records                = updated_records   # Records whose 'dev' or 'optional' flags were cleared
+        self.duplicates                     = duplicates        # [DuplicateInfo, ...] for the deduplicated lockfile
+        self.operations                     = operations        # [("remove", path) or ("move", path, new path), ...] in the order that they must be applied
+
+
+# ----------------------------------------------------------------------
+def CreatePlan(lockfile, root_requires):
+    """\
+    Returns a DedupePlan for the lockfile.
+
+    `root_requires` is a dict of the root project's dependencies ({ name : range }). Records in
+    the lockfile are updated in place: the paths of hoisted records (and of their nested
+    dependencies) are updated, and the 'dev' and 'optional' flags are cleared when a package
+    is now required by a package that isn't a dev (or optional) dependency. `lockfile.Resolve`
+    should not be used after planning.
+    """
+
+    planner = _Planner(lockfile.packages, root_requires)
+
+    planner.RemoveRedundantCopies()
+
+    while planner.Hoist():
+        planner.RemoveRedundantCopies()
+
+    return DedupePlan(
+        planner.removals,
+        planner.hoists,
+        sorted(planner.updated_records, key=lambda record: record.path),
+        planner.GetDuplicates(),
+        planner.operations,
+    )
+
+
+# ----------------------------------------------------------------------
+def WriteLockfile(input_filename, output_filename, plan):
+    """Writes a version of the input lockfile with the plan's removals and hoists applied"""
+
+    with open(input_filename, encoding="utf-8") as f:
+        content = json.load(f)
+
+    # Lockfile v2 and v3
+    packages = content.get("packages", None)
+    if packages is not None:
+        for operation in plan.operations:
+            path = operation[1]
+            prefix = "{}/".format(path)
+
+            affected = [key for key in packages if key == path or key.startswith(prefix)]
+
+            if operation[0] == "remove":
+                for key in affected:
+                    del packages[key]
+
+            elif operation[0] == "move":
+                new_path = operation[2]
+
+                for key, value in [(key, packages.pop(key)) for key in affected]:
+                    packages[new_path + key[len(path):]] = value
+
+            else:
+                assert False, operation
+
+        for record in plan.updated_records:
+            entry = packages.get(record.path, None)
+            if entry is not None:
+                _UpdateFlags(entry, record)
+
+        # npm sorts the packages by path (the root project is first)
+        content["packages"] = dict(sorted(packages.items(), key=lambda item: (item[0] != "", item[0])))
+
+    # Lockfile v1 and v2
+    dependencies = content.get("dependencies", None)
+    if dependencies is not None:
+        for operation in plan.operations:
+            entry = _PopDependencyEntry(content, operation[1])
+
+            if operation[0] == "move" and entry is not None:
+                names = _GetPathNames(operation[2])
+                assert len(names) == 1, operation
+
+                content["dependencies"][names[0]] = entry
+
+        content["dependencies"] = dict(sorted(content["dependencies"].items()))
+
+        for record in plan.updated_records:
+            entry = content
+
+            for name in _GetPathNames(record.path):
+                entry = entry.get("dependencies", {}).get(name, None)
+                if entry is None:
+                    break
+
+            if entry is not None:
+                _UpdateFlags(entry, record)
+
+    temp_filename = "{}.tmp".format(output_filename)
+
+    with open(temp_filename, "w", encoding="utf-8") as f:
+        json.dump(content, f, indent=2)
+        f.write("\n")
+
+    os.replace(temp_filename, output_filename)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+class _Planner(object):
+    """\
+    Maintains the packages that remain after the changes planned so far and the dependency
+    edges between them (as resolved by node).
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self, records, root_requires):
+        self.removals                       = []
+        self.hoists                         = []
+        self.updated_records                = set()
+        self.operations                     = []
+
+        self._root_requires                 = root_requires
+        self._records_by_path               = {record.path: record for record in records}
+
+        # target path -> { dependent path ('' for the root project) : range }
+        self._dependents                    = None
+
+        # path -> [target path, ...]
+        self._targets                       = None
+
+        # path -> set of paths of the packages in its 'node_modules' directory
+        self._children                      = None
+
+        self._BuildIndex()
+
+    # ----------------------------------------------------------------------
+    def RemoveRedundantCopies(self):
+        """Plans the removal of nested copies that aren't needed"""
+
+        # Process the most deeply nested packages first, so that packages whose nested
+        # dependencies are all removed can be removed themselves.
+        nested_records = sorted(
+            (record for record in self._records_by_path.values() if not record.IsTopLevel),
+            key=lambda record: record.path.count("/node_modules/"),
+            reverse=True,
+        )
+
+        for record in nested_records:
+            if self._children[record.path]:
+                continue
+
+            these_dependents = self._dependents.get(record.path, None)
+            if not these_dependents:
+                # Extraneous packages aren't our concern
+                continue
+
+            parent_path = _GetParentPath(record.path)
+
+            replacement = self._Resolve(record.name, _GetParentPath(parent_path))
+            if replacement is None:
+                continue
+
+            replacement_version = Semver.ParseVersion(replacement.version)
+            if replacement_version is None:
+                continue
+
+            if not all(
+                Semver.Satisfies(replacement_version, range_value)
+                for range_value in these_dependents.values()
+            ):
+                continue
+
+            del self._records_by_path[record.path]
+            self._children[parent_path].discard(record.path)
+
+            self.removals.append((record, replacement))
+            self.operations.append(("remove", record.path))
+
+            # Everything that resolved to the record now resolves to the replacement
+            self._dependents[replacement.path].update(these_dependents)
+            del self._dependents[record.path]
+
+            for dependent_path in these_dependents:
+                if dependent_path:
+                    these_targets = self._targets[dependent_path]
+                    these_targets[these_targets.index(record.path)] = replacement.path
+
+            for target_path in self._targets.pop(record.path):
+                self._dependents[target_path].pop(record.path, None)
+
+            # The replacement is now required wherever the record was required
+            if not record.dev:
+                self._ClearFlag(replacement, "dev")
+            if not record.optional:
+                self._ClearFlag(replacement, "optional")
+
+    # ----------------------------------------------------------------------
+    def Hoist(self):
+        """Plans a pass of hoists; returns True if any were planned"""
+
+        # Paths whose packages or dependency edges were changed by a hoist in this pass; hoists
+        # that rely on the information associated with these paths are planned in the next
+        # pass (once the information has been updated).
+        changed_paths = set()
+
+        # [(record, attribute name), ...] to clear once the information has been updated
+        cleared_flags = []
+
+        for name, records in sorted(self._GetRecordsByName().items()):
+            if len(records) < 2:
+                continue
+
+            hoist_version = self._GetHoistVersion(records)
+            if hoist_version is None:
+                continue
+
+            result = self._PlanHoist(name, records, hoist_version, changed_paths)
+            if result is None:
+                continue
+
+            source, removed_records, moved_paths, these_changed_paths = result
+
+            changed_paths.update(these_changed_paths)
+
+            # Apply the hoist
+            removed_paths = set(record.path for record in removed_records)
+
+            for record in removed_records:
+                del self._records_by_path[record.path]
+
+                parent_path = _GetParentPath(record.path)
+
+                if parent_path in removed_paths:
+                    self.removals.append((record, None))
+                else:
+                    self.removals.append((record, source))
+                    self.operations.append(("remove", record.path))
+
+                    if not record.dev:
+                        cleared_flags.append((source, "dev"))
+                    if not record.optional:
+                        cleared_flags.append((source, "optional"))
+
+            original_path = source.path
+
+            if moved_paths:
+                moved_records = [self._records_by_path.pop(path) for path in moved_paths]
+
+                for record, new_path in zip(moved_records, moved_paths.values()):
+                    record.path = new_path
+                    self._records_by_path[new_path] = record
+
+                self.operations.append(("move", original_path, source.path))
+
+            self.hoists.append((source, original_path))
+
+        if not changed_paths:
+            return False
+
+        self._BuildIndex()
+
+        for record, attribute_name in cleared_flags:
+            self._ClearFlag(record, attribute_name)
+
+        return True
+
+    # ----------------------------------------------------------------------
+    def GetDuplicates(self):
+        """Returns [DuplicateInfo, ...] for the packages that have multiple copies"""
+
+        duplicates = []
+
+        for name, records in self._GetRecordsByName().items():
+            if len(records) == 1:
+                continue
+
+            versions = {}
+
+            for record in records:
+                version = Semver.ParseVersion(record.version)
+                if version is not None:
+                    versions[version] = record.version
+
+            hoist_version = self._GetHoistVersion(records)
+
+            duplicates.append(
+                DuplicateInfo(
+                    name,
+                    [versions[version] for version in sorted(versions)],
+                    len(records),
+                    versions[hoist_version] if hoist_version is not None else None,
+                ),
+            )
+
+        duplicates.sort(key=lambda info: (-info.num_instances, info.name))
+
+        return duplicates
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _BuildIndex(self):
+        self._dependents = defaultdict(dict)
+        self._targets = {}
+        self._children = defaultdict(set)
+
+        for name, range_value in self._root_requires.items():
+            record = self._Resolve(name, "")
+            if record is not None:
+                self._dependents[record.path][""] = range_value
+
+        for record in self._records_by_path.values():
+            these_targets = []
+
+            for name, range_value in (record.requires or {}).items():
+                dependency = self._Resolve(name, record.path)
+
+                # Unresolvable requirements are optional dependencies that weren't installed
+                if dependency is not None:
+                    self._dependents[dependency.path][record.path] = range_value
+                    these_targets.append(dependency.path)
+
+            self._targets[record.path] = these_targets
+
+            if not record.IsTopLevel:
+                self._children[_GetParentPath(record.path)].add(record.path)
+
+    # ----------------------------------------------------------------------
+    def _Resolve(self, name, from_path):
+        while True:
+            record = self._records_by_path.get(
+                "{}node_modules/{}".format("{}/".format(from_path) if from_path else "", name),
+                None,
+            )
+
+            if record is not None or not from_path:
+                return record
+
+            from_path = _GetParentPath(from_path)
+
+    # ----------------------------------------------------------------------
+    def _GetRecordsByName(self):
+        records_by_name = defaultdict(list)
+
+        for record in self._records_by_path.values():
+            records_by_name[record.name].append(record)
+
+        return records_by_name
+
+    # ----------------------------------------------------------------------
+    def _GetHoistVersion(self, records):
+        """Returns the highest version of the records that satisfies all declared ranges (or None)"""
+
+        ranges = set()
+
+        for record in records:
+            ranges.update(self._dependents.get(record.path, {}).values())
+
+        versions = set()
+
+        for record in records:
+            version = Semver.ParseVersion(record.version)
+            if version is not None:
+                versions.add(version)
+
+        for version in sorted(versions, reverse=True):
+            if all(Semver.Satisfies(version, range_value) for range_value in ranges):
+                return version
+
+        return None
+
+    # ----------------------------------------------------------------------
+    def _GetSubtree(self, path):
+        """Returns the paths of the packages nested within the package at `path`"""
+
+        results = []
+        pending = [path]
+
+        while pending:
+            children = self._children.get(pending.pop(), None)
+            if children:
+                results += children
+                pending += children
+
+        return results
+
+    # ----------------------------------------------------------------------
+    def _PlanHoist(self, name, records, hoist_version, stale_paths):
+        """\
+        Returns (source record, [removed record, ...], { original path : new path }, changed
+        paths) or None if hoisting the version would change the resolution of a dependency in a
+        way that doesn't satisfy its declared range or if the hoist relies on information
+        associated with `stale_paths`.
+        """
+
+        if any(record.path in stale_paths for record in records):
+            return None
+
+        # Prefer the copy that requires the fewest changes
+        source = min(
+            (record for record in records if Semver.ParseVersion(record.version) == hoist_version),
+            key=lambda record: (record.path.count("/node_modules/"), record.path),
+        )
+
+        new_path = "node_modules/{}".format(name)
+
+        removed_paths = []
+
+        for record in records:
+            if record is not source:
+                removed_paths.append(record.path)
+                removed_paths += self._GetSubtree(record.path)
+
+        if source.path == new_path:
+            moved_paths = {}
+        else:
+            moved_paths = {
+                path: new_path + path[len(source.path):]
+                for path in [source.path] + self._GetSubtree(source.path)
+            }
+
+        # Copies nested within other copies aren't hoisted; stale information is updated before the next pass
+        if (
+            source.path in removed_paths
+            or not stale_paths.isdisjoint(removed_paths)
+            or not stale_paths.isdisjoint(moved_paths)
+            or not set(moved_paths).isdisjoint(removed_paths)
+        ):
+            return None
+
+        removed_records = [self._records_by_path[path] for path in removed_paths]
+
+        hidden_paths = set(record.path for record in removed_records).union(moved_paths)
+        added = {moved_paths[path]: self._records_by_path[path] for path in moved_paths}
+
+        used_paths = set(hidden_paths)
+        changed_paths = set(hidden_paths).union(added)
+
+        # ----------------------------------------------------------------------
+        def Resolve(name, from_path):
+            while True:
+                path = "{}node_modules/{}".format("{}/".format(from_path) if from_path else "", name)
+                used_paths.add(path)
+
+                record = added.get(path, None)
+                if record is None and path not in hidden_paths:
+                    record = self._records_by_path.get(path, None)
+
+                if record is not None or not from_path:
+                    return record
+
+                from_path = _GetParentPath(from_path)
+
+        # ----------------------------------------------------------------------
+
+        # Everything that depended on a copy now depends on the source
+        for record in records:
+            for dependent_path, range_value in self._dependents.get(record.path, {}).items():
+                if dependent_path in hidden_paths and dependent_path not in moved_paths:
+                    continue
+
+                if dependent_path in stale_paths:
+                    return None
+
+                used_paths.add(dependent_path)
+                changed_paths.add(dependent_path)
+
+                if Resolve(name, moved_paths.get(dependent_path, dependent_path)) is not source:
+                    return None
+
+                if not Semver.Satisfies(hoist_version, range_value):
+                    return None
+
+        # The dependencies of moved packages are resolved from their new locations
+        for path, this_new_path in moved_paths.items():
+            record = self._records_by_path[path]
+
+            for dependency_name, range_value in (record.requires or {}).items():
+                original = self._Resolve(dependency_name, path)
+                dependency = Resolve(dependency_name, this_new_path)
+
+                if dependency is original:
+                    continue
+
+                if dependency is None or not Semver.Satisfies(dependency.version, range_value):
+                    return None
+
+                # The dependency gains a dependent
+                changed_paths.add(moved_paths.get(dependency.path, dependency.path))
+
+        if not used_paths.isdisjoint(stale_paths):
+            return None
+
+        return source, removed_records, moved_paths, changed_paths
+
+    # ----------------------------------------------------------------------
+    def _ClearFlag(self, record, attribute_name):
+        pending = [record]
+
+        while pending:
+            record = pending.pop()
+
+            if not getattr(record, attribute_name):
+                continue
+
+            setattr(record, attribute_name, False)
+            self.updated_records.add(record)
+
+            pending += [self._records_by_path[path] for path in self._targets[record.path]]
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _GetParentPath(path):
+    index = path.rfind("/node_modules/")
+    return path[:index] if index != -1 else ""
+
+
+# ----------------------------------------------------------------------
+def _GetPathNames(path):
+    """'node_modules/a/node_modules/@b/c' -> ['a', '@b/c']"""
+
+    return path[len("node_modules/"):].split("/node_modules/")
+
+
+# ----------------------------------------------------------------------
+def _PopDependencyEntry(content, path):
+    """Removes the entry at `path` from a 'dependencies' tree; returns the entry (or None)"""
+
+    names = _GetPathNames(path)
+
+    parent = content
+    for name in names[:-1]:
+        parent = parent.get("dependencies", {}).get(name, None)
+        if parent is None:
+            return None
+
+    parent_dependencies = parent.get("dependencies", {})
+
+    entry = parent_dependencies.pop(names[-1], None)
+    if not parent_dependencies and parent is not content:
+        parent.pop("dependencies", None)
+
+    return entry
+
+
+# ----------------------------------------------------------------------
+def _UpdateFlags(entry, record):
+    if not record.dev:
+        entry.pop("dev", None)
+    if not record.optional:
+        entry.pop("optional", None)
+    if not record.dev and not record.optional:
+        entry.pop("devOptional", None)
@@ -0,0 +1,399 @@
+# ----------------------------------------------------------------------
+# |
+# |  DependencyGraph.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 16:02:18
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Contains the DependencyGraph object"""
+
+import hashlib
+import json
+import os
+import sqlite3
+
+from Impl.LockfileReader import ReadLockfile
+
+# ----------------------------------------------------------------------
+class DependencyGraph(object):
+    """\
+    SQLite index of the dependency graph described by a 'package-lock.json' file.
+
+    Package names are interned in the 'names' table; each package instance (a path under
+    'node_modules') is a row in 'packages' and resolved 'requires' relationships are stored
+    as integer pairs in 'edges', which is indexed in both directions. The root project is
+    the package with id 0.
+
+    The index is rebuilt when the hash of the lockfile (or of 'package.json', which provides
+    the root project's dependencies for lockfiles that don't contain them) changes.
+    """
+
+    INDEX_FILENAME                          = ".npm_graph_index.db"
+    FORMAT_VERSION                          = 1
+
+    ROOT_ID                                 = 0
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def Open(
+        cls,
+        working_dir,
+        index_filename=None,
+        force_rebuild=False,
+    ):
+        """Returns (DependencyGraph, was_rebuilt)"""
+
+        index_filename = index_filename or os.path.join(working_dir, cls.INDEX_FILENAME)
+        source_hash = cls._CalculateSourceHash(working_dir)
+
+        if not force_rebuild and os.path.isfile(index_filename):
+            connection = sqlite3.connect(index_filename)
+
+            try:
+                meta = dict(connection.execute("SELECT key, value FROM meta"))
+            except sqlite3.DatabaseError:
+                meta = {}
+
+            if (
+                meta.get("format_version", None) == str(cls.FORMAT_VERSION)
+                and meta.get("source_hash", None) == source_hash
+            ):
+                return cls(connection), False
+
+            connection.close()
+
+        cls._Build(working_dir, index_filename, source_hash)
+
+        return cls(sqlite3.connect(index_filename)), True
+
+    # ----------------------------------------------------------------------
+    def __init__(self, connection):
+        self._connection                    = connection
+
+    # ----------------------------------------------------------------------
+    def Close(self):
+        self._connection.close()
+
+    # ----------------------------------------------------------------------
+    def GetStatistics(self):
+        """Returns (num_names, num_packages, num_edges)"""
+
+        return tuple(
+            self._connection.execute("SELECT COUNT(*) FROM {}".format(table)).fetchone()[0]
+            for table in ["names", "packages", "edges"]
+        )
+
+    # ----------------------------------------------------------------------
+    def Find(self, name, version=None):
+        """Returns the ids of the package instances with the name (and version)"""
+
+        query = "SELECT packages.id FROM packages JOIN names ON packages.name_id = names.id WHERE names.name = ?"
+        args = [name]
+
+        if version is not None:
+            query += " AND packages.version = ?"
+            args.append(version)
+
+        return [row[0] for row in self._connection.execute(query + " ORDER BY packages.id", args)]
+
+    # ----------------------------------------------------------------------
+    def GetInfo(self, package_ids):
+        """Returns {id : (name, version, path, dev, optional)}"""
+
+        results = {}
+
+        for chunk in _Chunk(list(package_ids)):
+            results.update(
+                (row[0], row[1:])
+                for row in self._connection.execute(
+                    """\
+                    SELECT packages.id, names.name, packages.version, packages.path, packages.dev, packages.optional
+                    FROM packages JOIN names ON packages.name_id = names.id
+                    WHERE packages.id IN ({})
+                    """.format(",".join("?" * len(chunk))),
+                    chunk,
+                )
+            )
+
+        return results
+
+    # ----------------------------------------------------------------------
+    def GetDependents(self, package_ids, transitive=False):
+        """Returns the ids of the packages that depend on the provided packages"""
+
+        return self._Walk(package_ids, "target", "source", transitive)
+
+    # ----------------------------------------------------------------------
+    def GetClosure(self, package_ids):
+        """Returns the ids of the packages that the provided packages depend upon (transitively)"""
+
+        return self._Walk(package_ids, "source", "target", True)
+
+    # ----------------------------------------------------------------------
+    def GetShortestPath(self, package_id):
+        """\
+        Returns the ids of the packages on the shortest dependency chain from the root project
+        to the package (inclusive) or None if the package isn't reachable from the root.
+        """
+
+        # Breadth-first search from the package towards the root, one query per level
+        parents = {package_id: None}
+        frontier = [package_id]
+
+        while frontier and self.ROOT_ID not in parents:
+            next_frontier = []
+
+            for chunk in _Chunk(frontier):
+                for source, target in self._connection.execute(
+                    "SELECT source, target FROM edges WHERE target IN ({})".format(",".join("?" * len(chunk))),
+                    chunk,
+                ):
+                    if source not in parents:
+                        parents[source] = target
+                        next_frontier.append(source)
+
+            frontier = next_frontier
+
+        if self.ROOT_ID not in parents:
+            return None
+
+        path = []
+
+        current = self.ROOT_ID
+        while current is not None:
+            path.append(current)
+            current = parents[current]
+
+        return path
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def _CalculateSourceHash(working_dir):
+        hasher = hashlib.sha256()
+
+        for filename in ["package-lock.json", "package.json"]:
+            fullpath = os.path.join(working_dir, filename)
+
+            hasher.update(filename.encode("utf-8"))
+
+            if not os.path.isfile(fullpath):
+                continue
+
+            with open(fullpath, "rb") as f:
+                while True:
+                    content = f.read(1024 * 1024)
+                    if not content:
+                        break
+
+                    hasher.update(content)
+
+        return hasher.hexdigest()
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def _Build(cls, working_dir, index_filename, source_hash):
+        lockfile = ReadLockfile(os.path.join(working_dir, "package-lock.json"))
+        if lockfile.packages is None:
+            raise Exception("'dependencies' or 'packages' was not found in the lockfile")
+
+        names = {}
+
+        # ----------------------------------------------------------------------
+        def GetNameId(name):
+            name_id = names.get(name, None)
+            if name_id is None:
+                name_id = len(names)
+                names[name] = name_id
+
+            return name_id
+
+        # ----------------------------------------------------------------------
+
+        package_ids = {"": cls.ROOT_ID}
+        packages = [(cls.ROOT_ID, GetNameId(lockfile.name or "<root>"), lockfile.version, "", 0, 0)]
+
+        for record in lockfile.packages:
+            package_id = len(packages)
+            package_ids[record.path] = package_id
+
+            packages.append(
+                (
+                    package_id,
+                    GetNameId(record.name),
+                    record.version,
+                    record.path,
+                    1 if record.dev else 0,
+                    1 if record.optional else 0,
+                ),
+            )
+
+        edges = set()
+
+        for name in cls._GetRootDependencies(working_dir, lockfile):
+            dependency = lockfile.Resolve(name)
+            if dependency is not None:
+                edges.add((cls.ROOT_ID, package_ids[dependency.path]))
+
+        for record in lockfile.packages:
+            source = package_ids[record.path]
+
+            for name in (record.requires or {}):
+                # Unresolvable requirements are optional dependencies that weren't installed
+                dependency = lockfile.Resolve(name, record.path)
+                if dependency is not None:
+                    edges.add((source, package_ids[dependency.path]))
+
+        # Build the index in a temporary file so that readers never see a partial index
+        temp_filename = "{}.{}.tmp".format(index_filename, os.getpid())
+
+        if os.path.isfile(temp_filename):
+            os.remove(temp_filename)
+
+        connection = sqlite3.connect(temp_filename)
+
+        try:
+            connection.executescript(
+                """\
+                PRAGMA journal_mode = OFF;
+                PRAGMA synchronous = OFF;
+
+                CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+                CREATE TABLE names (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+                CREATE TABLE packages (
+                    id INTEGER PRIMARY KEY,
+                    name_id INTEGER NOT NULL,
+                    version TEXT,
+                    path TEXT NOT NULL,
+                    dev INTEGER NOT NULL,
+                    optional INTEGER NOT NULL
+                );
+                CREATE TABLE edges (
+                    source INTEGER NOT NULL,
+                    target INTEGER NOT NULL,
+                    PRIMARY KEY (source, target)
+                ) WITHOUT ROWID;
+                """,
+            )
+
+            with connection:
+                connection.executemany(
+                    "INSERT INTO names VALUES (?, ?)",
+                    ((name_id, name) for name, name_id in names.items()),
+                )
+                connection.executemany("INSERT INTO packages VALUES (?, ?, ?, ?, ?, ?)", packages)
+                connection.executemany("INSERT INTO edges VALUES (?, ?)", sorted(edges))
+
+                # Create the indexes after the data has been inserted, as that is much faster
+                connection.executescript(
+                    """\
+                    CREATE INDEX packages_by_name ON packages (name_id, version);
+                    CREATE INDEX edges_by_target ON edges (target, source);
+                    """,
+                )
+
+                connection.executemany(
+                    "INSERT INTO meta VALUES (?, ?)",
+                    [
+                        ("format_version", str(cls.FORMAT_VERSION)),
+                        ("source_hash", source_hash),
+                    ],
+                )
+
+        finally:
+            connection.close()
+
+        os.replace(temp_filename, index_filename)
+
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def _GetRootDependencies(working_dir, lockfile):
+        if lockfile.root_dependencies or lockfile.root_dev_dependencies or lockfile.root_optional_dependencies:
+            return (
+                list(lockfile.root_dependencies)
+                + list(lockfile.root_dev_dependencies)
+                + list(lockfile.root_optional_dependencies)
+            )
+
+        package_filename = os.path.join(working_dir, "package.json")
+
+        if os.path.isfile(package_filename):
+            with open(package_filename, encoding="utf-8") as f:
+                content = json.load(f)
+
+            return [
+                name
+                for key in ["dependencies", "devDependencies", "optionalDependencies"]
+                for name in content.get(key, {})
+            ]
+
+        # Without any other information, the root depends upon every top-level package
+        return [record.name for record in lockfile.GetTopLevelPackages()]
+
+    # ----------------------------------------------------------------------
+    def _Walk(self, package_ids, from_column, to_column, transitive):
+        package_ids = list(package_ids)
+        if not package_ids:
+            return []
+
+        if not transitive:
+            results = set()
+
+            for chunk in _Chunk(package_ids):
+                results.update(
+                    row[0]
+                    for row in self._connection.execute(
+                        "SELECT {to} FROM edges WHERE {from_} IN ({args})".format(
+                            to=to_column,
+                            from_=from_column,
+                            args=",".join("?" * len(chunk)),
+                        ),
+                        chunk,
+                    )
+                )
+
+            return sorted(results)
+
+        # UNION (rather than UNION ALL) discards packages that have already been visited, which
+        # terminates the recursion when the graph contains cycles.
+        self._connection.execute("CREATE TEMP TABLE IF NOT EXISTS walk_start (id INTEGER PRIMARY KEY)")
+        self._connection.execute("DELETE FROM walk_start")
+        self._connection.executemany("INSERT OR IGNORE INTO walk_start VALUES (?)", ((package_id,) for package_id in package_ids))
+
+        results = [
+            row[0]
+            for row in self._connection.execute(
+                """\
+                WITH RECURSIVE walk(id) AS (
+                    SELECT id FROM walk_start
+                    UNION
+                    SELECT edges.{to} FROM edges JOIN walk ON edges.{from_} = walk.id
+                )
+                SELECT id FROM walk WHERE id NOT IN (SELECT id FROM walk_start) ORDER BY id
+                """.format(
+                    to=to_column,
+                    from_=from_column,
+                ),
+            )
+        ]
+
+        return results
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _Chunk(values, size=500):
+    """Splits values into chunks that don't exceed sqlite's limit on the number of variables"""
+
+    for index in range(0, len(values), size):
+        yield values[index:index + size]
@@ -0,0 +1,414 @@
+# ----------------------------------------------------------------------
+# |
+# |  DirectoryCache.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 08:34:47
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Contains the DirectoryCache object"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+from Impl.FileLock import FileLock
+
+# ----------------------------------------------------------------------
+class DirectoryCache(object):
+    """\
+    Content-addressed cache of directory snapshots with a size cap and LRU eviction.
+
+    Entries are stored as complete directory trees under '<root>/entries/<key>'; usage
+    information is stored in '<root>/index.json'. The cache may be used by multiple threads and
+    processes at the same time; changes to the index are serialized by '<root>/index.lock'.
+    """
+
+    INDEX_FILENAME                          = "index.json"
+    LOCK_FILENAME                           = "index.lock"
+
+    # Entries are marked as in use while they are restored so that they aren't evicted; marks
+    # older than this were left by processes that were killed and are ignored.
+    IN_USE_TIMEOUT                          = 60 * 60
+
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def CreateKey(filenames, *extra_values, root_dir=None):
+        """\
+        Returns a key based on the names and content of the provided files and any additional
+        values.
+
+        Each file contributes its name (relative to `root_dir`, or its basename if `root_dir`
+        isn't provided), its size, and the hash of its content as separate length-prefixed
+        fields, so that content moving from one file to another (or a file being renamed)
+        changes the key.
+        """
+
+        hasher = hashlib.sha256()
+
+        for filename in filenames:
+            if root_dir is None:
+                name = os.path.basename(filename)
+            else:
+                name = os.path.relpath(filename, root_dir).replace(os.path.sep, "/")
+
+            content_hasher = hashlib.sha256()
+            size = 0
+
+            with open(filename, "rb") as f:
+                while True:
+                    content = f.read(1024 * 1024)
+                    if not content:
+                        break
+
+                    content_hasher.update(content)
+                    size += len(content)
+
+            _UpdateFramed(hasher, b"file")
+            _UpdateFramed(hasher, name.encode("utf-8"))
+            _UpdateFramed(hasher, str(size).encode("utf-8"))
+            _UpdateFramed(hasher, content_hasher.digest())
+
+        for extra_value in extra_values:
+            _UpdateFramed(hasher, b"value")
+            _UpdateFramed(hasher, str(extra_value).encode("utf-8"))
+
+        return hasher.hexdigest()
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        root,
+        max_size=None,                      # Max size in bytes; None for no limit
+    ):
+        self.Root                           = root
+        self.MaxSize                        = max_size
+
+        self._entries_dir                   = os.path.join(root, "entries")
+        self._temp_dir                      = os.path.join(root, "tmp")
+        self._index_filename                = os.path.join(root, self.INDEX_FILENAME)
+
+        self._lock                          = FileLock(os.path.join(root, self.LOCK_FILENAME))
+
+    # ----------------------------------------------------------------------
+    def Contains(self, key):
+        return os.path.isdir(os.path.join(self._entries_dir, key))
+
+    # ----------------------------------------------------------------------
+    def Restore(
+        self,
+        key,
+        dest_dir,
+        use_links=True,
+    ):
+        """\
+        Restores the snapshot associated with the key to `dest_dir` (which must not exist);
+        returns True on a hit and False on a miss.
+
+        Files are hardlinked when `use_links` is True and the file system supports it and
+        copied otherwise. Linked files share their content with the cache entry, so changes
+        made to them in place change the entry as well; pass `use_links=False` when the
+        restored files are expected to be modified.
+
+        The entry is marked as in use while it is restored so that it isn't evicted by other
+        threads or processes.
+        """
+
+        assert not os.path.exists(dest_dir), dest_dir
+
+        entry_dir = os.path.join(self._entries_dir, key)
+        in_use_token = "{}.{}".format(os.getpid(), threading.current_thread().ident)
+
+        with self._lock:
+            if not os.path.isdir(entry_dir):
+                return False
+
+            index = self._ReadIndex()
+
+            info = index[key]
+            info["last_used"] = time.time()
+            info.setdefault("in_use", {})[in_use_token] = time.time()
+
+            self._WriteIndex(index)
+
+        try:
+            LinkOrCopyTree(entry_dir, dest_dir, use_links=use_links)
+
+        except (IOError, OSError):
+            if os.path.exists(dest_dir):
+                shutil.rmtree(dest_dir, ignore_errors=True)
+
+            # The entry was removed by something that doesn't honor the in-use mark (for
+            # example, 'Remove' or a user); this is a miss rather than a partial restore.
+            if not os.path.isdir(entry_dir):
+                return False
+
+            raise
+
+        finally:
+            with self._lock:
+                index = self._ReadIndex()
+
+                in_use = index.get(key, {}).get("in_use", None)
+                if in_use is not None:
+                    in_use.pop(in_use_token, None)
+
+                    if not in_use:
+                        del index[key]["in_use"]
+
+                self._WriteIndex(index)
+
+        return True
+
+    # ----------------------------------------------------------------------
+    def Store(self, key, source_dir):
+        """\
+        Stores a copy of `source_dir` in the cache and evicts entries if necessary. Storing a
+        key that is already in the cache (because another thread or process stored it first)
+        is not an error.
+        """
+
+        entry_dir = os.path.join(self._entries_dir, key)
+        if os.path.isdir(entry_dir):
+            return
+
+        temp_dir = os.path.join(
+            self._temp_dir,
+            "{}.{}.{}".format(key, os.getpid(), threading.current_thread().ident),
+        )
+
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+
+        # Copy rather than link so that the entry doesn't share content with `source_dir`,
+        # which the caller continues to use. Note that this doesn't apply to directories
+        # restored with links (see `Restore`).
+        LinkOrCopyTree(source_dir, temp_dir, use_links=False)
+
+        size = _GetDirSize(temp_dir)
+
+        with self._lock:
+            # Another thread or process stored the entry while this one was copying
+            if os.path.isdir(entry_dir):
+                shutil.rmtree(temp_dir)
+                return
+
+            if not os.path.isdir(self._entries_dir):
+                os.makedirs(self._entries_dir)
+
+            try:
+                os.rename(temp_dir, entry_dir)
+            except OSError:
+                if not os.path.isdir(entry_dir):
+                    raise
+
+                # The entry was created by something that doesn't use the lock; the content
+                # is the same.
+                shutil.rmtree(temp_dir)
+                return
+
+            index = self._ReadIndex()
+
+            index[key] = {
+                "size": size,
+                "last_used": time.time(),
+            }
+
+            self._Evict(index, protected_key=key)
+            self._WriteIndex(index)
+
+    # ----------------------------------------------------------------------
+    def Remove(self, key):
+        """Removes the snapshot associated with the key (if it exists)"""
+
+        with self._lock:
+            entry_dir = os.path.join(self._entries_dir, key)
+            if os.path.isdir(entry_dir):
+                shutil.rmtree(entry_dir)
+
+            # Reading the index removes information about entries that no longer exist
+            self._WriteIndex(self._ReadIndex())
+
+    # ----------------------------------------------------------------------
+    def Evict(self):
+        """Evicts entries until the cache is within its size limit; returns the evicted keys"""
+
+        with self._lock:
+            index = self._ReadIndex()
+
+            evicted = self._Evict(index)
+            self._WriteIndex(index)
+
+            return evicted
+
+    # ----------------------------------------------------------------------
+    def GetSize(self):
+        with self._lock:
+            return sum(info["size"] for info in self._ReadIndex().values())
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _ReadIndex(self):
+        if not os.path.isfile(self._index_filename):
+            return {}
+
+        try:
+            with open(self._index_filename) as f:
+                index = json.load(f)
+        except ValueError:
+            # The index is corrupt; rebuild it from the entries on disk
+            index = {}
+
+        # Remove information about entries that no longer exist and add entries that aren't
+        # in the index.
+        if os.path.isdir(self._entries_dir):
+            keys = set(os.listdir(self._entries_dir))
+        else:
+            keys = set()
+
+        for key in list(index.keys()):
+            if key not in keys:
+                del index[key]
+
+        for key in keys:
+            if key not in index:
+                index[key] = {
+                    "size": _GetDirSize(os.path.join(self._entries_dir, key)),
+                    "last_used": 0,
+                }
+
+        return index
+
+    # ----------------------------------------------------------------------
+    def _WriteIndex(self, index):
+        if not os.path.isdir(self.Root):
+            os.makedirs(self.Root)
+
+        temp_filename = "{}.{}.{}".format(
+            self._index_filename,
+            os.getpid(),
+            threading.current_thread().ident,
+        )
+
+        with open(temp_filename, "w") as f:
+            json.dump(index, f)
+
+        os.replace(temp_filename, self._index_filename)
+
+    # ----------------------------------------------------------------------
+    def _Evict(
+        self,
+        index,
+        protected_key=None,
+    ):
+        if self.MaxSize is None:
+            return []
+
+        total_size = sum(info["size"] for info in index.values())
+        evicted = []
+
+        for key, info in sorted(index.items(), key=lambda item: item[1]["last_used"]):
+            if total_size <= self.MaxSize:
+                break
+
+            if key == protected_key or self._IsInUse(info):
+                continue
+
+            shutil.rmtree(os.path.join(self._entries_dir, key))
+            del index[key]
+
+            total_size -= info["size"]
+            evicted.append(key)
+
+        return evicted
+
+    # ----------------------------------------------------------------------
+    def _IsInUse(self, info):
+        now = time.time()
+
+        return any(now - start < self.IN_USE_TIMEOUT for start in info.get("in_use", {}).values())
+
+
+# ----------------------------------------------------------------------
+def LinkOrCopyTree(
+    source_dir,
+    dest_dir,
+    use_links=True,
+):
+    """\
+    Recreates `source_dir` at `dest_dir`, hardlinking files when possible and copying them
+    otherwise. Symbolic links are recreated as-is. Errors (including `source_dir` being removed
+    while it is being recreated) are raised rather than producing a partial tree silently.
+    """
+
+    # ----------------------------------------------------------------------
+    def OnError(ex):
+        raise ex
+
+    # ----------------------------------------------------------------------
+
+    for root, directories, filenames in os.walk(source_dir, onerror=OnError):
+        this_dest_dir = os.path.join(dest_dir, os.path.relpath(root, source_dir))
+
+        if not os.path.isdir(this_dest_dir):
+            os.makedirs(this_dest_dir)
+
+        for name in directories + filenames:
+            source = os.path.join(root, name)
+            dest = os.path.join(this_dest_dir, name)
+
+            if os.path.islink(source):
+                os.symlink(os.readlink(source), dest)
+                continue
+
+            if name in directories:
+                continue
+
+            if use_links:
+                try:
+                    os.link(source, dest)
+                    continue
+                except OSError:
+                    # Links aren't supported (different devices, unsupported file system,
+                    # etc.); copy this file and all that follow.
+                    use_links = False
+
+            shutil.copy2(source, dest)
+
+        # os.walk doesn't descend into symbolic links to directories by default, but remove
+        # them explicitly in case that behavior is overridden.
+        directories[:] = [
+            directory for directory in directories
+            if not os.path.islink(os.path.join(root, directory))
+        ]
+
+
+# ----------------------------------------------------------------------
+def _UpdateFramed(hasher, value):
+    hasher.update(len(value).to_bytes(8, "big"))
+    hasher.update(value)
+
+
+# ----------------------------------------------------------------------
+def _GetDirSize(directory):
+    size = 0
+
+    for root, _, filenames in os.walk(directory):
+        for filename in filenames:
+            fullpath = os.path.join(root, filename)
+
+            if not os.path.islink(fullpath):
+                size += os.path.getsize(fullpath)
+
+    return size
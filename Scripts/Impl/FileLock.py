@@ -0,0 +1,123 @@
+# ----------------------------------------------------------------------
+# |
+# |  FileLock.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 22:14:05
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Contains the FileLock object"""
+
+import os
+import threading
+import time
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+# ----------------------------------------------------------------------
+class FileLock(object):
+    """\
+    Exclusive lock shared by threads and processes, based on a lock file.
+
+    The lock is reentrant within a thread. The lock file is never removed, as removing it
+    would allow a process to lock a file that another process has already replaced.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self, filename):
+        self.Filename                       = filename
+
+        self._thread_lock                   = threading.RLock()
+        self._f                             = None
+        self._depth                         = 0
+
+    # ----------------------------------------------------------------------
+    def __enter__(self):
+        self._thread_lock.acquire()
+
+        try:
+            if self._depth == 0:
+                dirname = os.path.dirname(self.Filename)
+                if dirname and not os.path.isdir(dirname):
+                    try:
+                        os.makedirs(dirname)
+                    except OSError:
+                        # Another thread or process created the directory
+                        if not os.path.isdir(dirname):
+                            raise
+
+                f = open(self.Filename, "a+b")
+
+                try:
+                    _Lock(f)
+                except BaseException:
+                    f.close()
+                    raise
+
+                self._f = f
+
+            self._depth += 1
+
+        except BaseException:
+            self._thread_lock.release()
+            raise
+
+        return self
+
+    # ----------------------------------------------------------------------
+    def __exit__(self, *args):
+        try:
+            self._depth -= 1
+
+            if self._depth == 0:
+                f = self._f
+                self._f = None
+
+                try:
+                    _Unlock(f)
+                finally:
+                    f.close()
+
+        finally:
+            self._thread_lock.release()
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if os.name == "nt":
+    # ----------------------------------------------------------------------
+    def _Lock(f):
+        f.seek(0)
+
+        # LK_LOCK only retries for 10 seconds before failing
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                time.sleep(0.1)
+
+    # ----------------------------------------------------------------------
+    def _Unlock(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    # ----------------------------------------------------------------------
+    def _Lock(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    # ----------------------------------------------------------------------
+    def _Unlock(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
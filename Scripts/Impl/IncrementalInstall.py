@@ -0,0 +1,365 @@
+# ----------------------------------------------------------------------
+# |
+# |  IncrementalInstall.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 11:46:09
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Applies the difference between the previously installed lockfile and the current lockfile
+to an existing 'node_modules' directory.
+"""
+
+import itertools
+import json
+import os
+import shutil
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from Impl.PackageExtractor import ExtractPackage, IsExtracted, RequiresRebuild
+
+# ----------------------------------------------------------------------
+STATE_FILENAME                              = ".npm_install_state.json"
+STATE_FORMAT_VERSION                        = 1
+
+CHECKPOINT_FILENAME                         = ".npm_install_checkpoint"
+
+# ----------------------------------------------------------------------
+class Delta(object):
+    """Differences between the installed packages and the packages in the lockfile"""
+
+    # ----------------------------------------------------------------------
+    def __init__(self, added, removed, changed, reused):
+        self.added                          = added         # [PackageRecord, ...]
+        self.removed                        = removed       # [path, ...]
+        self.changed                        = changed       # [PackageRecord, ...]
+        self.reused                         = reused        # [PackageRecord, ...]
+
+    # ----------------------------------------------------------------------
+    @property
+    def IsEmpty(self):
+        return not self.added and not self.removed and not self.changed
+
+
+# ----------------------------------------------------------------------
+class Checkpoint(object):
+    """\
+    Journal of the packages that have been installed by an install that is in progress.
+
+    A line is appended as each package is installed, so the journal is valid regardless of
+    when the install is interrupted. An incomplete final line (written when the process was
+    killed) is ignored when the journal is read.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self, node_modules_dir, toolchain_key):
+        filename = os.path.join(node_modules_dir, CHECKPOINT_FILENAME)
+
+        # Terminate an incomplete line written by a process that was killed
+        is_terminated = True
+
+        if os.path.isfile(filename) and os.path.getsize(filename):
+            with open(filename, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                is_terminated = f.read(1) == b"\n"
+
+        self._file                          = open(filename, "a")
+        self._lock                          = threading.Lock()
+
+        if not is_terminated:
+            self._file.write("\n")
+
+        if self._file.tell() == 0:
+            self._Write(
+                {
+                    "format_version": STATE_FORMAT_VERSION,
+                    "toolchain": toolchain_key,
+                },
+            )
+
+    # ----------------------------------------------------------------------
+    def Add(self, record, requires_rebuild):
+        with self._lock:
+            self._Write([record.path, record.version, record.integrity, requires_rebuild])
+
+    # ----------------------------------------------------------------------
+    def Close(self):
+        self._file.close()
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _Write(self, content):
+        # The content is flushed (but not synced) so that it survives the termination of the
+        # process; the extracted files themselves aren't synced either.
+        self._file.write("{}\n".format(json.dumps(content)))
+        self._file.flush()
+
+
+# ----------------------------------------------------------------------
+def WriteState(node_modules_dir, records, toolchain_key):
+    """Records the packages that are installed in `node_modules_dir`"""
+
+    temp_filename = os.path.join(node_modules_dir, STATE_FILENAME + ".tmp")
+
+    with open(temp_filename, "w") as f:
+        json.dump(
+            {
+                "format_version": STATE_FORMAT_VERSION,
+                "toolchain": toolchain_key,
+                "packages": {
+                    record.path: [record.version, record.integrity] for record in records
+                },
+            },
+            f,
+        )
+
+    os.replace(temp_filename, os.path.join(node_modules_dir, STATE_FILENAME))
+
+
+# ----------------------------------------------------------------------
+def RemoveState(node_modules_dir):
+    filename = os.path.join(node_modules_dir, STATE_FILENAME)
+
+    if os.path.isfile(filename):
+        os.remove(filename)
+
+
+# ----------------------------------------------------------------------
+def RemoveCheckpoint(node_modules_dir):
+    filename = os.path.join(node_modules_dir, CHECKPOINT_FILENAME)
+
+    if os.path.isfile(filename):
+        os.remove(filename)
+
+
+# ----------------------------------------------------------------------
+def CalculateResumeDelta(node_modules_dir, records, toolchain_key):
+    """\
+    Returns (Delta, [rebuild name, ...]) for an install that was interrupted or failed (based
+    on its checkpoint), or None if there isn't an install that can be resumed.
+
+    Packages recorded in the checkpoint are verified before they are reused; packages that
+    fail verification are 'changed' and packages that were never recorded are 'added'. The
+    rebuild names are those of the reused packages that must be rebuilt by npm.
+    """
+
+    filename = os.path.join(node_modules_dir, CHECKPOINT_FILENAME)
+    if not os.path.isfile(filename):
+        return None
+
+    working_dir = os.path.dirname(node_modules_dir)
+
+    installed = {}
+
+    with open(filename) as f:
+        try:
+            header = json.loads(f.readline())
+        except ValueError:
+            return None
+
+        if (
+            not isinstance(header, dict)
+            or header.get("format_version", None) != STATE_FORMAT_VERSION
+            or header.get("toolchain", None) != toolchain_key
+        ):
+            return None
+
+        for line in f:
+            try:
+                path, version, integrity, requires_rebuild = json.loads(line)
+            except ValueError:
+                continue
+
+            installed[path] = ([version, integrity], requires_rebuild)
+
+    added = []
+    changed = []
+    reused = []
+
+    rebuild_names = set()
+
+    for record in records:
+        installed_info = installed.pop(record.path, None)
+
+        if installed_info is None:
+            added.append(record)
+            continue
+
+        info, requires_rebuild = installed_info
+
+        package_dir = os.path.join(working_dir, *record.path.split("/"))
+
+        if info != [record.version, record.integrity] or not IsExtracted(package_dir, record.version):
+            changed.append(record)
+            continue
+
+        reused.append(record)
+
+        if requires_rebuild:
+            rebuild_names.add(record.name)
+
+    # Anything left in the checkpoint has been removed from the lockfile since the install began
+    removed = list(installed.keys())
+
+    return Delta(added, removed, changed, reused), sorted(rebuild_names)
+
+
+# ----------------------------------------------------------------------
+def CalculateDelta(node_modules_dir, records, toolchain_key):
+    """\
+    Returns a Delta object or a string that describes why an incremental install isn't
+    possible.
+    """
+
+    state_filename = os.path.join(node_modules_dir, STATE_FILENAME)
+    if not os.path.isfile(state_filename):
+        return "the installed state was not found"
+
+    try:
+        with open(state_filename) as f:
+            state = json.load(f)
+    except ValueError:
+        return "the installed state is corrupt"
+
+    if state.get("format_version", None) != STATE_FORMAT_VERSION:
+        return "the installed state was written by a different version of this script"
+
+    if state.get("toolchain", None) != toolchain_key:
+        return "the Node toolchain has changed"
+
+    installed = state["packages"]
+
+    added = []
+    changed = []
+    reused = []
+
+    for record in records:
+        installed_info = installed.pop(record.path, None)
+
+        if installed_info is None:
+            added.append(record)
+        elif installed_info != [record.version, record.integrity]:
+            changed.append(record)
+        else:
+            reused.append(record)
+
+    # Anything left in the installed information has been removed
+    removed = list(installed.keys())
+
+    for record in itertools.chain(added, changed):
+        if not record.resolved or not record.integrity:
+            return "'{}' does not have a 'resolved' url or 'integrity' value".format(record.path)
+
+    return Delta(added, removed, changed, reused)
+
+
+# ----------------------------------------------------------------------
+def ApplyDelta(
+    working_dir,
+    delta,
+    tarball_store,
+    package_store=None,
+    registry=None,
+    jobs=None,
+    checkpoint=None,
+):
+    """\
+    Applies the delta to '<working_dir>/node_modules' and returns the names of the
+    packages that must be rebuilt by npm (lifecycle scripts and bin links).
+
+    Packages are linked from `package_store` when provided and extracted from their
+    tarballs otherwise. Each package is added to `checkpoint` (if provided) once it has
+    been installed.
+    """
+
+    # Remove packages (deepest first, as removing a parent removes its children)
+    for path in sorted(delta.removed, key=lambda path: -path.count("node_modules/")):
+        fullpath = os.path.join(working_dir, *path.split("/"))
+
+        if os.path.isdir(fullpath):
+            shutil.rmtree(fullpath)
+
+    # Add and update packages. Parents must exist before their nested dependencies can be
+    # extracted, so process the packages one depth level at a time.
+    rebuild_names = set()
+
+    # ----------------------------------------------------------------------
+    def Install(record):
+        package_dir = os.path.join(working_dir, *record.path.split("/"))
+
+        if package_store is not None:
+            requires_rebuild = package_store.Link(record, package_dir, tarball_store, registry)
+        else:
+            ExtractPackage(tarball_store.Fetch(record, registry), package_dir)
+            requires_rebuild = RequiresRebuild(package_dir)
+
+        if requires_rebuild:
+            # 'npm rebuild' operates on package names
+            rebuild_names.add(record.name)
+
+        if checkpoint is not None:
+            checkpoint.Add(record, requires_rebuild)
+
+    # ----------------------------------------------------------------------
+
+    records = sorted(
+        itertools.chain(delta.added, delta.changed),
+        key=lambda record: record.path.count("node_modules/"),
+    )
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for _, depth_records in itertools.groupby(
+            records,
+            key=lambda record: record.path.count("node_modules/"),
+        ):
+            futures = [executor.submit(Install, record) for record in depth_records]
+
+            try:
+                for future in futures:
+                    future.result()
+
+            except BaseException:
+                # Don't install the remaining packages when a package fails or the install is
+                # interrupted (Ctrl+C); the packages being installed are allowed to complete.
+                for future in futures:
+                    future.cancel()
+
+                raise
+
+    if delta.removed:
+        _RemoveDanglingBinLinks(working_dir, delta.removed)
+
+    return sorted(rebuild_names)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _RemoveDanglingBinLinks(working_dir, removed_paths):
+    bin_dirs = set()
+
+    for path in removed_paths:
+        index = path.rfind("node_modules/")
+        bin_dirs.add(path[:index] + "node_modules/.bin")
+
+    for bin_dir in bin_dirs:
+        bin_dir = os.path.join(working_dir, *bin_dir.split("/"))
+        if not os.path.isdir(bin_dir):
+            continue
+
+        for item in os.listdir(bin_dir):
+            fullpath = os.path.join(bin_dir, item)
+
+            if os.path.islink(fullpath) and not os.path.exists(fullpath):
+                os.remove(fullpath)
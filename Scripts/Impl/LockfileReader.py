@@ -0,0 +1,447 @@
+# ----------------------------------------------------------------------
+# |
+# |  LockfileReader.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 09:02:16
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Streaming reader for 'package-lock.json' files.
+
+The lockfile is never loaded in its entirety; the top-level structure is tokenized
+incrementally and only individual package entries are decoded. Lockfile versions 1
+('dependencies'), 2 ('packages' and 'dependencies'), and 3 ('packages') are supported.
+"""
+
+import json
+import re
+import sys
+
+# ----------------------------------------------------------------------
+class PackageRecord(object):
+    """Compact information about a single package in the lockfile"""
+
+    __slots__ = (
+        "name",                             # Name as it appears under 'node_modules'
+        "version",
+        "resolved",
+        "integrity",
+        "dev",
+        "optional",
+        "path",                             # 'node_modules/<name>[/node_modules/<name>...]'
+        "requires",                         # { name : range } or None
+    )
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        name,
+        version,
+        resolved,
+        integrity,
+        dev,
+        optional,
+        path,
+        requires,
+    ):
+        self.name                           = name
+        self.version                        = version
+        self.resolved                       = resolved
+        self.integrity                      = integrity
+        self.dev                            = dev
+        self.optional                       = optional
+        self.path                           = path
+        self.requires                       = requires
+
+    # ----------------------------------------------------------------------
+    def __repr__(self):
+        return "<PackageRecord {}@{} ({})>".format(self.name, self.version, self.path)
+
+    # ----------------------------------------------------------------------
+    @property
+    def IsTopLevel(self):
+        # Packages nested within a workspace ('packages/x/node_modules/y') aren't top-level
+        return self.path.startswith("node_modules/") and self.path.count("node_modules/") == 1
+
+
+# ----------------------------------------------------------------------
+class Lockfile(object):
+    """Information extracted from a 'package-lock.json' file"""
+
+    # ----------------------------------------------------------------------
+    def __init__(self):
+        self.lockfile_version               = None
+        self.name                           = None
+        self.version                        = None
+
+        # Only populated for lockfiles with a 'packages' section (v2 and v3)
+        self.has_root_entry                 = False
+        self.root_dependencies              = {}
+        self.root_dev_dependencies          = {}
+        self.root_optional_dependencies     = {}
+
+        # None if neither 'packages' nor 'dependencies' were found
+        self.packages                       = None
+
+        self._records_by_path               = None
+
+    # ----------------------------------------------------------------------
+    def GetTopLevelPackages(self):
+        return [record for record in self.packages if record.IsTopLevel]
+
+    # ----------------------------------------------------------------------
+    def Resolve(self, name, from_path=""):
+        """\
+        Returns the record that node would load when `name` is required by the package at
+        `from_path` ('' for the root project) or None if it can't be resolved.
+        """
+
+        if self._records_by_path is None:
+            self._records_by_path = {record.path: record for record in self.packages}
+
+        while True:
+            record = self._records_by_path.get(
+                "{}node_modules/{}".format("{}/".format(from_path) if from_path else "", name),
+                None,
+            )
+
+            if record is not None or not from_path:
+                return record
+
+            # Look in the parent's 'node_modules' directory
+            index = from_path.rfind("/node_modules/")
+            from_path = from_path[:index] if index != -1 else ""
+
+    # ----------------------------------------------------------------------
+    def GetProductionPackages(self):
+        """\
+        Returns the records that are reachable from the root project's production (and optional)
+        dependencies via 'requires' edges.
+
+        The root project's dependencies are only available in lockfiles with a 'packages'
+        section; for older lockfiles, top-level packages that aren't flagged as 'dev' are used.
+        """
+
+        if self.root_dependencies or self.root_optional_dependencies or self.root_dev_dependencies:
+            pending = [
+                record
+                for record in (
+                    self.Resolve(name)
+                    for name in list(self.root_dependencies) + list(self.root_optional_dependencies)
+                )
+                if record is not None
+            ]
+        else:
+            pending = [record for record in self.GetTopLevelPackages() if not record.dev]
+
+        visited = set()
+
+        while pending:
+            record = pending.pop()
+
+            if record.path in visited:
+                continue
+
+            visited.add(record.path)
+
+            for name in (record.requires or {}):
+                dependency = self.Resolve(name, record.path)
+
+                # Unresolvable requirements are optional dependencies that weren't installed
+                if dependency is not None and dependency.path not in visited:
+                    pending.append(dependency)
+
+        # Preserve the lockfile's order
+        return [record for record in self.packages if record.path in visited]
+
+
+# ----------------------------------------------------------------------
+def ReadLockfile(
+    filename,
+    chunk_size=256 * 1024,
+):
+    """Reads the lockfile incrementally and returns a Lockfile object"""
+
+    lockfile = Lockfile()
+
+    with open(filename, encoding="utf-8") as f:
+        stream = _JsonStream(f, chunk_size)
+
+        has_packages_section = False
+
+        for key in stream.IterObject():
+            if key == "packages":
+                has_packages_section = True
+                lockfile.packages = list(_EnumPackagesSection(stream, lockfile))
+
+            elif key == "dependencies":
+                if has_packages_section:
+                    # This information is redundant with the information in 'packages'
+                    stream.SkipValue()
+                else:
+                    lockfile.packages = list(_EnumDependenciesSection(stream))
+
+            elif key == "lockfileVersion":
+                lockfile.lockfile_version = stream.ReadValue()
+
+            elif key == "name":
+                lockfile.name = stream.ReadValue()
+
+            elif key == "version":
+                lockfile.version = stream.ReadValue()
+
+            else:
+                stream.SkipValue()
+
+    if lockfile.lockfile_version is None:
+        lockfile.lockfile_version = 1
+
+    return lockfile
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+class _JsonStream(object):
+    """Incremental JSON tokenizer that decodes scalar (and small) values on demand"""
+
+    _whitespace_regex                       = re.compile(r"[ \t\n\r]*")
+    _decoder                                = json.JSONDecoder()
+    _number_chars                           = set("0123456789.eE+-")
+
+    # ----------------------------------------------------------------------
+    def __init__(self, f, chunk_size):
+        self._f                             = f
+        self._chunk_size                    = chunk_size
+        self._buffer                        = ""
+        self._pos                           = 0
+        self._eof                           = False
+
+    # ----------------------------------------------------------------------
+    def Peek(self):
+        """Returns the next non-whitespace character without consuming it (or '' at eof)"""
+
+        while True:
+            self._pos = self._whitespace_regex.match(self._buffer, self._pos).end()
+
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+
+            if not self._Fill():
+                return ""
+
+    # ----------------------------------------------------------------------
+    def Expect(self, c):
+        actual = self.Peek()
+        if actual != c:
+            raise ValueError("'{}' was expected but '{}' was encountered".format(c, actual))
+
+        self._pos += 1
+
+    # ----------------------------------------------------------------------
+    def ReadValue(self):
+        """Decodes and returns the next complete value"""
+
+        self.Peek()
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+
+                # A number at the end of the buffer may have been truncated (either at the end
+                # of the buffer or within a fraction or exponent, as in '2.' or '1e')
+                if self._eof or (
+                    end < len(self._buffer)
+                    and (
+                        isinstance(value, bool)
+                        or not isinstance(value, (int, float))
+                        or self._buffer[end] not in self._number_chars
+                    )
+                ):
+                    self._pos = end
+                    return value
+
+            except ValueError:
+                if self._eof:
+                    raise
+
+            self._Fill()
+
+    # ----------------------------------------------------------------------
+    def IterObject(self):
+        """Yields the keys of an object; the caller must consume each value before continuing"""
+
+        self.Expect("{")
+
+        if self.Peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            key = self.ReadValue()
+            if not isinstance(key, str):
+                raise ValueError("An object key was expected")
+
+            self.Expect(":")
+
+            yield key
+
+            c = self.Peek()
+            self._pos += 1
+
+            if c == "}":
+                break
+
+            if c != ",":
+                raise ValueError("',' or '}}' was expected but '{}' was encountered".format(c))
+
+    # ----------------------------------------------------------------------
+    def IterArray(self):
+        """Yields once per array element; the caller must consume each element before continuing"""
+
+        self.Expect("[")
+
+        if self.Peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield
+
+            c = self.Peek()
+            self._pos += 1
+
+            if c == "]":
+                break
+
+            if c != ",":
+                raise ValueError("',' or ']' was expected but '{}' was encountered".format(c))
+
+    # ----------------------------------------------------------------------
+    def SkipValue(self):
+        """Consumes the next value without materializing containers"""
+
+        c = self.Peek()
+
+        if c == "{":
+            for _ in self.IterObject():
+                self.SkipValue()
+        elif c == "[":
+            for _ in self.IterArray():
+                self.SkipValue()
+        else:
+            self.ReadValue()
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _Fill(self):
+        if self._eof:
+            return False
+
+        # Discard content that has already been consumed and read at least as much as is
+        # currently buffered, so that repeated attempts to decode a large value don't result
+        # in quadratic behavior.
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+
+        content = self._f.read(max(self._chunk_size, len(self._buffer)))
+        if not content:
+            self._eof = True
+            return True
+
+        self._buffer += content
+        return True
+
+
+# ----------------------------------------------------------------------
+def _EnumPackagesSection(stream, lockfile):
+    for path in stream.IterObject():
+        if path == "":
+            root = stream.ReadValue()
+
+            lockfile.has_root_entry = True
+            lockfile.root_dependencies = root.get("dependencies", {})
+            lockfile.root_dev_dependencies = root.get("devDependencies", {})
+            lockfile.root_optional_dependencies = root.get("optionalDependencies", {})
+
+            continue
+
+        entry = stream.ReadValue()
+
+        # Links (workspaces, 'file:' dependencies) are not packages that are installed from a
+        # registry.
+        if entry.get("link", False):
+            continue
+
+        # Only entries within 'node_modules' are installed packages
+        index = path.rfind("node_modules/")
+        if index == -1:
+            continue
+
+        requires = entry.get("dependencies", None)
+
+        optional_requires = entry.get("optionalDependencies", None)
+        if optional_requires:
+            requires = dict(requires or {})
+            requires.update(optional_requires)
+
+        yield _CreateRecord(
+            path[index + len("node_modules/"):],
+            path,
+            entry,
+            requires,
+        )
+
+
+# ----------------------------------------------------------------------
+def _EnumDependenciesSection(stream):
+    # Each top-level entry (including its nested dependencies) is decoded at once; this is
+    # significantly faster than tokenizing each field and the entries are small relative to
+    # the lockfile as a whole.
+    for name in stream.IterObject():
+        for record in _EnumDependencies(name, "node_modules/{}".format(name), stream.ReadValue()):
+            yield record
+
+
+# ----------------------------------------------------------------------
+def _EnumDependencies(name, path, entry):
+    for child_name, child_entry in entry.get("dependencies", {}).items():
+        for record in _EnumDependencies(
+            child_name,
+            "{}/node_modules/{}".format(path, child_name),
+            child_entry,
+        ):
+            yield record
+
+    yield _CreateRecord(
+        name,
+        path,
+        entry,
+        entry.get("requires", None),
+    )
+
+
+# ----------------------------------------------------------------------
+def _CreateRecord(name, path, entry, requires):
+    if requires:
+        requires = {sys.intern(k): v for k, v in requires.items()}
+
+    return PackageRecord(
+        sys.intern(name),
+        entry.get("version", None),
+        entry.get("resolved", None),
+        entry.get("integrity", None),
+        bool(entry.get("dev", False)),
+        bool(entry.get("optional", False)),
+        path,
+        requires or None,
+    )
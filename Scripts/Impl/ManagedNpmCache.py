@@ -0,0 +1,285 @@
+# ----------------------------------------------------------------------
+# |
+# |  ManagedNpmCache.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 18:41:27
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Contains the ManagedNpmCache object"""
+
+import base64
+import json
+import os
+import threading
+import time
+
+from Impl.TarballStore import IntegrityException, ParseIntegrity
+
+# ----------------------------------------------------------------------
+class CacheStatistics(object):
+    """Information about the content of the cache and how it has been used"""
+
+    # ----------------------------------------------------------------------
+    def __init__(self, num_files, size, num_installs, hits, misses):
+        self.num_files                      = num_files
+        self.size                           = size
+        self.num_installs                   = num_installs
+        self.hits                           = hits
+        self.misses                         = misses
+
+    # ----------------------------------------------------------------------
+    @property
+    def HitRate(self):
+        """Percentage of packages found in the cache (or None if there weren't any lookups)"""
+
+        total = self.hits + self.misses
+        if not total:
+            return None
+
+        return self.hits * 100.0 / total
+
+
+# ----------------------------------------------------------------------
+class ManagedNpmCache(object):
+    """\
+    npm cache directory (passed to npm via '--cache') with usage tracking and a size budget.
+
+    npm stores tarballs in '<root>/_cacache/content-v2/<algorithm>/<hex[:2]>/<hex[2:4]>/<hex[4:]>'
+    and index entries that refer to that content in '<root>/_cacache/index-v5'. The
+    modification time of a tarball is updated each time that an install uses it, so tarballs
+    can be evicted based on when they were last used regardless of how the file system
+    maintains access times. Lookups are recorded in '<root>/usage.jsonl'.
+    """
+
+    USAGE_FILENAME                          = "usage.jsonl"
+
+    # Maximum number of installs retained in the usage file when the cache is evicted
+    MAX_USAGE_ENTRIES                       = 10000
+
+    # ----------------------------------------------------------------------
+    def __init__(self, root):
+        self.Root                           = os.path.realpath(root)
+
+        self._cacache_dir                   = os.path.join(self.Root, "_cacache")
+        self._usage_filename                = os.path.join(self.Root, self.USAGE_FILENAME)
+
+        self._lock                          = threading.Lock()
+
+    # ----------------------------------------------------------------------
+    def GetContentFilename(self, integrity):
+        algorithm, digest = ParseIntegrity(integrity)
+        digest = base64.b64decode(digest).hex()
+
+        return os.path.join(self._cacache_dir, "content-v2", algorithm, digest[:2], digest[2:4], digest[4:])
+
+    # ----------------------------------------------------------------------
+    def RecordUsage(self, records, name=None):
+        """\
+        Marks the tarballs of the records that are in the cache as used and records the lookups;
+        returns (hits, misses).
+
+        Tarballs that are missing are downloaded (and therefore used) by npm.
+        """
+
+        now = time.time()
+
+        hits = 0
+        misses = 0
+
+        for record in records:
+            if not record.integrity:
+                continue
+
+            try:
+                filename = self.GetContentFilename(record.integrity)
+            except IntegrityException:
+                continue
+
+            try:
+                os.utime(filename, (now, now))
+                hits += 1
+            except (IOError, OSError):
+                misses += 1
+
+        with self._lock:
+            if not os.path.isdir(self.Root):
+                os.makedirs(self.Root)
+
+            # A single write is used so that lines written by concurrent installs aren't interleaved
+            with open(self._usage_filename, "a") as f:
+                f.write(
+                    "{}\n".format(
+                        json.dumps(
+                            {
+                                "time": now,
+                                "name": name,
+                                "hits": hits,
+                                "misses": misses,
+                            },
+                        ),
+                    ),
+                )
+
+        return hits, misses
+
+    # ----------------------------------------------------------------------
+    def GetStatistics(self, since=None):
+        """Returns CacheStatistics; only installs after `since` (a timestamp) are considered"""
+
+        num_files = 0
+        size = 0
+
+        for _, file_size, _ in self._EnumContent():
+            num_files += 1
+            size += file_size
+
+        num_installs = 0
+        hits = 0
+        misses = 0
+
+        for entry in self._ReadUsage():
+            if since is not None and entry["time"] < since:
+                continue
+
+            num_installs += 1
+            hits += entry["hits"]
+            misses += entry["misses"]
+
+        return CacheStatistics(num_files, size, num_installs, hits, misses)
+
+    # ----------------------------------------------------------------------
+    def Evict(self, max_size):
+        """\
+        Removes the least recently used tarballs until the cache is within `max_size` bytes;
+        returns (number of files removed, bytes removed).
+
+        Index entries that only refer to removed tarballs are removed as well (npm downloads a
+        package again when its index entry refers to content that doesn't exist).
+        """
+
+        content = sorted(self._EnumContent())
+
+        total_size = sum(file_size for _, file_size, _ in content)
+
+        num_removed = 0
+        size_removed = 0
+
+        for _, file_size, filename in content:
+            if total_size <= max_size:
+                break
+
+            try:
+                os.remove(filename)
+            except (IOError, OSError):
+                continue
+
+            total_size -= file_size
+
+            num_removed += 1
+            size_removed += file_size
+
+        if num_removed:
+            self._RemoveDanglingIndexEntries()
+
+        self._TrimUsage()
+
+        return num_removed, size_removed
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _EnumContent(self):
+        """\
+        Yields (last used, size, filename) for each file in the cache's content (package
+        tarballs and cached registry responses).
+        """
+
+        pending = [os.path.join(self._cacache_dir, "content-v2")]
+
+        while pending:
+            directory = pending.pop()
+            if not os.path.isdir(directory):
+                continue
+
+            for item in os.scandir(directory):
+                if item.is_dir(follow_symlinks=False):
+                    pending.append(item.path)
+                elif item.is_file(follow_symlinks=False):
+                    stat = item.stat(follow_symlinks=False)
+                    yield stat.st_mtime, stat.st_size, item.path
+
+    # ----------------------------------------------------------------------
+    def _RemoveDanglingIndexEntries(self):
+        # Each line in an index bucket is '<sha1 of the entry>\t<json entry>'; a bucket is
+        # removed when none of its entries refer to content that exists.
+        for root, _, filenames in os.walk(os.path.join(self._cacache_dir, "index-v5")):
+            for filename in filenames:
+                fullpath = os.path.join(root, filename)
+
+                try:
+                    with open(fullpath, encoding="utf-8") as f:
+                        lines = f.readlines()
+                except (IOError, OSError):
+                    continue
+
+                if not any(self._IsEntryValid(line) for line in lines):
+                    os.remove(fullpath)
+
+    # ----------------------------------------------------------------------
+    def _IsEntryValid(self, line):
+        _, sep, content = line.partition("\t")
+        if not sep:
+            return False
+
+        try:
+            integrity = json.loads(content).get("integrity", None)
+        except (ValueError, AttributeError):
+            return False
+
+        if not integrity:
+            return False
+
+        try:
+            return os.path.isfile(self.GetContentFilename(integrity))
+        except IntegrityException:
+            return False
+
+    # ----------------------------------------------------------------------
+    def _ReadUsage(self):
+        if not os.path.isfile(self._usage_filename):
+            return []
+
+        entries = []
+
+        with open(self._usage_filename) as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # An incomplete line written by a process that was killed
+                    continue
+
+        return entries
+
+    # ----------------------------------------------------------------------
+    def _TrimUsage(self):
+        with self._lock:
+            entries = self._ReadUsage()
+            if len(entries) <= self.MAX_USAGE_ENTRIES:
+                return
+
+            temp_filename = "{}.tmp".format(self._usage_filename)
+
+            with open(temp_filename, "w") as f:
+                for entry in entries[-self.MAX_USAGE_ENTRIES:]:
+                    f.write("{}\n".format(json.dumps(entry)))
+
+            os.replace(temp_filename, self._usage_filename)
@@ -0,0 +1,271 @@
+# ----------------------------------------------------------------------
+# |
+# |  Metrics.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 14:52:36
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Contains the Metrics object"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+# ----------------------------------------------------------------------
+SUPPORTED_FORMATS                           = ["json", "prometheus"]
+
+# ----------------------------------------------------------------------
+class Metrics(object):
+    """\
+    Records the wall time, CPU time, and peak RSS of named phases.
+
+    CPU time and peak RSS are process-wide values (this process and its waited-for children);
+    when phases run concurrently on different threads, CPU time is attributed to every phase
+    that was active at the time. Note that peak RSS is a high-water mark for the process
+    (which, on Linux, includes the parent's RSS at the time that the process was created).
+
+    When tracemalloc is tracing, the peak memory allocated by Python during each phase is
+    recorded as well.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self, command, **labels):
+        self.Command                        = command
+        self.Labels                         = labels
+        self.Phases                         = []
+
+        self._lock                          = threading.Lock()
+
+    # ----------------------------------------------------------------------
+    def Labeled(self, **labels):
+        """Returns an object that records phases in this object with additional labels"""
+
+        these_labels = dict(self.Labels)
+        these_labels.update(labels)
+
+        result = self.__class__(self.Command, **these_labels)
+
+        result.Phases = self.Phases
+        result._lock = self._lock
+
+        return result
+
+    # ----------------------------------------------------------------------
+    @contextmanager
+    def Phase(self, name, **labels):
+        is_tracing = _EnterTracedPhase()
+
+        start_wall = time.perf_counter()
+        start_cpu, start_children_cpu = _GetCpuTimes()
+
+        try:
+            yield
+
+        finally:
+            end_cpu, end_children_cpu = _GetCpuTimes()
+            peak_rss, children_peak_rss = _GetPeakRss()
+            peak_traced = _ExitTracedPhase() if is_tracing else None
+
+            phase_labels = dict(self.Labels)
+            phase_labels.update(labels)
+
+            with self._lock:
+                self.Phases.append(
+                    {
+                        "phase": name,
+                        "labels": phase_labels,
+                        "wall_seconds": time.perf_counter() - start_wall,
+                        "cpu_seconds": end_cpu - start_cpu,
+                        "children_cpu_seconds": None if end_children_cpu is None else end_children_cpu - start_children_cpu,
+                        "peak_rss_bytes": peak_rss,
+                        "children_peak_rss_bytes": children_peak_rss,
+                        "peak_traced_bytes": peak_traced,
+                    },
+                )
+
+    # ----------------------------------------------------------------------
+    def Write(self, filename, format=None):
+        """\
+        Writes the metrics as json or as a Prometheus textfile-collector file; the format is
+        based on the file's extension ('.prom' for Prometheus) when not provided.
+        """
+
+        if format is None:
+            format = "prometheus" if os.path.splitext(filename)[1] == ".prom" else "json"
+
+        if format == "json":
+            content = json.dumps(
+                {
+                    "command": self.Command,
+                    "timestamp": time.time(),
+                    "phases": self.Phases,
+                },
+                indent=2,
+            )
+        elif format == "prometheus":
+            content = self._CreatePrometheusContent()
+        else:
+            raise Exception("'{}' is not a supported format".format(format))
+
+        dirname = os.path.dirname(filename)
+        if dirname and not os.path.isdir(dirname):
+            os.makedirs(dirname)
+
+        # The textfile collector may read the file at any time, so write it atomically
+        temp_filename = "{}.{}.tmp".format(filename, os.getpid())
+
+        with open(temp_filename, "w") as f:
+            f.write(content)
+
+        os.replace(temp_filename, filename)
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    _metric_definitions                     = [
+        ("wall_seconds", "Wall time of the phase"),
+        ("cpu_seconds", "CPU time (user and system) of this process during the phase"),
+        ("children_cpu_seconds", "CPU time (user and system) of child processes that completed during the phase"),
+        ("peak_rss_bytes", "Peak resident set size of this process at the end of the phase"),
+        ("children_peak_rss_bytes", "Peak resident set size of the largest child process at the end of the phase"),
+        ("peak_traced_bytes", "Peak memory allocated by Python during the phase (when tracemalloc is tracing)"),
+    ]
+
+    def _CreatePrometheusContent(self):
+        lines = []
+
+        for key, description in self._metric_definitions:
+            metric_name = "common_nodejs_phase_{}".format(key)
+
+            lines += [
+                "# HELP {} {}".format(metric_name, description),
+                "# TYPE {} gauge".format(metric_name),
+            ]
+
+            for phase in self.Phases:
+                value = phase[key]
+                if value is None:
+                    continue
+
+                labels = [("command", self.Command), ("phase", phase["phase"])]
+                labels += sorted(phase["labels"].items())
+
+                lines.append(
+                    "{}{{{}}} {}".format(
+                        metric_name,
+                        ",".join(
+                            '{}="{}"'.format(_SanitizeLabelName(k), _EscapeLabelValue(v))
+                            for k, v in labels
+                        ),
+                        value,
+                    ),
+                )
+
+        return "\n".join(lines) + "\n"
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _GetCpuTimes():
+    """Returns (self, children) CPU seconds; children is None when not available"""
+
+    if resource is None:
+        return time.process_time(), None
+
+    self_usage = resource.getrusage(resource.RUSAGE_SELF)
+    children_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    return (
+        self_usage.ru_utime + self_usage.ru_stime,
+        children_usage.ru_utime + children_usage.ru_stime,
+    )
+
+
+# ----------------------------------------------------------------------
+def _GetPeakRss():
+    """Returns (self, children) peak RSS in bytes; values are None when not available"""
+
+    if resource is None:
+        return None, None
+
+    # ru_maxrss is in bytes on macOS and kilobytes everywhere else
+    multiplier = 1 if sys.platform == "darwin" else 1024
+
+    return (
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * multiplier,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * multiplier,
+    )
+
+
+# ----------------------------------------------------------------------
+_traced_phases                              = threading.local()
+
+def _EnterTracedPhase():
+    """Returns True if memory allocations are being traced for the phase"""
+
+    # tracemalloc.reset_peak is available in python 3.9 and later
+    if not tracemalloc.is_tracing() or not hasattr(tracemalloc, "reset_peak"):
+        return False
+
+    # Each item in the stack is the peak observed so far by an active phase. The peak is
+    # reset when a phase begins, so fold the current peak into the enclosing phase first.
+    stack = getattr(_traced_phases, "stack", None)
+    if stack is None:
+        stack = []
+        _traced_phases.stack = stack
+
+    current, peak = tracemalloc.get_traced_memory()
+
+    if stack:
+        stack[-1] = max(stack[-1], peak)
+
+    tracemalloc.reset_peak()
+    stack.append(current)
+
+    return True
+
+
+# ----------------------------------------------------------------------
+def _ExitTracedPhase():
+    stack = _traced_phases.stack
+
+    _, peak = tracemalloc.get_traced_memory()
+    peak = max(stack.pop(), peak)
+
+    if stack:
+        stack[-1] = max(stack[-1], peak)
+
+    return peak
+
+
+# ----------------------------------------------------------------------
+_label_name_regex                           = re.compile(r"[^a-zA-Z0-9_]")
+
+def _SanitizeLabelName(name):
+    return _label_name_regex.sub("_", name)
+
+
+# ----------------------------------------------------------------------
+def _EscapeLabelValue(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
@@ -0,0 +1,261 @@
+# ----------------------------------------------------------------------
+# |
+# |  NpmConfig.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 23:41:27
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Contains the NpmConfig object"""
+
+import base64
+import os
+import re
+import ssl
+
+from urllib.parse import urlparse
+from urllib.request import build_opener, HTTPSHandler, ProxyHandler, Request
+
+# ----------------------------------------------------------------------
+DEFAULT_REGISTRY                            = "https://registry.npmjs.org/"
+
+# npm's default 'fetch-timeout' (in milliseconds)
+DEFAULT_FETCH_TIMEOUT                       = 5 * 60 * 1000
+
+# ----------------------------------------------------------------------
+class NpmConfig(object):
+    """\
+    Registry, authentication, proxy, and TLS settings used by npm when downloading packages.
+
+    Settings are read the way that npm reads them (later sources take precedence): the user's
+    '.npmrc' (or the file specified by 'npm_config_userconfig'), the project's '.npmrc', and
+    'npm_config_*' environment variables. The global 'npmrc' (within npm's installation) is not
+    read.
+    """
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def Load(cls, working_dir=None):
+        values = {}
+
+        environment = {
+            key[len("npm_config_"):].lower(): value
+            for key, value in os.environ.items()
+            if key.lower().startswith("npm_config_")
+        }
+
+        filenames = [
+            environment.get("userconfig", None) or os.path.join(os.path.expanduser("~"), ".npmrc"),
+        ]
+
+        if working_dir is not None:
+            filenames.append(os.path.join(working_dir, ".npmrc"))
+
+        for filename in filenames:
+            if os.path.isfile(filename):
+                with open(filename, encoding="utf-8") as f:
+                    values.update(_ParseNpmrc(f.read()))
+
+        for key, value in environment.items():
+            if not key.startswith("//"):
+                key = key.replace("_", "-")
+
+            values[key] = value
+
+        return cls(values)
+
+    # ----------------------------------------------------------------------
+    def __init__(self, values=None):
+        self.Values                         = values or {}
+
+        registry = self.Values.get("registry", None) or DEFAULT_REGISTRY
+        if not registry.endswith("/"):
+            registry += "/"
+
+        self.Registry                       = registry
+
+        try:
+            self.Timeout                    = int(self.Values.get("fetch-timeout", DEFAULT_FETCH_TIMEOUT)) / 1000.0
+        except ValueError:
+            self.Timeout                    = DEFAULT_FETCH_TIMEOUT / 1000.0
+
+    # ----------------------------------------------------------------------
+    def GetReplacementRegistry(self, resolved):
+        """\
+        Returns the configured registry when `resolved` refers to the public registry but a
+        different registry is configured (npm's 'replace-registry-host' behavior); returns None
+        otherwise.
+        """
+
+        replace = self.Values.get("replace-registry-host", "npmjs")
+
+        if replace == "never" or self.Registry == DEFAULT_REGISTRY:
+            return None
+
+        host = urlparse(resolved).netloc
+
+        if replace == "always" or host == (urlparse(DEFAULT_REGISTRY).netloc if replace == "npmjs" else replace):
+            return self.Registry
+
+        return None
+
+    # ----------------------------------------------------------------------
+    def Open(self, url, timeout=None):
+        """Opens `url` with the configured authentication, proxy, and TLS settings"""
+
+        request = Request(url)
+
+        authorization = self._GetAuthorization(url)
+        if authorization is not None:
+            request.add_header("Authorization", authorization)
+
+        return self._CreateOpener(url).open(
+            request,
+            timeout=self.Timeout if timeout is None else timeout,
+        )
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _GetAuthorization(self, url):
+        parsed = urlparse(url)
+        if parsed.scheme not in ["http", "https"]:
+            return None
+
+        # Credentials are keyed by the url without its scheme ('//host/path/:_authToken'); the
+        # most specific path that has credentials is used.
+        path = "//{}{}".format(parsed.netloc, parsed.path)
+
+        while True:
+            index = path.rfind("/")
+            if index < 2:
+                break
+
+            path = path[:index]
+            prefix = path + "/:"
+
+            value = self.Values.get(prefix + "_authToken", None)
+            if value:
+                return "Bearer {}".format(value)
+
+            value = self.Values.get(prefix + "_auth", None)
+            if value:
+                return "Basic {}".format(value)
+
+            username = self.Values.get(prefix + "username", None)
+            password = self.Values.get(prefix + "_password", None)
+
+            if username and password:
+                return "Basic {}".format(
+                    base64.b64encode(
+                        "{}:{}".format(username, base64.b64decode(password).decode("utf-8")).encode("utf-8"),
+                    ).decode("ascii"),
+                )
+
+        # Credentials that aren't scoped apply to the configured registry
+        if url.startswith(self.Registry):
+            value = self.Values.get("_authToken", None)
+            if value:
+                return "Bearer {}".format(value)
+
+            value = self.Values.get("_auth", None)
+            if value:
+                return "Basic {}".format(value)
+
+        return None
+
+    # ----------------------------------------------------------------------
+    def _CreateOpener(self, url):
+        parsed = urlparse(url)
+        handlers = []
+
+        if parsed.scheme in ["http", "https"]:
+            if parsed.scheme == "https":
+                proxy = self.Values.get("https-proxy", None) or self.Values.get("proxy", None)
+            else:
+                proxy = self.Values.get("proxy", None)
+
+            if _IsNoProxy(parsed.hostname, self.Values.get("noproxy", None)):
+                handlers.append(ProxyHandler({}))
+            elif proxy:
+                handlers.append(ProxyHandler({parsed.scheme: proxy}))
+
+            # Without a handler, the proxy environment variables ('https_proxy', etc.) are used
+
+            if parsed.scheme == "https":
+                context = ssl.create_default_context(cafile=self.Values.get("cafile", None) or None)
+
+                if self.Values.get("strict-ssl", "true") == "false":
+                    context.check_hostname = False
+                    context.verify_mode = ssl.CERT_NONE
+
+                handlers.append(HTTPSHandler(context=context))
+
+        return build_opener(*handlers)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+_environment_variable_regex                 = re.compile(r"(?<!\\)(\\*)\$\{([^${}]+)\}")
+
+def _ParseNpmrc(content):
+    values = {}
+
+    for line in content.splitlines():
+        line = line.strip()
+
+        if not line or line[0] in ";#" or line.startswith("["):
+            continue
+
+        key, sep, value = line.partition("=")
+        if not sep:
+            continue
+
+        key = _ExpandEnvironmentVariables(key.strip())
+        value = value.strip()
+
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+
+        values[key] = _ExpandEnvironmentVariables(value)
+
+    return values
+
+
+# ----------------------------------------------------------------------
+def _ExpandEnvironmentVariables(value):
+    # ----------------------------------------------------------------------
+    def Replace(match):
+        escapes = match.group(1)
+
+        # An odd number of backslashes escapes the expression (this matches npm's behavior)
+        if len(escapes) % 2:
+            return match.group(0)[(len(escapes) + 1) // 2:]
+
+        return escapes[len(escapes) // 2:] + os.getenv(match.group(2), "${{{}}}".format(match.group(2)))
+
+    # ----------------------------------------------------------------------
+
+    return _environment_variable_regex.sub(Replace, value)
+
+
+# ----------------------------------------------------------------------
+def _IsNoProxy(hostname, noproxy):
+    if not noproxy or not hostname:
+        return False
+
+    for domain in noproxy.split(","):
+        domain = domain.strip().lstrip(".")
+
+        if domain and (hostname == domain or hostname.endswith("." + domain)):
+            return True
+
+    return False
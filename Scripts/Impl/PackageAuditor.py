@@ -0,0 +1,175 @@
+# ----------------------------------------------------------------------
+# |
+# |  PackageAuditor.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 20:52:40
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Compares the content of installed packages with the content of their tarballs"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+import tarfile
+
+from Impl.TarballStore import ParseIntegrity
+
+# ----------------------------------------------------------------------
+STATUS_MATCHES                              = "matches"
+STATUS_DIFFERS                              = "differs"
+STATUS_CORRUPT_TARBALL                      = "corrupt_tarball"
+
+# ----------------------------------------------------------------------
+def GetFingerprint(package_dir):
+    """\
+    Returns a value that changes when a file in the package is added, removed, or modified
+    (based on the size and modification time of each file), or None if the package doesn't
+    exist. Nested packages (in the package's 'node_modules' directory) are not included.
+    """
+
+    if not os.path.isdir(package_dir):
+        return None
+
+    hasher = hashlib.sha1()
+
+    pending = [package_dir]
+
+    while pending:
+        directory = pending.pop()
+
+        for item in sorted(os.scandir(directory), key=lambda item: item.name):
+            if item.is_dir(follow_symlinks=False):
+                if directory == package_dir and item.name == "node_modules":
+                    continue
+
+                pending.append(item.path)
+                continue
+
+            stat = item.stat(follow_symlinks=False)
+
+            hasher.update(
+                "{}\0{}\0{}\n".format(
+                    os.path.relpath(item.path, package_dir),
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                ).encode("utf-8"),
+            )
+
+    return hasher.hexdigest()
+
+
+# ----------------------------------------------------------------------
+def AuditPackage(package_dir, tarball_filename, integrity):
+    """\
+    Compares the installed package with the content of its tarball; returns (status,
+    [(relative filename, "modified" or "missing"), ...]).
+
+    Files created after the package was extracted (by install scripts, for example) are not
+    considered. Keys in 'package.json' that begin with an underscore are ignored, as they are
+    added by some versions of npm when the package is installed.
+    """
+
+    with open(tarball_filename, "rb") as f:
+        content = f.read()
+
+    algorithm, expected_digest = ParseIntegrity(integrity)
+
+    if base64.b64encode(hashlib.new(algorithm, content).digest()).decode("ascii") != expected_digest:
+        return STATUS_CORRUPT_TARBALL, []
+
+    differences = []
+
+    with tarfile.open(fileobj=io.BytesIO(content), mode="r:gz") as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+
+            # Strip the top-level directory ('package/' in most cases), as the package is extracted
+            parts = member.name.replace("\\", "/").split("/")[1:]
+            parts = [part for part in parts if part not in ["", "."]]
+
+            if not parts or ".." in parts:
+                continue
+
+            # Bundled dependencies are packages in their own right (and may be replaced by
+            # the packages in the lockfile).
+            if parts[0] == "node_modules":
+                continue
+
+            relative_filename = "/".join(parts)
+
+            filename = os.path.join(package_dir, *parts)
+            if not os.path.isfile(filename):
+                differences.append((relative_filename, "missing"))
+                continue
+
+            source = tar.extractfile(member)
+            try:
+                if relative_filename == "package.json":
+                    is_same = _IsSamePackageJson(source, filename)
+                else:
+                    is_same = _IsSameContent(source, member.size, filename)
+            finally:
+                source.close()
+
+            if not is_same:
+                differences.append((relative_filename, "modified"))
+
+    return STATUS_DIFFERS if differences else STATUS_MATCHES, differences
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _IsSameContent(source, size, filename):
+    if os.path.getsize(filename) != size:
+        return False
+
+    with open(filename, "rb") as f:
+        while True:
+            expected = source.read(1024 * 1024)
+            actual = f.read(1024 * 1024)
+
+            if expected != actual:
+                return False
+
+            if not expected:
+                return True
+
+
+# ----------------------------------------------------------------------
+def _IsSamePackageJson(source, filename):
+    expected = source.read()
+
+    with open(filename, "rb") as f:
+        actual = f.read()
+
+    if expected == actual:
+        return True
+
+    try:
+        expected = json.loads(expected.decode("utf-8"))
+        actual = json.loads(actual.decode("utf-8"))
+    except ValueError:
+        return False
+
+    if not isinstance(expected, dict) or not isinstance(actual, dict):
+        return False
+
+    # ----------------------------------------------------------------------
+    def Strip(content):
+        return {key: value for key, value in content.items() if not key.startswith("_")}
+
+    # ----------------------------------------------------------------------
+
+    return Strip(expected) == Strip(actual)
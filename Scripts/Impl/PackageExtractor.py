@@ -0,0 +1,165 @@
+# ----------------------------------------------------------------------
+# |
+# |  PackageExtractor.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 11:24:40
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Extracts npm package tarballs into 'node_modules' directories"""
+
+import json
+import os
+import shutil
+import tarfile
+import uuid
+
+# ----------------------------------------------------------------------
+# Lifecycle scripts that npm runs when a package is installed
+INSTALL_SCRIPT_NAMES                        = ["preinstall", "install", "postinstall"]
+
+# ----------------------------------------------------------------------
+def ExtractPackage(tarball_filename, package_dir):
+    """\
+    Extracts the tarball to `package_dir`, replacing any existing content but preserving a
+    nested 'node_modules' directory (which contains other packages).
+    """
+
+    ReplacePackage(package_dir, lambda temp_dir: ExtractTarball(tarball_filename, temp_dir))
+
+
+# ----------------------------------------------------------------------
+def ReplacePackage(
+    package_dir,
+    populate_func,                          # def Func(temp_dir)
+):
+    """\
+    Replaces the content of `package_dir` with the content created by `populate_func`, but
+    preserves a nested 'node_modules' directory (which contains other packages).
+
+    The content is created in a temporary sibling directory and then moved into place so
+    that `package_dir` is never left partially populated.
+    """
+
+    parent_dir = os.path.dirname(package_dir)
+    if not os.path.isdir(parent_dir):
+        try:
+            os.makedirs(parent_dir)
+        except OSError:
+            # Another thread created the directory
+            if not os.path.isdir(parent_dir):
+                raise
+
+    temp_dir = "{}.{}.tmp".format(package_dir, uuid.uuid4().hex)
+
+    try:
+        populate_func(temp_dir)
+
+        existing_node_modules_dir = os.path.join(package_dir, "node_modules")
+        if os.path.isdir(existing_node_modules_dir):
+            os.rename(existing_node_modules_dir, os.path.join(temp_dir, "node_modules"))
+
+        if os.path.isdir(package_dir):
+            shutil.rmtree(package_dir)
+
+        os.rename(temp_dir, package_dir)
+        temp_dir = None
+
+    finally:
+        if temp_dir is not None and os.path.isdir(temp_dir):
+            shutil.rmtree(temp_dir)
+
+
+# ----------------------------------------------------------------------
+def ExtractTarball(tarball_filename, dest_dir):
+    """\
+    Extracts the content of an npm tarball to `dest_dir`, stripping the top-level directory
+    ('package/' in most cases). Like npm, links and other special entries are ignored.
+    """
+
+    os.makedirs(dest_dir)
+
+    with tarfile.open(tarball_filename, "r:gz") as tar:
+        for member in tar:
+            parts = member.name.replace("\\", "/").split("/")[1:]
+            parts = [part for part in parts if part not in ["", "."]]
+
+            if not parts or ".." in parts:
+                continue
+
+            dest = os.path.join(dest_dir, *parts)
+
+            if member.isdir():
+                if not os.path.isdir(dest):
+                    os.makedirs(dest)
+
+                continue
+
+            if not member.isfile():
+                continue
+
+            this_dir = os.path.dirname(dest)
+            if not os.path.isdir(this_dir):
+                os.makedirs(this_dir)
+
+            source = tar.extractfile(member)
+            try:
+                with open(dest, "wb") as f:
+                    shutil.copyfileobj(source, f)
+            finally:
+                source.close()
+
+            # npm normalizes permissions to 0644/0755
+            os.chmod(dest, 0o755 if member.mode & 0o111 else 0o644)
+
+
+# ----------------------------------------------------------------------
+def IsExtracted(package_dir, version):
+    """Returns True if `package_dir` contains the 'package.json' file of the package's `version`"""
+
+    return _ReadPackageJson(package_dir).get("version", None) == version
+
+
+# ----------------------------------------------------------------------
+def RequiresRebuild(package_dir):
+    """\
+    Returns True if npm must process the package after extraction (lifecycle scripts, native
+    bindings, or executables that must be linked in 'node_modules/.bin').
+    """
+
+    if HasInstallScripts(package_dir):
+        return True
+
+    return bool(_ReadPackageJson(package_dir).get("bin", None))
+
+
+# ----------------------------------------------------------------------
+def HasInstallScripts(package_dir):
+    """Returns True if npm runs scripts (which may modify the package's files) during install"""
+
+    if os.path.isfile(os.path.join(package_dir, "binding.gyp")):
+        return True
+
+    scripts = _ReadPackageJson(package_dir).get("scripts", None) or {}
+
+    return any(name in scripts for name in INSTALL_SCRIPT_NAMES)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _ReadPackageJson(package_dir):
+    try:
+        with open(os.path.join(package_dir, "package.json"), encoding="utf-8") as f:
+            content = json.load(f)
+    except (IOError, ValueError):
+        return {}
+
+    return content if isinstance(content, dict) else {}
@@ -0,0 +1,283 @@
+# ----------------------------------------------------------------------
+# |
+# |  PackageStore.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 12:31:44
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Contains the PackageStore object"""
+
+import base64
+import hashlib
+import json
+import os
+import shutil
+import uuid
+
+from Impl.DirectoryCache import LinkOrCopyTree
+from Impl.FileLock import FileLock
+from Impl.PackageExtractor import ExtractTarball, HasInstallScripts, ReplacePackage, RequiresRebuild
+from Impl.TarballStore import ParseIntegrity
+
+# ----------------------------------------------------------------------
+class PackageStore(object):
+    """\
+    Global, content-addressed store of extracted packages.
+
+    Each package is extracted once to '<root>/<algorithm>/<hex[:2]>/<hex>' (keyed by the
+    package's integrity value) and projects' 'node_modules' directories are populated with
+    hardlinks to those files. Packages that run install scripts are copied rather than
+    linked, as those scripts may modify the package's files.
+
+    Projects record the entries that they use in 'node_modules/.package_store_references.json'
+    (see `SetReferences`) and are registered in '<root>/projects'. An entry is referenced as
+    long as a registered project that still has its references file lists it; entries that
+    aren't referenced are removed by `GarbageCollect`. Link counts aren't used, as packages
+    that are copied rather than linked would never appear to be referenced.
+    """
+
+    REFERENCES_FILENAME                     = ".package_store_references.json"
+
+    # ----------------------------------------------------------------------
+    def __init__(self, root):
+        self.Root                           = os.path.realpath(root)
+
+        self._projects_dir                  = os.path.join(self.Root, "projects")
+
+        # Held while references are changed and while garbage is collected, so that entries
+        # aren't removed between the time that a project references them and the time that
+        # they are linked.
+        self._lock                          = FileLock(os.path.join(self.Root, "references.lock"))
+
+    # ----------------------------------------------------------------------
+    def GetEntryDir(self, integrity):
+        algorithm, digest = ParseIntegrity(integrity)
+        digest = base64.b64decode(digest).hex()
+
+        return os.path.join(self.Root, algorithm, digest[:2], digest)
+
+    # ----------------------------------------------------------------------
+    def Ensure(
+        self,
+        record,
+        tarball_store,
+        registry=None,
+    ):
+        """Returns the entry directory for the record, extracting the package if necessary"""
+
+        entry_dir = self.GetEntryDir(record.integrity)
+        if os.path.isdir(entry_dir):
+            return entry_dir
+
+        tarball_filename = tarball_store.Fetch(record, registry)
+
+        temp_dir = os.path.join(self.Root, "tmp", uuid.uuid4().hex)
+
+        try:
+            ExtractTarball(tarball_filename, temp_dir)
+
+            parent_dir = os.path.dirname(entry_dir)
+            if not os.path.isdir(parent_dir):
+                try:
+                    os.makedirs(parent_dir)
+                except OSError:
+                    # Another thread or process created the directory
+                    if not os.path.isdir(parent_dir):
+                        raise
+
+            try:
+                os.rename(temp_dir, entry_dir)
+                temp_dir = None
+            except OSError:
+                # Another thread or process extracted the same package
+                if not os.path.isdir(entry_dir):
+                    raise
+
+        finally:
+            if temp_dir is not None and os.path.isdir(temp_dir):
+                shutil.rmtree(temp_dir)
+
+        return entry_dir
+
+    # ----------------------------------------------------------------------
+    def Link(
+        self,
+        record,
+        package_dir,
+        tarball_store,
+        registry=None,
+    ):
+        """\
+        Populates `package_dir` with links to the package's files in the store; returns True
+        if the package must be rebuilt by npm.
+        """
+
+        entry_dir = self.Ensure(record, tarball_store, registry)
+
+        use_links = not HasInstallScripts(entry_dir)
+
+        ReplacePackage(
+            package_dir,
+            lambda temp_dir: LinkOrCopyTree(entry_dir, temp_dir, use_links=use_links),
+        )
+
+        return RequiresRebuild(entry_dir)
+
+    # ----------------------------------------------------------------------
+    def SetReferences(self, node_modules_dir, integrities):
+        """\
+        Records that the project's 'node_modules' directory uses the packages with the given
+        integrity values (replacing any previous references). Must be called before the
+        packages are linked or copied.
+        """
+
+        node_modules_dir = os.path.realpath(node_modules_dir)
+
+        with self._lock:
+            for directory in [self._projects_dir, node_modules_dir]:
+                if not os.path.isdir(directory):
+                    os.makedirs(directory)
+
+            _WriteJson(
+                os.path.join(node_modules_dir, self.REFERENCES_FILENAME),
+                {
+                    "store": self.Root,
+                    "integrities": sorted(set(integrities)),
+                },
+            )
+
+            _WriteJson(
+                os.path.join(
+                    self._projects_dir,
+                    hashlib.sha1(os.path.normcase(node_modules_dir).encode("utf-8")).hexdigest(),
+                ),
+                {
+                    "node_modules_dir": node_modules_dir,
+                },
+            )
+
+    # ----------------------------------------------------------------------
+    def GetReferencedEntries(self):
+        """\
+        Returns the set of entry directories referenced by registered projects. Projects whose
+        references no longer exist ('node_modules' was removed or reinstalled by other means)
+        are unregistered.
+        """
+
+        referenced = set()
+
+        with self._lock:
+            if not os.path.isdir(self._projects_dir):
+                return referenced
+
+            for item in os.listdir(self._projects_dir):
+                registration_filename = os.path.join(self._projects_dir, item)
+
+                references = None
+
+                try:
+                    with open(registration_filename) as f:
+                        node_modules_dir = json.load(f)["node_modules_dir"]
+
+                    with open(os.path.join(node_modules_dir, self.REFERENCES_FILENAME)) as f:
+                        references = json.load(f)
+
+                except (IOError, ValueError, KeyError):
+                    pass
+
+                # The project now uses a different store
+                if references is not None and references.get("store", None) != self.Root:
+                    references = None
+
+                if references is None:
+                    os.remove(registration_filename)
+                    continue
+
+                for integrity in references.get("integrities", []):
+                    referenced.add(os.path.normcase(self.GetEntryDir(integrity)))
+
+        return referenced
+
+    # ----------------------------------------------------------------------
+    def EnumEntries(self):
+        """Yields the directory of every entry in the store"""
+
+        if not os.path.isdir(self.Root):
+            return
+
+        for algorithm in os.listdir(self.Root):
+            if algorithm in ["tmp", "projects"]:
+                continue
+
+            algorithm_dir = os.path.join(self.Root, algorithm)
+            if not os.path.isdir(algorithm_dir):
+                continue
+
+            for prefix in os.listdir(algorithm_dir):
+                prefix_dir = os.path.join(algorithm_dir, prefix)
+
+                for digest in os.listdir(prefix_dir):
+                    yield os.path.join(prefix_dir, digest)
+
+    # ----------------------------------------------------------------------
+    def EnumEntryInfo(self):
+        """Yields (entry_dir, is_referenced, size in bytes) for every entry in the store"""
+
+        referenced = self.GetReferencedEntries()
+
+        for entry_dir in self.EnumEntries():
+            yield entry_dir, os.path.normcase(entry_dir) in referenced, _GetDirSize(entry_dir)
+
+    # ----------------------------------------------------------------------
+    def GarbageCollect(
+        self,
+        dry_run=False,
+    ):
+        """Removes unreferenced entries; returns (num entries removed, bytes freed)"""
+
+        num_removed = 0
+        bytes_freed = 0
+
+        with self._lock:
+            for entry_dir, is_referenced, size in list(self.EnumEntryInfo()):
+                if is_referenced:
+                    continue
+
+                if not dry_run:
+                    shutil.rmtree(entry_dir)
+
+                num_removed += 1
+                bytes_freed += size
+
+        return num_removed, bytes_freed
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _GetDirSize(directory):
+    size = 0
+
+    for root, _, filenames in os.walk(directory):
+        for filename in filenames:
+            size += os.lstat(os.path.join(root, filename)).st_size
+
+    return size
+
+
+# ----------------------------------------------------------------------
+def _WriteJson(filename, content):
+    temp_filename = "{}.{}".format(filename, uuid.uuid4().hex)
+
+    with open(temp_filename, "w") as f:
+        json.dump(content, f)
+
+    os.replace(temp_filename, filename)
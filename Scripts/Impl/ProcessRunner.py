@@ -0,0 +1,274 @@
+# ----------------------------------------------------------------------
+# |
+# |  ProcessRunner.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 15:41:27
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Runs processes while streaming their output line by line.
+
+Only the last N lines of output are retained (so that they can be displayed if the process
+fails), which keeps memory usage constant regardless of how much output the process generates.
+"""
+
+import asyncio
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+from collections import deque
+
+# ----------------------------------------------------------------------
+DEFAULT_MAX_LINES                           = 200
+
+# Lines longer than this are truncated
+MAX_LINE_LENGTH                             = 4096
+
+_READ_SIZE                                  = 64 * 1024
+_PROGRESS_INTERVAL                          = 0.1
+
+# ----------------------------------------------------------------------
+def Run(
+    command_line,
+    cwd=None,
+    output_stream=None,                     # All output is written to this stream if provided
+    progress_stream=None,                   # The most recent line of output is displayed on a single, continuously updated line if provided
+    max_lines=DEFAULT_MAX_LINES,
+):
+    """Runs the command and returns (result, [last `max_lines` lines of output])"""
+
+    output = _Output(output_stream, progress_stream, max_lines)
+
+    try:
+        if _CanUseAsyncio():
+            result = _RunAsyncio(command_line, cwd, output)
+        else:
+            result = _RunSync(command_line, cwd, output)
+
+    finally:
+        output.Close()
+
+    return result, list(output.Lines)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+class _Output(object):
+    """Collects lines written by one or more streams"""
+
+    # ----------------------------------------------------------------------
+    def __init__(self, output_stream, progress_stream, max_lines):
+        self.Lines                          = deque(maxlen=max_lines)
+
+        self._output_stream                 = output_stream
+        self._progress_stream               = progress_stream
+
+        self._progress_width                = shutil.get_terminal_size().columns - 1
+        self._progress_time                 = None
+        self._progress_displayed            = False
+
+        self._lock                          = threading.Lock()
+
+    # ----------------------------------------------------------------------
+    def CreateSplitter(self):
+        return _LineSplitter(self._OnLine)
+
+    # ----------------------------------------------------------------------
+    def Close(self):
+        if self._progress_displayed:
+            self._progress_stream.write("\r{}\r".format(" " * self._progress_width))
+            self._progress_stream.flush()
+
+            self._progress_displayed = False
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _OnLine(self, line):
+        with self._lock:
+            self.Lines.append(line)
+
+            if self._output_stream is not None:
+                self._output_stream.write("{}\n".format(line))
+
+            if self._progress_stream is not None and line.strip():
+                now = time.perf_counter()
+
+                if self._progress_time is None or now - self._progress_time >= _PROGRESS_INTERVAL:
+                    self._progress_time = now
+
+                    self._progress_stream.write(
+                        "\r{}".format(line.strip()[:self._progress_width].ljust(self._progress_width)),
+                    )
+                    self._progress_stream.flush()
+
+                    self._progress_displayed = True
+
+
+# ----------------------------------------------------------------------
+class _LineSplitter(object):
+    """Converts chunks of bytes into lines"""
+
+    # ----------------------------------------------------------------------
+    def __init__(self, on_line_func):
+        self._on_line_func                  = on_line_func
+        self._partial                       = b""
+        self._is_truncated                  = False
+
+    # ----------------------------------------------------------------------
+    def Write(self, content):
+        lines = (self._partial + content).split(b"\n")
+        self._partial = lines.pop()
+
+        for line in lines:
+            self._Emit(line)
+
+            self._is_truncated = False
+
+        # Don't allow a line without a newline to grow without bound
+        if len(self._partial) > MAX_LINE_LENGTH:
+            if not self._is_truncated:
+                self._Emit(self._partial)
+                self._is_truncated = True
+
+            self._partial = b""
+
+    # ----------------------------------------------------------------------
+    def Flush(self):
+        if self._partial:
+            self._Emit(self._partial)
+            self._partial = b""
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _Emit(self, line):
+        if self._is_truncated:
+            # The beginning of this line has already been emitted
+            return
+
+        self._on_line_func(
+            line[:MAX_LINE_LENGTH].decode("utf-8", errors="replace").rstrip("\r"),
+        )
+
+
+# ----------------------------------------------------------------------
+def _CanUseAsyncio():
+    # Prior to python 3.8, the child watcher used on posix systems could only be used with an
+    # event loop running on the main thread.
+    return (
+        sys.platform == "win32"
+        or sys.version_info >= (3, 8)
+        or threading.current_thread() is threading.main_thread()
+    )
+
+
+# ----------------------------------------------------------------------
+def _RunAsyncio(command_line, cwd, output):
+    # A new event loop is created for each invocation so that processes can be run
+    # concurrently on different threads.
+    if sys.platform == "win32":
+        # Subprocesses are only supported by the proactor event loop prior to python 3.8
+        loop = asyncio.ProactorEventLoop()
+    else:
+        loop = asyncio.new_event_loop()
+
+        if sys.version_info < (3, 8):
+            asyncio.get_child_watcher().attach_loop(loop)
+
+    processes = []
+
+    # ----------------------------------------------------------------------
+    async def ReadStream(stream):
+        splitter = output.CreateSplitter()
+
+        while True:
+            content = await stream.read(_READ_SIZE)
+            if not content:
+                break
+
+            splitter.Write(content)
+
+        splitter.Flush()
+
+    # ----------------------------------------------------------------------
+    async def Impl():
+        process = await asyncio.create_subprocess_shell(
+            command_line,
+            cwd=cwd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+
+        processes.append(process)
+
+        await asyncio.gather(ReadStream(process.stdout), ReadStream(process.stderr))
+
+        return await process.wait()
+
+    # ----------------------------------------------------------------------
+
+    try:
+        return loop.run_until_complete(Impl())
+
+    except BaseException:
+        # Don't leave the process running if we were interrupted
+        for process in processes:
+            if process.returncode is None:
+                process.kill()
+
+                # Wait for the process to exit so that the caller's cleanup doesn't race with it
+                loop.run_until_complete(process.wait())
+
+        raise
+
+    finally:
+        loop.close()
+
+
+# ----------------------------------------------------------------------
+def _RunSync(command_line, cwd, output):
+    process = subprocess.Popen(
+        command_line,
+        shell=True,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+
+    try:
+        splitter = output.CreateSplitter()
+
+        while True:
+            content = process.stdout.read1(_READ_SIZE)
+            if not content:
+                break
+
+            splitter.Write(content)
+
+        splitter.Flush()
+
+        process.stdout.close()
+
+        return process.wait()
+
+    except BaseException:
+        if process.poll() is None:
+            process.kill()
+
+            # Wait for the process to exit so that the caller's cleanup doesn't race with it
+            process.wait()
+
+        raise
@@ -0,0 +1,387 @@
+# ----------------------------------------------------------------------
+# |
+# |  Semver.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 16:41:09
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Parses versions and evaluates version ranges using npm's semver rules.
+
+Supported range syntax includes comparators ('>=1.2.3 <2'), caret and tilde ranges,
+x-ranges ('1.x', '1.2.*', '*'), hyphen ranges ('1.2 - 2.3.4'), and unions ('a || b').
+Prerelease versions only satisfy a range when a comparator in the same set refers to a
+prerelease of the same major.minor.patch version (this matches the default behavior of npm).
+"""
+
+import re
+
+from functools import lru_cache
+
+# ----------------------------------------------------------------------
+_VERSION_REGEX                              = re.compile(
+    r"""(?#
+    Prefix                                  )^\s*[v=]*\s*(?#
+    Major                                   )(?P<major>\d+)\.(?#
+    Minor                                   )(?P<minor>\d+)\.(?#
+    Patch                                   )(?P<patch>\d+)(?#
+    Prerelease                              )(?:-?(?P<prerelease>[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?(?#
+    Build                                   )(?:\+[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*)?(?#
+    Suffix                                  )\s*$""",
+)
+
+_PARTIAL_REGEX                              = re.compile(
+    r"""(?#
+    Prefix                                  )^[v=]*(?#
+    Major                                   )(?P<major>\d+|[xX*])(?#
+    Minor                                   )(?:\.(?P<minor>\d+|[xX*]))?(?#
+    Patch                                   )(?:\.(?P<patch>\d+|[xX*]))?(?#
+    Prerelease                              )(?:-?(?P<prerelease>[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?(?#
+    Build                                   )(?:\+[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*)?$""",
+)
+
+_COMPARATOR_REGEX                           = re.compile(r"^(?P<operator><=|>=|<|>|=|~>|~|\^)?(?P<partial>.*)$")
+_HYPHEN_REGEX                               = re.compile(r"^\s*(?P<begin>\S+)\s+-\s+(?P<end>\S+)\s*$")
+_OPERATOR_WHITESPACE_REGEX                  = re.compile(r"(<=|>=|<|>|=|~>|~|\^)\s+")
+
+# Sorts before all other prereleases; used to exclude the prereleases of upper bounds ('<2.0.0-0')
+_MIN_PRERELEASE                             = ()
+
+# ----------------------------------------------------------------------
+def ParseVersion(value):
+    """Returns a comparable version tuple or None if the value isn't a valid version"""
+
+    match = _VERSION_REGEX.match(value or "")
+    if not match:
+        return None
+
+    return _CreateVersion(
+        int(match.group("major")),
+        int(match.group("minor")),
+        int(match.group("patch")),
+        match.group("prerelease"),
+    )
+
+
+# ----------------------------------------------------------------------
+@lru_cache(maxsize=None)
+def ParseRange(value):
+    """\
+    Returns the comparator sets (a version satisfies the range if it satisfies all of
+    the comparators in any set) or None if the value isn't a semver range (for example,
+    a git url, tarball url, tag, or local path).
+    """
+
+    if value is None:
+        return None
+
+    # Aliases ('npm:<name>@<range>') are evaluated against the range of the aliased package
+    if value.startswith("npm:"):
+        index = value.rfind("@")
+        if index <= len("npm:"):
+            return ((),)
+
+        value = value[index + 1:]
+
+    results = []
+
+    for range_value in value.split("||"):
+        comparators = _ParseComparatorSet(range_value)
+        if comparators is None:
+            return None
+
+        results.append(tuple(comparators))
+
+    # The results are cached, as lockfiles contain relatively few distinct ranges that are
+    # evaluated many times.
+    return tuple(results)
+
+
+# ----------------------------------------------------------------------
+def Satisfies(version, range_value):
+    """\
+    Returns True if the version satisfies the range. Values that can't be parsed never satisfy
+    a range.
+    """
+
+    if not isinstance(version, tuple):
+        version = ParseVersion(version)
+        if version is None:
+            return False
+
+    comparator_sets = ParseRange(range_value)
+    if comparator_sets is None:
+        return False
+
+    for comparators in comparator_sets:
+        if not all(_Compare(version, operator, bound) for operator, bound in comparators):
+            continue
+
+        if _IsPrerelease(version):
+            if not any(
+                _IsPrerelease(bound) and bound[:3] == version[:3]
+                for _, bound in comparators
+            ):
+                continue
+
+        return True
+
+    return False
+
+
+# ----------------------------------------------------------------------
+def ToString(version):
+    major, minor, patch, prerelease = version
+
+    result = "{}.{}.{}".format(major, minor, patch)
+
+    if _IsPrerelease(version) and prerelease[1]:
+        result += "-{}".format(".".join(str(part[1]) for part in prerelease[1]))
+
+    return result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _CreateVersion(major, minor, patch, prerelease=None):
+    # Versions are tuples that can be compared directly: (major, minor, patch, prerelease_key).
+    # The prerelease key of a version without a prerelease sorts after the keys of all of its
+    # prereleases; numeric identifiers sort before alphanumeric identifiers.
+    if prerelease is None:
+        prerelease_key = (1,)
+    elif isinstance(prerelease, tuple):
+        prerelease_key = (0, prerelease)
+    else:
+        prerelease_key = (
+            0,
+            tuple(
+                (1, int(part)) if part.isdigit() else (2, part)
+                for part in prerelease.split(".")
+            ),
+        )
+
+    return (major, minor, patch, prerelease_key)
+
+
+# ----------------------------------------------------------------------
+def _IsPrerelease(version):
+    return version[3][0] == 0
+
+
+# ----------------------------------------------------------------------
+def _Compare(version, operator, bound):
+    if operator == ">=":
+        return version >= bound
+    if operator == ">":
+        return version > bound
+    if operator == "<":
+        return version < bound
+    if operator == "<=":
+        return version <= bound
+    if operator == "=":
+        return version == bound
+
+    assert False, operator
+
+
+# ----------------------------------------------------------------------
+def _ParseComparatorSet(value):
+    value = value.strip()
+
+    match = _HYPHEN_REGEX.match(value)
+    if match:
+        begin = _ParsePartial(match.group("begin"))
+        end = _ParsePartial(match.group("end"))
+
+        if begin is None or end is None:
+            return None
+
+        return _GreaterThanOrEqual(begin) + _LessThanOrEqual(end)
+
+    value = _OPERATOR_WHITESPACE_REGEX.sub(r"\1", value)
+
+    results = []
+
+    for part in value.split():
+        match = _COMPARATOR_REGEX.match(part)
+
+        partial = _ParsePartial(match.group("partial"))
+        if partial is None:
+            return None
+
+        operator = match.group("operator") or "="
+
+        if operator == "^":
+            comparators = _Caret(partial)
+        elif operator in ["~", "~>"]:
+            comparators = _Tilde(partial)
+        elif operator == "=":
+            comparators = _XRange(partial)
+        elif operator == ">=":
+            comparators = _GreaterThanOrEqual(partial)
+        elif operator == ">":
+            comparators = _GreaterThan(partial)
+        elif operator == "<":
+            comparators = _LessThan(partial)
+        elif operator == "<=":
+            comparators = _LessThanOrEqual(partial)
+        else:
+            assert False, operator
+
+        results += comparators
+
+    return results
+
+
+# ----------------------------------------------------------------------
+def _ParsePartial(value):
+    """Returns (major, minor, patch, prerelease) where missing or wildcard parts are None"""
+
+    if value == "":
+        return (None, None, None, None)
+
+    match = _PARTIAL_REGEX.match(value)
+    if not match:
+        return None
+
+    parts = []
+
+    for group_name in ["major", "minor", "patch"]:
+        part = match.group(group_name)
+        parts.append(int(part) if part is not None and part.isdigit() else None)
+
+    # Parts that follow a wildcard are also wildcards ('1.x.3' is equivalent to '1.x')
+    for index in range(1, 3):
+        if parts[index - 1] is None:
+            parts[index] = None
+
+    prerelease = match.group("prerelease")
+    if parts[2] is None:
+        prerelease = None
+
+    return tuple(parts) + (prerelease,)
+
+
+# ----------------------------------------------------------------------
+def _Upper(major, minor=None):
+    """Returns the exclusive upper bound that excludes all prereleases of the bound"""
+
+    if minor is None:
+        return _CreateVersion(major + 1, 0, 0, _MIN_PRERELEASE)
+
+    return _CreateVersion(major, minor + 1, 0, _MIN_PRERELEASE)
+
+
+# ----------------------------------------------------------------------
+def _XRange(partial):
+    major, minor, patch, prerelease = partial
+
+    if major is None:
+        return []
+
+    if minor is None:
+        return [(">=", _CreateVersion(major, 0, 0)), ("<", _Upper(major))]
+
+    if patch is None:
+        return [(">=", _CreateVersion(major, minor, 0)), ("<", _Upper(major, minor))]
+
+    return [("=", _CreateVersion(major, minor, patch, prerelease))]
+
+
+# ----------------------------------------------------------------------
+def _Tilde(partial):
+    major, minor, patch, prerelease = partial
+
+    if major is None or minor is None or patch is None:
+        return _XRange(partial)
+
+    return [(">=", _CreateVersion(major, minor, patch, prerelease)), ("<", _Upper(major, minor))]
+
+
+# ----------------------------------------------------------------------
+def _Caret(partial):
+    major, minor, patch, prerelease = partial
+
+    if major is None:
+        return []
+
+    if minor is None:
+        return _XRange(partial)
+
+    if patch is None:
+        if major == 0:
+            return [(">=", _CreateVersion(0, minor, 0)), ("<", _Upper(0, minor))]
+
+        return [(">=", _CreateVersion(major, minor, 0)), ("<", _Upper(major))]
+
+    lower = (">=", _CreateVersion(major, minor, patch, prerelease))
+
+    if major != 0:
+        return [lower, ("<", _Upper(major))]
+
+    if minor != 0:
+        return [lower, ("<", _Upper(0, minor))]
+
+    return [lower, ("<", _CreateVersion(0, 0, patch + 1, _MIN_PRERELEASE))]
+
+
+# ----------------------------------------------------------------------
+def _GreaterThanOrEqual(partial):
+    major, minor, patch, prerelease = partial
+
+    if major is None:
+        return []
+
+    return [(">=", _CreateVersion(major, minor or 0, patch or 0, prerelease))]
+
+
+# ----------------------------------------------------------------------
+def _GreaterThan(partial):
+    major, minor, patch, prerelease = partial
+
+    if major is None:
+        # Nothing is greater than everything
+        return [("<", _CreateVersion(0, 0, 0, _MIN_PRERELEASE))]
+
+    if minor is None:
+        return [(">=", _CreateVersion(major + 1, 0, 0))]
+
+    if patch is None:
+        return [(">=", _CreateVersion(major, minor + 1, 0))]
+
+    return [(">", _CreateVersion(major, minor, patch, prerelease))]
+
+
+# ----------------------------------------------------------------------
+def _LessThan(partial):
+    major, minor, patch, prerelease = partial
+
+    if major is None:
+        return [("<", _CreateVersion(0, 0, 0, _MIN_PRERELEASE))]
+
+    return [("<", _CreateVersion(major, minor or 0, patch or 0, prerelease if patch is not None else _MIN_PRERELEASE))]
+
+
+# ----------------------------------------------------------------------
+def _LessThanOrEqual(partial):
+    major, minor, patch, prerelease = partial
+
+    if major is None:
+        return []
+
+    if minor is None:
+        return [("<", _Upper(major))]
+
+    if patch is None:
+        return [("<", _Upper(major, minor))]
+
+    return [("<=", _CreateVersion(major, minor, patch, prerelease))]
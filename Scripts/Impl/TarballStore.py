@@ -0,0 +1,310 @@
+# ----------------------------------------------------------------------
+# |
+# |  TarballStore.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 10:38:05
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Contains the TarballStore object and integrity helpers"""
+
+import base64
+import hashlib
+import os
+import pathlib
+import re
+import shutil
+import threading
+import uuid
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from Impl.NpmConfig import NpmConfig
+
+# ----------------------------------------------------------------------
+# Strongest algorithms first
+SUPPORTED_ALGORITHMS                        = ["sha512", "sha384", "sha256", "sha1"]
+
+# ----------------------------------------------------------------------
+class IntegrityException(Exception):
+    pass
+
+
+# ----------------------------------------------------------------------
+def ParseIntegrity(integrity):
+    """\
+    Returns (algorithm, base64 digest) for the strongest supported hash in a Subresource
+    Integrity string (for example, 'sha512-<base64> sha1-<base64>').
+    """
+
+    hashes = {}
+
+    for item in integrity.split():
+        algorithm, sep, digest = item.partition("-")
+        if not sep:
+            continue
+
+        # Options may be appended to the digest ('sha512-<base64>?<option>')
+        hashes.setdefault(algorithm, digest.split("?")[0])
+
+    for algorithm in SUPPORTED_ALGORITHMS:
+        if algorithm in hashes:
+            return algorithm, hashes[algorithm]
+
+    raise IntegrityException("'{}' does not contain a supported hash".format(integrity))
+
+
+# ----------------------------------------------------------------------
+def HashFile(
+    filename,
+    algorithm,
+    chunk_size=1024 * 1024,
+):
+    """Returns the base64-encoded digest of the file's content"""
+
+    hasher = hashlib.new(algorithm)
+
+    with open(filename, "rb") as f:
+        while True:
+            content = f.read(chunk_size)
+            if not content:
+                break
+
+            hasher.update(content)
+
+    return base64.b64encode(hasher.digest()).decode("ascii")
+
+
+# ----------------------------------------------------------------------
+class TarballStore(object):
+    """\
+    Content-addressed store of package tarballs.
+
+    Tarballs are stored at '<root>/<algorithm>/<hex[:2]>/<hex>.tgz', where <hex> is the
+    hex-encoded digest of the strongest hash in the package's integrity value.
+
+    Tarballs are downloaded with the registry, authentication, proxy, and timeout settings in
+    `npm_config` (read from the current directory's '.npmrc', the user's '.npmrc', and the
+    environment when not provided).
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        root,
+        npm_config=None,
+    ):
+        self.Root                           = os.path.realpath(root)
+        self.NpmConfig                      = npm_config or NpmConfig.Load(os.getcwd())
+
+    # ----------------------------------------------------------------------
+    def GetFilename(self, integrity):
+        algorithm, digest = ParseIntegrity(integrity)
+        digest = base64.b64decode(digest).hex()
+
+        return os.path.join(self.Root, algorithm, digest[:2], "{}.tgz".format(digest))
+
+    # ----------------------------------------------------------------------
+    def Contains(self, integrity):
+        return os.path.isfile(self.GetFilename(integrity))
+
+    # ----------------------------------------------------------------------
+    def Prefetch(
+        self,
+        records,
+        registry=None,
+        download_jobs=16,
+        verify_jobs=None,
+        on_progress=None,                   # def Func(record, exception or None)
+    ):
+        """\
+        Downloads and verifies the tarballs for the provided records that aren't already in
+        the store; returns a list of (record, exception) for tarballs that couldn't be added.
+
+        Downloads run concurrently on a thread pool; integrity verification runs on a
+        process pool so that hashing scales across cores.
+        """
+
+        pending = {}
+
+        for record in records:
+            if not record.resolved or not record.integrity:
+                continue
+
+            if record.integrity in pending or self.Contains(record.integrity):
+                continue
+
+            pending[record.integrity] = record
+
+        if not pending:
+            return []
+
+        errors = []
+        errors_lock = threading.Lock()
+
+        with ProcessPoolExecutor(max_workers=verify_jobs) as verify_executor:
+            # ----------------------------------------------------------------------
+            def Download(record):
+                try:
+                    self._Download(
+                        record,
+                        registry,
+                        lambda filename, algorithm: verify_executor.submit(HashFile, filename, algorithm).result(),
+                    )
+
+                    exception = None
+
+                except Exception as ex:
+                    exception = ex
+
+                    with errors_lock:
+                        errors.append((record, exception))
+
+                if on_progress:
+                    on_progress(record, exception)
+
+            # ----------------------------------------------------------------------
+
+            with ThreadPoolExecutor(max_workers=download_jobs) as download_executor:
+                list(download_executor.map(Download, pending.values()))
+
+        return errors
+
+    # ----------------------------------------------------------------------
+    def Fetch(
+        self,
+        record,
+        registry=None,
+    ):
+        """Returns the filename of the record's tarball, downloading it first if necessary"""
+
+        filename = self.GetFilename(record.integrity)
+        if os.path.isfile(filename):
+            return filename
+
+        self._Download(record, registry, HashFile)
+
+        return filename
+
+    # ----------------------------------------------------------------------
+    def Verify(
+        self,
+        jobs=None,
+    ):
+        """Verifies every tarball in the store; returns a list of corrupt filenames"""
+
+        filenames = []
+        algorithms = []
+        expected_digests = []
+
+        for algorithm in SUPPORTED_ALGORITHMS:
+            algorithm_dir = os.path.join(self.Root, algorithm)
+            if not os.path.isdir(algorithm_dir):
+                continue
+
+            for root, _, items in os.walk(algorithm_dir):
+                for item in items:
+                    if not item.endswith(".tgz"):
+                        continue
+
+                    filenames.append(os.path.join(root, item))
+                    algorithms.append(algorithm)
+                    expected_digests.append(base64.b64encode(bytes.fromhex(item[:-len(".tgz")])).decode("ascii"))
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            actual_digests = list(executor.map(HashFile, filenames, algorithms, chunksize=16))
+
+        return [
+            filename
+            for filename, expected, actual in zip(filenames, expected_digests, actual_digests)
+            if expected != actual
+        ]
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _Download(self, record, registry, hash_func):
+        temp_dir = os.path.join(self.Root, "tmp")
+        if not os.path.isdir(temp_dir):
+            try:
+                os.makedirs(temp_dir)
+            except OSError:
+                # Another thread or process created the directory
+                if not os.path.isdir(temp_dir):
+                    raise
+
+        temp_filename = os.path.join(temp_dir, "{}.tgz".format(uuid.uuid4().hex))
+
+        try:
+            if registry is None:
+                registry = self.NpmConfig.GetReplacementRegistry(record.resolved)
+
+            response = self.NpmConfig.Open(GetDownloadUrl(record.resolved, registry))
+            try:
+                with open(temp_filename, "wb") as f:
+                    shutil.copyfileobj(response, f, 1024 * 1024)
+            finally:
+                response.close()
+
+            algorithm, expected = ParseIntegrity(record.integrity)
+
+            actual = hash_func(temp_filename, algorithm)
+            if actual != expected:
+                raise IntegrityException(
+                    "Integrity mismatch for '{}' ('{}' != '{}')".format(
+                        record.resolved,
+                        actual,
+                        expected,
+                    ),
+                )
+
+            self._Add(temp_filename, record.integrity)
+            temp_filename = None
+
+        finally:
+            if temp_filename is not None and os.path.isfile(temp_filename):
+                os.remove(temp_filename)
+
+    # ----------------------------------------------------------------------
+    def _Add(self, temp_filename, integrity):
+        dest_filename = self.GetFilename(integrity)
+
+        dest_dir = os.path.dirname(dest_filename)
+        if not os.path.isdir(dest_dir):
+            try:
+                os.makedirs(dest_dir)
+            except OSError:
+                # Another thread or process created the directory
+                if not os.path.isdir(dest_dir):
+                    raise
+
+        os.replace(temp_filename, dest_filename)
+
+
+# ----------------------------------------------------------------------
+_registry_regex                             = re.compile(r"^https?://[^/]+/")
+
+def GetDownloadUrl(resolved, registry=None):
+    """\
+    Returns the url used to download `resolved`, replacing the registry portion of the url
+    when `registry` is provided. `registry` may be a url or a local directory that mirrors
+    the registry's layout.
+    """
+
+    if registry is None:
+        return resolved
+
+    if os.path.isdir(registry):
+        registry = pathlib.Path(os.path.realpath(registry)).as_uri()
+
+    if not registry.endswith("/"):
+        registry += "/"
+
+    return _registry_regex.sub(lambda match: registry, resolved, count=1)
@@ -0,0 +1,395 @@
+# ----------------------------------------------------------------------
+# |
+# |  DedupePlanner_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 00:16:40
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit test for DedupePlanner.py"""
+
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = os.path.realpath(__file__)
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+sys.path.insert(0, os.path.join(_script_dir, "..", ".."))
+
+from Impl.DedupePlanner import CreatePlan, WriteLockfile
+from Impl.LockfileReader import ReadLockfile
+from Impl.Semver import Satisfies
+
+# ----------------------------------------------------------------------
+class CreatePlanSuite(unittest.TestCase):
+    # ----------------------------------------------------------------------
+    def setUp(self):
+        self._temp_dir = tempfile.mkdtemp()
+
+    # ----------------------------------------------------------------------
+    def tearDown(self):
+        shutil.rmtree(self._temp_dir)
+
+    # ----------------------------------------------------------------------
+    def test_RemoveRedundantCopy(self):
+        lockfile, plan = self._Plan(
+            {
+                "a": "^1.0.0",
+                "b": "^1.0.0",
+            },
+            {
+                "node_modules/a": ("1.2.0", None),
+                "node_modules/b": ("1.0.0", {"a": "^1.1.0"}),
+                "node_modules/b/node_modules/a": ("1.1.0", None),
+            },
+        )
+
+        self.assertEqual(
+            [(removed.path, replacement.path) for removed, replacement in plan.removals],
+            [("node_modules/b/node_modules/a", "node_modules/a")],
+        )
+        self.assertEqual(plan.hoists, [])
+        self.assertEqual(plan.operations, [("remove", "node_modules/b/node_modules/a")])
+        self.assertEqual(plan.duplicates, [])
+
+        self._VerifyPlan(lockfile, plan)
+
+    # ----------------------------------------------------------------------
+    def test_KeepRequiredCopy(self):
+        lockfile, plan = self._Plan(
+            {
+                "a": "^1.0.0",
+                "b": "^1.0.0",
+            },
+            {
+                "node_modules/a": ("1.2.0", None),
+                "node_modules/b": ("1.0.0", {"a": "^2.0.0"}),
+                "node_modules/b/node_modules/a": ("2.0.0", None),
+            },
+        )
+
+        self.assertEqual(plan.removals, [])
+        self.assertEqual(plan.hoists, [])
+        self.assertEqual(plan.operations, [])
+
+        self.assertEqual(len(plan.duplicates), 1)
+        self.assertEqual(plan.duplicates[0].name, "a")
+        self.assertEqual(plan.duplicates[0].versions, ["1.2.0", "2.0.0"])
+        self.assertEqual(plan.duplicates[0].num_instances, 2)
+        self.assertIsNone(plan.duplicates[0].hoist_version)
+
+        self._VerifyPlan(lockfile, plan)
+
+    # ----------------------------------------------------------------------
+    def test_Hoist(self):
+        lockfile, plan = self._Plan(
+            {
+                "a": "^1.0.0",
+                "b": "^1.0.0",
+                "c": "^1.0.0",
+            },
+            {
+                "node_modules/a": ("1.0.0", None),
+                "node_modules/b": ("1.0.0", {"a": "^1.2.0"}),
+                "node_modules/b/node_modules/a": ("1.5.0", {"d": "^1.0.0"}),
+                "node_modules/c": ("1.0.0", {"a": "~1.5.0"}),
+                "node_modules/c/node_modules/a": ("1.5.0", None),
+                "node_modules/d": ("1.0.0", None),
+            },
+        )
+
+        self.assertEqual(
+            [(record.path, original_path) for record, original_path in plan.hoists],
+            [("node_modules/a", "node_modules/b/node_modules/a")],
+        )
+
+        self.assertEqual(
+            sorted(record.path for record in self._GetRemaining(lockfile, plan)),
+            [
+                "node_modules/a",
+                "node_modules/b",
+                "node_modules/c",
+                "node_modules/d",
+            ],
+        )
+
+        self.assertEqual(plan.duplicates, [])
+
+        self._VerifyPlan(lockfile, plan)
+
+    # ----------------------------------------------------------------------
+    def test_HoistBlockedByDependency(self):
+        # Moving 'b/node_modules/a' to the top level would resolve its dependency on 'd' to the
+        # top-level 'd@2.0.0', which doesn't satisfy '^1.0.0'.
+        lockfile, plan = self._Plan(
+            {
+                "a": "^1.0.0",
+                "b": "^1.0.0",
+                "d": "^2.0.0",
+            },
+            {
+                "node_modules/a": ("1.0.0", None),
+                "node_modules/b": ("1.0.0", {"a": "^1.2.0"}),
+                "node_modules/b/node_modules/a": ("1.5.0", {"d": "^1.0.0"}),
+                "node_modules/b/node_modules/d": ("1.0.0", None),
+                "node_modules/d": ("2.0.0", None),
+            },
+        )
+
+        self.assertEqual(plan.hoists, [])
+        self.assertEqual(plan.removals, [])
+
+        self._VerifyPlan(lockfile, plan)
+
+    # ----------------------------------------------------------------------
+    def test_ClearFlags(self):
+        lockfile, plan = self._Plan(
+            {
+                "a": "^1.0.0",
+                "b": "^1.0.0",
+            },
+            {
+                "node_modules/a": ("1.2.0", None, True),
+                "node_modules/b": ("1.0.0", {"a": "^1.1.0"}),
+                "node_modules/b/node_modules/a": ("1.1.0", None),
+            },
+        )
+
+        self.assertEqual([record.path for record in plan.updated_records], ["node_modules/a"])
+        self.assertFalse(plan.updated_records[0].dev)
+
+        self._VerifyPlan(lockfile, plan)
+
+    # ----------------------------------------------------------------------
+    def test_Random(self):
+        # Every removal and hoist must leave each declared range satisfied
+        randomizer = random.Random(1234)
+
+        num_removals = 0
+        num_hoists = 0
+
+        for iteration in range(300):
+            root_requires, packages = _CreateRandomTree(randomizer)
+
+            lockfile, plan = self._Plan(root_requires, packages)
+
+            num_removals += len(plan.removals)
+            num_hoists += len(plan.hoists)
+
+            try:
+                self._VerifyPlan(lockfile, plan)
+            except AssertionError:
+                sys.stderr.write("\nIteration {}:\n{}\n{}\n".format(iteration, root_requires, json.dumps(packages, indent=2)))
+                raise
+
+        # Ensure that the trees exercise both kinds of changes
+        self.assertGreater(num_removals, 0)
+        self.assertGreater(num_hoists, 0)
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _Plan(self, root_requires, packages):
+        content = {
+            "name": "project",
+            "version": "1.0.0",
+            "lockfileVersion": 3,
+            "packages": {
+                "": {
+                    "name": "project",
+                    "version": "1.0.0",
+                    "dependencies": root_requires,
+                },
+            },
+        }
+
+        for path, values in packages.items():
+            version, requires = values[:2]
+            name = path[path.rfind("node_modules/") + len("node_modules/"):]
+
+            entry = {
+                "version": version,
+                "resolved": "https://registry.npmjs.org/{name}/-/{name}-{version}.tgz".format(name=name, version=version),
+                "integrity": "sha512-{}{}".format(name, version),
+            }
+
+            if requires:
+                entry["dependencies"] = requires
+
+            if len(values) > 2 and values[2]:
+                entry["dev"] = True
+
+            content["packages"][path] = entry
+
+        self._root_requires = root_requires
+        self._filename = os.path.join(self._temp_dir, "package-lock.json")
+
+        with open(self._filename, "w") as f:
+            json.dump(content, f)
+
+        lockfile = ReadLockfile(self._filename)
+
+        return lockfile, CreatePlan(lockfile, root_requires)
+
+    # ----------------------------------------------------------------------
+    def _VerifyPlan(self, lockfile, plan):
+        remaining = self._GetRemaining(lockfile, plan)
+        records_by_path = {record.path: record for record in remaining}
+
+        self.assertEqual(len(records_by_path), len(remaining))
+
+        # ----------------------------------------------------------------------
+        def Resolve(name, from_path):
+            while True:
+                record = records_by_path.get(
+                    "{}node_modules/{}".format("{}/".format(from_path) if from_path else "", name),
+                    None,
+                )
+
+                if record is not None or not from_path:
+                    return record
+
+                index = from_path.rfind("/node_modules/")
+                from_path = from_path[:index] if index != -1 else ""
+
+        # ----------------------------------------------------------------------
+
+        dependents = [("", self._root_requires)] + [(record.path, record.requires or {}) for record in remaining]
+
+        for path, requires in dependents:
+            for name, range_value in requires.items():
+                dependency = Resolve(name, path)
+
+                self.assertIsNotNone(dependency, "'{}' from '{}'".format(name, path))
+                self.assertTrue(
+                    Satisfies(dependency.version, range_value),
+                    "'{}' from '{}' resolves to '{}' ({} does not satisfy '{}')".format(
+                        name,
+                        path,
+                        dependency.path,
+                        dependency.version,
+                        range_value,
+                    ),
+                )
+
+        # Every nested package must be within an existing package
+        for record in remaining:
+            index = record.path.rfind("/node_modules/")
+            if index != -1:
+                self.assertIn(record.path[:index], records_by_path)
+
+        # The lockfile written with the plan must contain the remaining packages
+        output_filename = os.path.join(self._temp_dir, "package-lock.output.json")
+        WriteLockfile(self._filename, output_filename, plan)
+
+        self.assertEqual(
+            sorted((record.path, record.version) for record in ReadLockfile(output_filename).packages),
+            sorted((record.path, record.version) for record in remaining),
+        )
+
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def _GetRemaining(lockfile, plan):
+        removed = set(id(record) for record, _ in plan.removals)
+        return [record for record in lockfile.packages if id(record) not in removed]
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+_NAMES                                      = ["a", "b", "c", "d", "e"]
+_VERSIONS                                   = ["1.0.0", "1.1.0", "1.2.0", "1.2.5", "2.0.0"]
+
+def _CreateRandomTree(randomizer):
+    """Returns (root requires, packages) where every declared range is satisfied"""
+
+    packages = {}
+
+    # ----------------------------------------------------------------------
+    def Populate(path_prefix, excluded_names, depth):
+        names = [name for name in _NAMES if name not in excluded_names]
+
+        if path_prefix:
+            names = randomizer.sample(names, randomizer.randint(0, min(2, len(names))))
+
+        for name in names:
+            path = "{}node_modules/{}".format(path_prefix, name)
+            packages[path] = randomizer.choice(_VERSIONS)
+
+            if depth < 2 and randomizer.random() < 0.5:
+                Populate(path + "/", excluded_names | set([name]), depth + 1)
+
+    # ----------------------------------------------------------------------
+    def Resolve(name, from_path):
+        while True:
+            path = "{}node_modules/{}".format("{}/".format(from_path) if from_path else "", name)
+            if path in packages or not from_path:
+                return path if path in packages else None
+
+            index = from_path.rfind("/node_modules/")
+            from_path = from_path[:index] if index != -1 else ""
+
+    # ----------------------------------------------------------------------
+    def CreateRange(version):
+        return randomizer.choice(
+            [
+                version,
+                "^{}".format(version),
+                "~{}".format(version),
+                ">={}".format(version),
+                "^{}".format(version.split(".")[0] + ".0.0"),
+                "*",
+            ],
+        )
+
+    # ----------------------------------------------------------------------
+
+    Populate("", set(), 0)
+
+    root_requires = {
+        name: CreateRange(packages["node_modules/{}".format(name)])
+        for name in _NAMES
+    }
+
+    results = {}
+
+    for path, version in packages.items():
+        name = path[path.rfind("node_modules/") + len("node_modules/"):]
+
+        requires = {}
+
+        for dependency_name in randomizer.sample(_NAMES, randomizer.randint(0, 3)):
+            if dependency_name == name:
+                continue
+
+            dependency_path = Resolve(dependency_name, path)
+            if dependency_path is not None:
+                requires[dependency_name] = CreateRange(packages[dependency_path])
+
+        results[path] = (version, requires or None)
+
+    return root_requires, results
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(unittest.main(verbosity=2))
+    except KeyboardInterrupt:
+        pass
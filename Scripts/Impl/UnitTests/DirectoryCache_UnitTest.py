@@ -0,0 +1,276 @@
+# ----------------------------------------------------------------------
+# |
+# |  DirectoryCache_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 01:02:36
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit test for DirectoryCache.py"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = os.path.realpath(__file__)
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+sys.path.insert(0, os.path.join(_script_dir, "..", ".."))
+
+from Impl.DirectoryCache import DirectoryCache
+
+# ----------------------------------------------------------------------
+class CreateKeySuite(unittest.TestCase):
+    # ----------------------------------------------------------------------
+    def setUp(self):
+        self._temp_dir = tempfile.mkdtemp()
+
+    # ----------------------------------------------------------------------
+    def tearDown(self):
+        shutil.rmtree(self._temp_dir)
+
+    # ----------------------------------------------------------------------
+    def test_Deterministic(self):
+        a = self._WriteFile("a.json", "content")
+
+        self.assertEqual(DirectoryCache.CreateKey([a], "extra"), DirectoryCache.CreateKey([a], "extra"))
+        self.assertNotEqual(DirectoryCache.CreateKey([a], "extra"), DirectoryCache.CreateKey([a], "other"))
+        self.assertNotEqual(DirectoryCache.CreateKey([a]), DirectoryCache.CreateKey([a], "extra"))
+
+    # ----------------------------------------------------------------------
+    def test_Content(self):
+        a = self._WriteFile("a.json", "content")
+        key = DirectoryCache.CreateKey([a])
+
+        self._WriteFile("a.json", "changed")
+        self.assertNotEqual(DirectoryCache.CreateKey([a]), key)
+
+    # ----------------------------------------------------------------------
+    def test_Names(self):
+        a = self._WriteFile("a.json", "content")
+        b = self._WriteFile("b.json", "content")
+
+        self.assertNotEqual(DirectoryCache.CreateKey([a]), DirectoryCache.CreateKey([b]))
+
+        # Names are relative to the root directory when it is provided
+        nested_a = self._WriteFile(os.path.join("nested", "a.json"), "content")
+
+        self.assertEqual(DirectoryCache.CreateKey([a]), DirectoryCache.CreateKey([nested_a]))
+        self.assertNotEqual(
+            DirectoryCache.CreateKey([a], root_dir=self._temp_dir),
+            DirectoryCache.CreateKey([nested_a], root_dir=self._temp_dir),
+        )
+
+    # ----------------------------------------------------------------------
+    def test_Framing(self):
+        # Content moving from one file to another changes the key
+        a = self._WriteFile("a.json", "ab")
+        b = self._WriteFile("b.json", "c")
+
+        key = DirectoryCache.CreateKey([a, b])
+
+        self._WriteFile("a.json", "a")
+        self._WriteFile("b.json", "bc")
+
+        self.assertNotEqual(DirectoryCache.CreateKey([a, b]), key)
+
+        # Values aren't concatenated
+        self.assertNotEqual(DirectoryCache.CreateKey([], "ab", "c"), DirectoryCache.CreateKey([], "a", "bc"))
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _WriteFile(self, relative_path, content):
+        filename = os.path.join(self._temp_dir, relative_path)
+
+        if not os.path.isdir(os.path.dirname(filename)):
+            os.makedirs(os.path.dirname(filename))
+
+        with open(filename, "w") as f:
+            f.write(content)
+
+        return filename
+
+
+# ----------------------------------------------------------------------
+class DirectoryCacheSuite(unittest.TestCase):
+    # ----------------------------------------------------------------------
+    def setUp(self):
+        self._temp_dir = tempfile.mkdtemp()
+        self._cache_dir = os.path.join(self._temp_dir, "cache")
+
+    # ----------------------------------------------------------------------
+    def tearDown(self):
+        shutil.rmtree(self._temp_dir)
+
+    # ----------------------------------------------------------------------
+    def test_StoreAndRestore(self):
+        cache = DirectoryCache(self._cache_dir)
+
+        source_dir = self._CreateDir("source", 10)
+
+        self.assertFalse(cache.Contains("key"))
+        self.assertFalse(cache.Restore("key", os.path.join(self._temp_dir, "missing")))
+        self.assertFalse(os.path.exists(os.path.join(self._temp_dir, "missing")))
+
+        cache.Store("key", source_dir)
+        self.assertTrue(cache.Contains("key"))
+        self.assertEqual(cache.GetSize(), 10)
+
+        # Storing the key again isn't an error
+        cache.Store("key", source_dir)
+
+        dest_dir = os.path.join(self._temp_dir, "dest")
+
+        self.assertTrue(cache.Restore("key", dest_dir))
+        self.assertEqual(self._ReadDir(dest_dir), self._ReadDir(source_dir))
+
+        # The restore mark has been removed
+        with open(os.path.join(self._cache_dir, DirectoryCache.INDEX_FILENAME)) as f:
+            self.assertNotIn("in_use", json.load(f)["key"])
+
+        cache.Remove("key")
+        self.assertFalse(cache.Contains("key"))
+        self.assertEqual(cache.GetSize(), 0)
+
+    # ----------------------------------------------------------------------
+    def test_Links(self):
+        cache = DirectoryCache(self._cache_dir)
+        cache.Store("key", self._CreateDir("source", 10))
+
+        linked_dir = os.path.join(self._temp_dir, "linked")
+        copied_dir = os.path.join(self._temp_dir, "copied")
+
+        self.assertTrue(cache.Restore("key", linked_dir))
+        self.assertTrue(cache.Restore("key", copied_dir, use_links=False))
+
+        entry_filename = os.path.join(self._cache_dir, "entries", "key", "nested", "file.txt")
+
+        self.assertFalse(os.path.samefile(entry_filename, os.path.join(copied_dir, "nested", "file.txt")))
+
+        # Hard links may not be supported by the file system
+        if os.stat(os.path.join(linked_dir, "nested", "file.txt")).st_nlink > 1:
+            self.assertTrue(os.path.samefile(entry_filename, os.path.join(linked_dir, "nested", "file.txt")))
+
+    # ----------------------------------------------------------------------
+    def test_Eviction(self):
+        cache = DirectoryCache(self._cache_dir, max_size=25)
+
+        cache.Store("a", self._CreateDir("a", 10))
+        time.sleep(0.01)
+        cache.Store("b", self._CreateDir("b", 10))
+        time.sleep(0.01)
+
+        # Restoring 'a' makes 'b' the least recently used entry
+        self.assertTrue(cache.Restore("a", os.path.join(self._temp_dir, "dest")))
+        time.sleep(0.01)
+
+        cache.Store("c", self._CreateDir("c", 10))
+
+        self.assertTrue(cache.Contains("a"))
+        self.assertFalse(cache.Contains("b"))
+        self.assertTrue(cache.Contains("c"))
+        self.assertEqual(cache.GetSize(), 20)
+
+        # The entry being stored is never evicted, even if it exceeds the limit on its own
+        cache.Store("d", self._CreateDir("d", 30))
+
+        self.assertFalse(cache.Contains("a"))
+        self.assertFalse(cache.Contains("c"))
+        self.assertTrue(cache.Contains("d"))
+
+        cache.MaxSize = 0
+        self.assertEqual(cache.Evict(), ["d"])
+        self.assertEqual(cache.GetSize(), 0)
+
+    # ----------------------------------------------------------------------
+    def test_InUseEntriesArentEvicted(self):
+        cache = DirectoryCache(self._cache_dir)
+
+        cache.Store("a", self._CreateDir("a", 10))
+        cache.Store("b", self._CreateDir("b", 10))
+
+        index_filename = os.path.join(self._cache_dir, DirectoryCache.INDEX_FILENAME)
+
+        with open(index_filename) as f:
+            index = json.load(f)
+
+        # 'a' is being restored by another process and 'b' was being restored by a process
+        # that was killed.
+        index["a"]["in_use"] = {"1234.1": time.time()}
+        index["b"]["in_use"] = {"5678.1": time.time() - DirectoryCache.IN_USE_TIMEOUT - 1}
+
+        with open(index_filename, "w") as f:
+            json.dump(index, f)
+
+        cache.MaxSize = 0
+
+        self.assertEqual(cache.Evict(), ["b"])
+        self.assertTrue(cache.Contains("a"))
+
+    # ----------------------------------------------------------------------
+    def test_CorruptIndex(self):
+        cache = DirectoryCache(self._cache_dir)
+
+        cache.Store("a", self._CreateDir("a", 10))
+
+        with open(os.path.join(self._cache_dir, DirectoryCache.INDEX_FILENAME), "w") as f:
+            f.write("{")
+
+        # The index is rebuilt from the entries
+        self.assertEqual(cache.GetSize(), 10)
+        self.assertTrue(cache.Restore("a", os.path.join(self._temp_dir, "dest")))
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _CreateDir(self, name, size):
+        """Creates a directory whose files contain `size` bytes"""
+
+        directory = os.path.join(self._temp_dir, name)
+        os.makedirs(os.path.join(directory, "nested"))
+
+        with open(os.path.join(directory, "root.txt"), "w") as f:
+            f.write("r" * (size // 2))
+
+        with open(os.path.join(directory, "nested", "file.txt"), "w") as f:
+            f.write("n" * (size - size // 2))
+
+        return directory
+
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def _ReadDir(directory):
+        results = {}
+
+        for root, _, filenames in os.walk(directory):
+            for filename in filenames:
+                fullpath = os.path.join(root, filename)
+
+                with open(fullpath) as f:
+                    results[os.path.relpath(fullpath, directory)] = f.read()
+
+        return results
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(unittest.main(verbosity=2))
+    except KeyboardInterrupt:
+        pass
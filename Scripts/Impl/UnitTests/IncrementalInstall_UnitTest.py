@@ -0,0 +1,297 @@
+# ----------------------------------------------------------------------
+# |
+# |  IncrementalInstall_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 00:41:03
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit test for IncrementalInstall.py"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import unittest
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = os.path.realpath(__file__)
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+sys.path.insert(0, os.path.join(_script_dir, "..", ".."))
+
+from Impl import IncrementalInstall
+from Impl.LockfileReader import PackageRecord
+from Impl.NpmConfig import NpmConfig
+from Impl.TarballStore import TarballStore
+
+# ----------------------------------------------------------------------
+class IncrementalInstallSuite(unittest.TestCase):
+    # ----------------------------------------------------------------------
+    def setUp(self):
+        self._temp_dir = tempfile.mkdtemp()
+
+        self._working_dir = os.path.join(self._temp_dir, "project")
+        self._node_modules_dir = os.path.join(self._working_dir, "node_modules")
+
+        os.makedirs(self._node_modules_dir)
+
+        self._tarball_store = TarballStore(os.path.join(self._temp_dir, "store"), NpmConfig())
+
+    # ----------------------------------------------------------------------
+    def tearDown(self):
+        shutil.rmtree(self._temp_dir)
+
+    # ----------------------------------------------------------------------
+    def test_MissingState(self):
+        self.assertEqual(
+            IncrementalInstall.CalculateDelta(self._node_modules_dir, [], "toolchain"),
+            "the installed state was not found",
+        )
+
+    # ----------------------------------------------------------------------
+    def test_CorruptState(self):
+        with open(os.path.join(self._node_modules_dir, IncrementalInstall.STATE_FILENAME), "w") as f:
+            f.write("{")
+
+        self.assertEqual(
+            IncrementalInstall.CalculateDelta(self._node_modules_dir, [], "toolchain"),
+            "the installed state is corrupt",
+        )
+
+    # ----------------------------------------------------------------------
+    def test_ToolchainChanged(self):
+        IncrementalInstall.WriteState(self._node_modules_dir, [], "toolchain")
+
+        self.assertEqual(
+            IncrementalInstall.CalculateDelta(self._node_modules_dir, [], "other toolchain"),
+            "the Node toolchain has changed",
+        )
+
+    # ----------------------------------------------------------------------
+    def test_Delta(self):
+        a = self._CreateRecord("node_modules/a", "1.0.0")
+        b = self._CreateRecord("node_modules/b", "1.0.0")
+        c = self._CreateRecord("node_modules/c", "1.0.0")
+
+        IncrementalInstall.WriteState(self._node_modules_dir, [a, b, c], "toolchain")
+
+        b2 = self._CreateRecord("node_modules/b", "2.0.0")
+        d = self._CreateRecord("node_modules/a/node_modules/d", "1.0.0")
+
+        delta = IncrementalInstall.CalculateDelta(self._node_modules_dir, [a, b2, d], "toolchain")
+
+        self.assertFalse(delta.IsEmpty)
+        self.assertEqual(delta.added, [d])
+        self.assertEqual(delta.removed, ["node_modules/c"])
+        self.assertEqual(delta.changed, [b2])
+        self.assertEqual(delta.reused, [a])
+
+        # An integrity change with the same version is a change
+        a2 = self._CreateRecord("node_modules/a", "1.0.0", content="different")
+
+        delta = IncrementalInstall.CalculateDelta(self._node_modules_dir, [a2, b, c], "toolchain")
+
+        self.assertEqual(delta.changed, [a2])
+        self.assertEqual(delta.reused, [b, c])
+
+        delta = IncrementalInstall.CalculateDelta(self._node_modules_dir, [a, b, c], "toolchain")
+        self.assertTrue(delta.IsEmpty)
+
+    # ----------------------------------------------------------------------
+    def test_DeltaWithoutIntegrity(self):
+        IncrementalInstall.WriteState(self._node_modules_dir, [], "toolchain")
+
+        record = self._CreateRecord("node_modules/a", "1.0.0")
+        record.integrity = None
+
+        self.assertEqual(
+            IncrementalInstall.CalculateDelta(self._node_modules_dir, [record], "toolchain"),
+            "'node_modules/a' does not have a 'resolved' url or 'integrity' value",
+        )
+
+    # ----------------------------------------------------------------------
+    def test_ApplyDelta(self):
+        a = self._CreateRecord("node_modules/a", "1.0.0")
+        b = self._CreateRecord("node_modules/b", "1.0.0", bin_name="b-cli")
+        c = self._CreateRecord("node_modules/c", "1.0.0")
+        d = self._CreateRecord("node_modules/a/node_modules/d", "1.0.0")
+
+        self._Install([a, b, c, d])
+
+        # Simulate the bin link created by 'npm rebuild'
+        bin_dir = os.path.join(self._node_modules_dir, ".bin")
+        os.makedirs(bin_dir)
+
+        if os.name != "nt":
+            os.symlink(os.path.join("..", "b", "cli.js"), os.path.join(bin_dir, "b-cli"))
+
+        # Update 'a' (preserving its nested dependencies), remove 'b', and add 'e'
+        a2 = self._CreateRecord("node_modules/a", "2.0.0")
+        e = self._CreateRecord("node_modules/e", "1.0.0")
+
+        delta = IncrementalInstall.CalculateDelta(self._node_modules_dir, [a2, c, d, e], "toolchain")
+
+        self.assertEqual(delta.added, [e])
+        self.assertEqual(delta.removed, ["node_modules/b"])
+        self.assertEqual(delta.changed, [a2])
+        self.assertEqual(delta.reused, [c, d])
+
+        self.assertEqual(
+            IncrementalInstall.ApplyDelta(self._working_dir, delta, self._tarball_store),
+            [],
+        )
+
+        self._VerifyInstalled([a2, c, d, e])
+        self.assertFalse(os.path.exists(os.path.join(self._node_modules_dir, "b")))
+        self.assertEqual(os.listdir(bin_dir), [])
+
+    # ----------------------------------------------------------------------
+    def test_ResumeDelta(self):
+        a = self._CreateRecord("node_modules/a", "1.0.0")
+        b = self._CreateRecord("node_modules/b", "1.0.0", bin_name="b-cli")
+        c = self._CreateRecord("node_modules/c", "1.0.0")
+
+        self.assertIsNone(IncrementalInstall.CalculateResumeDelta(self._node_modules_dir, [a, b, c], "toolchain"))
+
+        # Install 'a' and 'b', and simulate a process that was killed while writing a line
+        checkpoint = IncrementalInstall.Checkpoint(self._node_modules_dir, "toolchain")
+        try:
+            self.assertEqual(
+                IncrementalInstall.ApplyDelta(
+                    self._working_dir,
+                    IncrementalInstall.Delta([a, b], [], [], []),
+                    self._tarball_store,
+                    checkpoint=checkpoint,
+                ),
+                ["b"],
+            )
+        finally:
+            checkpoint.Close()
+
+        with open(os.path.join(self._node_modules_dir, IncrementalInstall.CHECKPOINT_FILENAME), "a") as f:
+            f.write('["node_modules/c", "1.0')
+
+        # The checkpoint doesn't apply to a different toolchain
+        self.assertIsNone(IncrementalInstall.CalculateResumeDelta(self._node_modules_dir, [a, b, c], "other toolchain"))
+
+        delta, rebuild_names = IncrementalInstall.CalculateResumeDelta(self._node_modules_dir, [a, b, c], "toolchain")
+
+        self.assertEqual(delta.added, [c])
+        self.assertEqual(delta.changed, [])
+        self.assertEqual(delta.reused, [a, b])
+        self.assertEqual(rebuild_names, ["b"])
+
+        # Content that doesn't match the checkpoint is installed again
+        with open(os.path.join(self._node_modules_dir, "a", "package.json"), "w") as f:
+            json.dump({"name": "a", "version": "0.0.0"}, f)
+
+        delta, _ = IncrementalInstall.CalculateResumeDelta(self._node_modules_dir, [a, b, c], "toolchain")
+
+        self.assertEqual(delta.changed, [a])
+        self.assertEqual(delta.reused, [b])
+
+        # The checkpoint can be appended to after the incomplete line
+        checkpoint = IncrementalInstall.Checkpoint(self._node_modules_dir, "toolchain")
+        try:
+            IncrementalInstall.ApplyDelta(self._working_dir, delta, self._tarball_store, checkpoint=checkpoint)
+        finally:
+            checkpoint.Close()
+
+        delta, _ = IncrementalInstall.CalculateResumeDelta(self._node_modules_dir, [a, b, c], "toolchain")
+
+        self.assertTrue(delta.IsEmpty)
+        self._VerifyInstalled([a, b, c])
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _CreateRecord(self, path, version, content="", bin_name=None):
+        """Creates a record and adds its tarball to the store"""
+
+        name = path[path.rfind("node_modules/") + len("node_modules/"):]
+
+        package_json = {
+            "name": name,
+            "version": version,
+        }
+
+        if bin_name:
+            package_json["bin"] = {bin_name: "cli.js"}
+
+        buffer = io.BytesIO()
+
+        with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+            for filename, file_content in [
+                ("package/package.json", json.dumps(package_json)),
+                ("package/index.js", content),
+                ("package/cli.js", ""),
+            ]:
+                file_content = file_content.encode("utf-8")
+
+                info = tarfile.TarInfo(filename)
+                info.size = len(file_content)
+
+                tar.addfile(info, io.BytesIO(file_content))
+
+        tarball = buffer.getvalue()
+
+        integrity = "sha512-{}".format(base64.b64encode(hashlib.sha512(tarball).digest()).decode("ascii"))
+
+        filename = self._tarball_store.GetFilename(integrity)
+
+        if not os.path.isdir(os.path.dirname(filename)):
+            os.makedirs(os.path.dirname(filename))
+
+        with open(filename, "wb") as f:
+            f.write(tarball)
+
+        return PackageRecord(
+            name,
+            version,
+            "https://registry.npmjs.org/{name}/-/{name}-{version}.tgz".format(name=name, version=version),
+            integrity,
+            False,
+            False,
+            path,
+            None,
+        )
+
+    # ----------------------------------------------------------------------
+    def _Install(self, records):
+        IncrementalInstall.ApplyDelta(
+            self._working_dir,
+            IncrementalInstall.Delta(records, [], [], []),
+            self._tarball_store,
+        )
+
+        IncrementalInstall.WriteState(self._node_modules_dir, records, "toolchain")
+
+    # ----------------------------------------------------------------------
+    def _VerifyInstalled(self, records):
+        for record in records:
+            with open(os.path.join(self._working_dir, *(record.path.split("/") + ["package.json"]))) as f:
+                self.assertEqual(json.load(f)["version"], record.version, record.path)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(unittest.main(verbosity=2))
+    except KeyboardInterrupt:
+        pass
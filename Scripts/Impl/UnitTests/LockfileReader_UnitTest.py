@@ -0,0 +1,310 @@
+# ----------------------------------------------------------------------
+# |
+# |  LockfileReader_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 23:58:14
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit test for LockfileReader.py"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = os.path.realpath(__file__)
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+sys.path.insert(0, os.path.join(_script_dir, "..", ".."))
+
+from Impl.LockfileReader import ReadLockfile
+
+# ----------------------------------------------------------------------
+_V1_CONTENT                                 = {
+    "name": "project",
+    "version": "1.0.0",
+    "lockfileVersion": 1,
+    "requires": True,
+    "dependencies": {
+        "a": {
+            "version": "1.0.0",
+            "resolved": "https://registry.npmjs.org/a/-/a-1.0.0.tgz",
+            "integrity": "sha512-AAAA",
+            "requires": {
+                "b": "^2.0.0",
+            },
+            "dependencies": {
+                "b": {
+                    "version": "2.1.0",
+                    "resolved": "https://registry.npmjs.org/b/-/b-2.1.0.tgz",
+                    "integrity": "sha512-BBBB",
+                },
+            },
+        },
+        "b": {
+            "version": "1.0.0",
+            "resolved": "https://registry.npmjs.org/b/-/b-1.0.0.tgz",
+            "integrity": "sha512-CCCC",
+            "dev": True,
+        },
+    },
+}
+
+_V3_PACKAGES                                = {
+    "": {
+        "name": "project",
+        "version": "1.0.0",
+        "dependencies": {
+            "a": "^1.0.0",
+        },
+        "devDependencies": {
+            "b": "^1.0.0",
+        },
+    },
+    "node_modules/a": {
+        "version": "1.0.0",
+        "resolved": "https://registry.npmjs.org/a/-/a-1.0.0.tgz",
+        "integrity": "sha512-AAAA",
+        "dependencies": {
+            "b": "^2.0.0",
+        },
+        "optionalDependencies": {
+            "c": "^1.0.0",
+        },
+    },
+    "node_modules/a/node_modules/b": {
+        "version": "2.1.0",
+        "resolved": "https://registry.npmjs.org/b/-/b-2.1.0.tgz",
+        "integrity": "sha512-BBBB",
+    },
+    "node_modules/b": {
+        "version": "1.0.0",
+        "resolved": "https://registry.npmjs.org/b/-/b-1.0.0.tgz",
+        "integrity": "sha512-CCCC",
+        "dev": True,
+    },
+    "node_modules/workspace": {
+        "resolved": "packages/workspace",
+        "link": True,
+    },
+    "packages/workspace": {
+        "version": "0.1.0",
+    },
+    "packages/workspace/node_modules/d": {
+        "version": "3.0.0",
+        "resolved": "https://registry.npmjs.org/d/-/d-3.0.0.tgz",
+        "integrity": "sha512-DDDD",
+    },
+}
+
+# ----------------------------------------------------------------------
+class ReadLockfileSuite(unittest.TestCase):
+    # ----------------------------------------------------------------------
+    def setUp(self):
+        self._temp_dir = tempfile.mkdtemp()
+
+    # ----------------------------------------------------------------------
+    def tearDown(self):
+        shutil.rmtree(self._temp_dir)
+
+    # ----------------------------------------------------------------------
+    def test_V1(self):
+        lockfile = self._Read(_V1_CONTENT)
+
+        self.assertEqual(lockfile.lockfile_version, 1)
+        self.assertEqual(lockfile.name, "project")
+        self.assertEqual(lockfile.version, "1.0.0")
+        self.assertFalse(lockfile.has_root_entry)
+
+        self.assertEqual(
+            sorted((record.path, record.version) for record in lockfile.packages),
+            [
+                ("node_modules/a", "1.0.0"),
+                ("node_modules/a/node_modules/b", "2.1.0"),
+                ("node_modules/b", "1.0.0"),
+            ],
+        )
+
+        a = lockfile.Resolve("a")
+        self.assertEqual(a.requires, {"b": "^2.0.0"})
+        self.assertEqual(a.integrity, "sha512-AAAA")
+        self.assertFalse(a.dev)
+        self.assertTrue(lockfile.Resolve("b").dev)
+
+        self.assertEqual(lockfile.Resolve("b", a.path).version, "2.1.0")
+
+        self.assertEqual(
+            sorted(record.path for record in lockfile.GetProductionPackages()),
+            ["node_modules/a", "node_modules/a/node_modules/b"],
+        )
+
+    # ----------------------------------------------------------------------
+    def test_V2(self):
+        # The 'dependencies' section is redundant with 'packages' and must be ignored, even
+        # when it appears first.
+        lockfile = self._Read(
+            {
+                "name": "project",
+                "version": "1.0.0",
+                "lockfileVersion": 2,
+                "dependencies": {
+                    "ignored": {
+                        "version": "9.9.9",
+                    },
+                },
+                "packages": _V3_PACKAGES,
+            },
+        )
+
+        self.assertEqual(lockfile.lockfile_version, 2)
+        self._VerifyPackages(lockfile)
+
+    # ----------------------------------------------------------------------
+    def test_V3(self):
+        lockfile = self._Read(
+            {
+                "name": "project",
+                "version": "1.0.0",
+                "lockfileVersion": 3,
+                "packages": _V3_PACKAGES,
+            },
+        )
+
+        self.assertEqual(lockfile.lockfile_version, 3)
+        self._VerifyPackages(lockfile)
+
+    # ----------------------------------------------------------------------
+    def test_MissingVersion(self):
+        lockfile = self._Read({"name": "project"})
+
+        self.assertEqual(lockfile.lockfile_version, 1)
+        self.assertIsNone(lockfile.packages)
+
+    # ----------------------------------------------------------------------
+    def test_ChunkBoundaries(self):
+        content = {
+            "name": "project",
+            "version": "1.0.0",
+            "lockfileVersion": 3,
+            "unused": [1, 2.5, -3e10, True, None, {"x": "\"}]{["}, "\u00e9\u4e2d"],
+            "packages": _V3_PACKAGES,
+        }
+
+        expected = self._ToTuples(self._Read(content))
+
+        # Every chunk size splits tokens (strings, numbers, and literals) at a different offset
+        for indent in [None, 2]:
+            for chunk_size in range(1, 40):
+                lockfile = self._Read(content, chunk_size=chunk_size, indent=indent)
+
+                self.assertEqual(lockfile.name, "project", chunk_size)
+                self.assertEqual(lockfile.lockfile_version, 3, chunk_size)
+                self.assertEqual(self._ToTuples(lockfile), expected, chunk_size)
+
+    # ----------------------------------------------------------------------
+    def test_NumberAtChunkBoundary(self):
+        # A number truncated by the end of a chunk must not be decoded as a shorter number
+        for chunk_size in range(1, 30):
+            lockfile = self._Read(
+                {
+                    "lockfileVersion": 12345,
+                    "name": "project",
+                },
+                chunk_size=chunk_size,
+            )
+
+            self.assertEqual(lockfile.lockfile_version, 12345, chunk_size)
+
+    # ----------------------------------------------------------------------
+    def test_Invalid(self):
+        filename = os.path.join(self._temp_dir, "package-lock.json")
+
+        with open(filename, "w") as f:
+            f.write('{"name": "project" "version": "1.0.0"}')
+
+        self.assertRaises(ValueError, lambda: ReadLockfile(filename))
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _Read(self, content, chunk_size=256 * 1024, indent=2):
+        filename = os.path.join(self._temp_dir, "package-lock.json")
+
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(content, f, indent=indent, ensure_ascii=False)
+
+        return ReadLockfile(filename, chunk_size=chunk_size)
+
+    # ----------------------------------------------------------------------
+    def _VerifyPackages(self, lockfile):
+        self.assertTrue(lockfile.has_root_entry)
+        self.assertEqual(lockfile.root_dependencies, {"a": "^1.0.0"})
+        self.assertEqual(lockfile.root_dev_dependencies, {"b": "^1.0.0"})
+
+        # Links and workspace entries outside of 'node_modules' aren't packages
+        self.assertEqual(
+            [record.path for record in lockfile.packages],
+            [
+                "node_modules/a",
+                "node_modules/a/node_modules/b",
+                "node_modules/b",
+                "packages/workspace/node_modules/d",
+            ],
+        )
+
+        self.assertEqual(
+            [record.name for record in lockfile.packages],
+            ["a", "b", "b", "d"],
+        )
+
+        self.assertEqual(
+            [record.path for record in lockfile.GetTopLevelPackages()],
+            ["node_modules/a", "node_modules/b"],
+        )
+
+        # Optional dependencies are merged into 'requires'
+        self.assertEqual(lockfile.Resolve("a").requires, {"b": "^2.0.0", "c": "^1.0.0"})
+
+        self.assertEqual(
+            [record.path for record in lockfile.GetProductionPackages()],
+            ["node_modules/a", "node_modules/a/node_modules/b"],
+        )
+
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def _ToTuples(lockfile):
+        return [
+            (
+                record.name,
+                record.version,
+                record.resolved,
+                record.integrity,
+                record.dev,
+                record.optional,
+                record.path,
+                record.requires,
+            )
+            for record in lockfile.packages
+        ]
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(unittest.main(verbosity=2))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,219 @@
+# ----------------------------------------------------------------------
+# |
+# |  Semver_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 23:41:52
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit test for Semver.py"""
+
+import os
+import sys
+import unittest
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = os.path.realpath(__file__)
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+sys.path.insert(0, os.path.join(_script_dir, "..", ".."))
+
+from Impl.Semver import ParseRange, ParseVersion, Satisfies, ToString
+
+# ----------------------------------------------------------------------
+class ParseVersionSuite(unittest.TestCase):
+    # ----------------------------------------------------------------------
+    def test_Standard(self):
+        self.assertEqual(ToString(ParseVersion("1.2.3")), "1.2.3")
+        self.assertEqual(ToString(ParseVersion("v1.2.3")), "1.2.3")
+        self.assertEqual(ToString(ParseVersion("=1.2.3")), "1.2.3")
+        self.assertEqual(ToString(ParseVersion(" 1.2.3 ")), "1.2.3")
+
+    # ----------------------------------------------------------------------
+    def test_PrereleaseAndBuild(self):
+        self.assertEqual(ToString(ParseVersion("1.2.3-beta.1")), "1.2.3-beta.1")
+        self.assertEqual(ParseVersion("1.2.3+build.5"), ParseVersion("1.2.3"))
+
+    # ----------------------------------------------------------------------
+    def test_Invalid(self):
+        self.assertIsNone(ParseVersion(None))
+        self.assertIsNone(ParseVersion(""))
+        self.assertIsNone(ParseVersion("1.2"))
+        self.assertIsNone(ParseVersion("latest"))
+        self.assertIsNone(ParseVersion("1.2.3.4"))
+
+    # ----------------------------------------------------------------------
+    def test_Ordering(self):
+        versions = [
+            "1.0.0-alpha",
+            "1.0.0-alpha.1",
+            "1.0.0-alpha.beta",
+            "1.0.0-beta",
+            "1.0.0-beta.2",
+            "1.0.0-beta.11",
+            "1.0.0-rc.1",
+            "1.0.0",
+            "1.0.1",
+            "1.1.0",
+            "2.0.0",
+            "10.0.0",
+        ]
+
+        parsed = [ParseVersion(version) for version in versions]
+
+        self.assertEqual(sorted(parsed), parsed)
+
+
+# ----------------------------------------------------------------------
+class SatisfiesSuite(unittest.TestCase):
+    # ----------------------------------------------------------------------
+    def test_Exact(self):
+        self.assertTrue(Satisfies("1.2.3", "1.2.3"))
+        self.assertTrue(Satisfies("1.2.3", "=1.2.3"))
+        self.assertFalse(Satisfies("1.2.4", "1.2.3"))
+
+    # ----------------------------------------------------------------------
+    def test_Comparators(self):
+        self.assertTrue(Satisfies("1.2.3", ">=1.2.3"))
+        self.assertFalse(Satisfies("1.2.2", ">=1.2.3"))
+        self.assertTrue(Satisfies("1.2.4", ">1.2.3"))
+        self.assertFalse(Satisfies("1.2.3", ">1.2.3"))
+        self.assertTrue(Satisfies("1.2.2", "<1.2.3"))
+        self.assertTrue(Satisfies("1.2.3", "<=1.2.3"))
+
+        self.assertTrue(Satisfies("1.5.0", ">= 1.2.3 < 2"))
+        self.assertFalse(Satisfies("2.0.0", ">= 1.2.3 < 2"))
+
+        # Partial versions
+        self.assertTrue(Satisfies("2.0.0", ">1"))
+        self.assertFalse(Satisfies("1.9.9", ">1"))
+        self.assertTrue(Satisfies("1.3.0", ">1.2"))
+        self.assertFalse(Satisfies("1.2.9", ">1.2"))
+        self.assertTrue(Satisfies("1.2.9", "<=1.2"))
+        self.assertFalse(Satisfies("1.3.0", "<=1.2"))
+        self.assertFalse(Satisfies("1.0.0", "<1"))
+
+    # ----------------------------------------------------------------------
+    def test_Caret(self):
+        self.assertTrue(Satisfies("1.2.3", "^1.2.3"))
+        self.assertTrue(Satisfies("1.9.0", "^1.2.3"))
+        self.assertFalse(Satisfies("2.0.0", "^1.2.3"))
+        self.assertFalse(Satisfies("1.2.2", "^1.2.3"))
+
+        self.assertTrue(Satisfies("0.2.9", "^0.2.3"))
+        self.assertFalse(Satisfies("0.3.0", "^0.2.3"))
+
+        self.assertTrue(Satisfies("0.0.3", "^0.0.3"))
+        self.assertFalse(Satisfies("0.0.4", "^0.0.3"))
+
+        self.assertTrue(Satisfies("1.9.0", "^1.2"))
+        self.assertTrue(Satisfies("0.2.5", "^0.2"))
+        self.assertFalse(Satisfies("0.3.0", "^0.2"))
+        self.assertTrue(Satisfies("1.9.0", "^1"))
+
+    # ----------------------------------------------------------------------
+    def test_Tilde(self):
+        self.assertTrue(Satisfies("1.2.9", "~1.2.3"))
+        self.assertFalse(Satisfies("1.3.0", "~1.2.3"))
+        self.assertFalse(Satisfies("1.2.2", "~1.2.3"))
+        self.assertTrue(Satisfies("1.2.9", "~>1.2.3"))
+        self.assertTrue(Satisfies("1.2.0", "~1.2"))
+        self.assertTrue(Satisfies("1.9.0", "~1"))
+        self.assertFalse(Satisfies("2.0.0", "~1"))
+
+    # ----------------------------------------------------------------------
+    def test_XRange(self):
+        self.assertTrue(Satisfies("1.2.3", "*"))
+        self.assertTrue(Satisfies("1.2.3", ""))
+        self.assertTrue(Satisfies("1.2.3", "x"))
+        self.assertTrue(Satisfies("1.9.0", "1.x"))
+        self.assertFalse(Satisfies("2.0.0", "1.x"))
+        self.assertTrue(Satisfies("1.2.9", "1.2.*"))
+        self.assertFalse(Satisfies("1.3.0", "1.2.X"))
+        self.assertTrue(Satisfies("1.9.0", "1"))
+        self.assertTrue(Satisfies("1.2.0", "1.2"))
+
+        # Parts that follow a wildcard are wildcards
+        self.assertTrue(Satisfies("1.5.0", "1.x.3"))
+
+    # ----------------------------------------------------------------------
+    def test_Hyphen(self):
+        self.assertTrue(Satisfies("1.2.3", "1.2.3 - 2.3.4"))
+        self.assertTrue(Satisfies("2.3.4", "1.2.3 - 2.3.4"))
+        self.assertFalse(Satisfies("2.3.5", "1.2.3 - 2.3.4"))
+
+        # Partial upper bounds include everything that matches the partial version
+        self.assertTrue(Satisfies("2.3.9", "1.2 - 2.3"))
+        self.assertFalse(Satisfies("2.4.0", "1.2 - 2.3"))
+        self.assertTrue(Satisfies("1.2.0", "1.2 - 2.3"))
+        self.assertFalse(Satisfies("1.1.9", "1.2 - 2.3"))
+
+    # ----------------------------------------------------------------------
+    def test_Union(self):
+        self.assertTrue(Satisfies("1.2.3", "^1.0.0 || ^2.0.0"))
+        self.assertTrue(Satisfies("2.5.0", "^1.0.0 || ^2.0.0"))
+        self.assertFalse(Satisfies("3.0.0", "^1.0.0 || ^2.0.0"))
+        self.assertTrue(Satisfies("0.5.0", "<1||>=3"))
+
+    # ----------------------------------------------------------------------
+    def test_Prerelease(self):
+        # Prereleases only satisfy ranges with a prerelease of the same version
+        self.assertTrue(Satisfies("1.2.3-beta.2", ">=1.2.3-beta.1"))
+        self.assertTrue(Satisfies("1.2.3-beta.2", "^1.2.3-beta.1"))
+        self.assertFalse(Satisfies("1.2.4-beta.2", ">=1.2.3-beta.1"))
+        self.assertFalse(Satisfies("1.2.3-beta.1", "^1.0.0"))
+        self.assertFalse(Satisfies("2.0.0-beta.1", "<2.0.0"))
+        self.assertFalse(Satisfies("2.0.0-beta.1", "^1.0.0"))
+
+        # Upper bounds exclude prereleases of the bound
+        self.assertFalse(Satisfies("2.0.0-rc.1", ">=2.0.0-alpha <2"))
+        self.assertTrue(Satisfies("2.0.0-rc.1", ">=2.0.0-alpha <2.0.0"))
+
+        # Releases satisfy ranges with prerelease bounds
+        self.assertTrue(Satisfies("1.2.3", ">=1.2.3-beta.1"))
+        self.assertTrue(Satisfies("1.3.0", "^1.2.3-beta.1"))
+
+    # ----------------------------------------------------------------------
+    def test_Alias(self):
+        self.assertTrue(Satisfies("1.2.3", "npm:other@^1.0.0"))
+        self.assertFalse(Satisfies("2.0.0", "npm:other@^1.0.0"))
+        self.assertTrue(Satisfies("1.2.3", "npm:@scope/other@~1.2.0"))
+        self.assertTrue(Satisfies("1.2.3", "npm:other"))
+
+    # ----------------------------------------------------------------------
+    def test_ParsedVersion(self):
+        self.assertTrue(Satisfies(ParseVersion("1.2.3"), "^1.0.0"))
+
+    # ----------------------------------------------------------------------
+    def test_NotSemver(self):
+        for range_value in [
+            None,
+            "latest",
+            "git+https://github.com/user/repo.git",
+            "https://example.com/package.tgz",
+            "file:../package",
+            "github:user/repo",
+        ]:
+            self.assertIsNone(ParseRange(range_value), range_value)
+            self.assertFalse(Satisfies("1.2.3", range_value), range_value)
+
+        self.assertFalse(Satisfies("not a version", "*"))
+        self.assertFalse(Satisfies(None, "*"))
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(unittest.main(verbosity=2))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,16 @@
+# ----------------------------------------------------------------------
+# |
+# |  __init__.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 08:31:12
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Functionality shared by scripts in this directory"""
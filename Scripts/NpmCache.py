@@ -0,0 +1,164 @@
+# ----------------------------------------------------------------------
+# |
+# |  NpmCache.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 18:58:14
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Maintains the npm cache directory managed by this repository. Activation points npm at this
+directory ('npm_config_cache') and NpmInstall.py records how often the packages it installs
+are found there.
+"""
+
+import os
+import sys
+import textwrap
+import time
+
+import CommonEnvironment
+from CommonEnvironment import CommandLine
+from CommonEnvironment.StreamDecorator import StreamDecorator
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = CommonEnvironment.ThisFullpath()
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+from Impl.ManagedNpmCache import ManagedNpmCache
+
+# ----------------------------------------------------------------------
+DEFAULT_CACHE_DIR                           = os.path.join(os.path.dirname(_script_dir), "Generated", "NpmCache")
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    cache_dir=CommandLine.EntryPoint.Parameter("npm cache directory"),
+    max_size_mb=CommandLine.EntryPoint.Parameter("Maximum size of the cache; least recently used packages are removed when this size is exceeded"),
+)
+@CommandLine.Constraints(
+    cache_dir=CommandLine.DirectoryTypeInfo(
+        ensure_exists=False,
+        arity="?",
+    ),
+    max_size_mb=CommandLine.IntTypeInfo(
+        min=1,
+        arity="?",
+    ),
+    output_stream=None,
+)
+def Evict(
+    cache_dir=DEFAULT_CACHE_DIR,
+    max_size_mb=4096,
+    output_stream=sys.stdout,
+):
+    """Removes the least recently used packages until the cache is within its size budget"""
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        cache = ManagedNpmCache(cache_dir)
+
+        dm.stream.write("Evicting packages...")
+        with dm.stream.DoneManager() as this_dm:
+            num_removed, size_removed = cache.Evict(max_size_mb * 1024 * 1024)
+
+            this_dm.stream.write(
+                "{} files removed ({:.1f} MB).\n".format(num_removed, size_removed / (1024.0 * 1024.0)),
+            )
+
+        _DisplayStatistics(dm.stream, cache.GetStatistics(), max_size_mb)
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    cache_dir=CommandLine.EntryPoint.Parameter("npm cache directory"),
+    days=CommandLine.EntryPoint.Parameter("Only consider installs performed within this number of days when calculating the hit rate"),
+)
+@CommandLine.Constraints(
+    cache_dir=CommandLine.DirectoryTypeInfo(
+        ensure_exists=False,
+        arity="?",
+    ),
+    days=CommandLine.IntTypeInfo(
+        min=1,
+        arity="?",
+    ),
+    output_stream=None,
+)
+def Report(
+    cache_dir=DEFAULT_CACHE_DIR,
+    days=30,
+    output_stream=sys.stdout,
+):
+    """Displays the size of the cache and its hit rate"""
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        cache = ManagedNpmCache(cache_dir)
+
+        _DisplayStatistics(
+            dm.stream,
+            cache.GetStatistics(since=time.time() - days * 24 * 60 * 60),
+            None,
+            days=days,
+        )
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _DisplayStatistics(output_stream, statistics, max_size_mb, days=None):
+    hit_rate = statistics.HitRate
+
+    output_stream.write(
+        textwrap.dedent(
+            """\
+
+            Files:                              {num_files}
+            Size:                               {size:.1f} MB{budget}
+            Installs:                           {num_installs}{period}
+            Hits:                               {hits}
+            Misses:                             {misses}
+            Hit rate:                           {hit_rate}
+
+            """,
+        ).format(
+            num_files=statistics.num_files,
+            size=statistics.size / (1024.0 * 1024.0),
+            budget=" (of {} MB)".format(max_size_mb) if max_size_mb is not None else "",
+            period=" (last {} days)".format(days) if days is not None else "",
+            num_installs=statistics.num_installs,
+            hits=statistics.hits,
+            misses=statistics.misses,
+            hit_rate="{:.1f}%".format(hit_rate) if hit_rate is not None else "N/A",
+        ),
+    )
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(
+            CommandLine.Main()
+        )
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,288 @@
+# ----------------------------------------------------------------------
+# |
+# |  NpmDedupe.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 17:12:05
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Finds packages that appear multiple times in a 'package-lock.json' file and removes the copies
+that are no longer needed, given the semver ranges declared by the packages that depend upon
+them. Packages whose dependents are all satisfied by a single version are hoisted to that version.
+
+The lockfile is only written when an output filename is provided or '/in_place' is specified.
+"""
+
+import json
+import os
+import sys
+import textwrap
+
+import CommonEnvironment
+from CommonEnvironment import CommandLine
+from CommonEnvironment.StreamDecorator import StreamDecorator
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = CommonEnvironment.ThisFullpath()
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+from Impl.DedupePlanner import CreatePlan, WriteLockfile
+from Impl.LockfileReader import ReadLockfile
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    working_dir=CommandLine.EntryPoint.Parameter("Directory that contains a 'package-lock.json' file"),
+    output_filename=CommandLine.EntryPoint.Parameter("Filename of the deduplicated lockfile"),
+    in_place=CommandLine.EntryPoint.Parameter("Overwrite the original lockfile with the deduplicated lockfile"),
+    max_duplicates=CommandLine.EntryPoint.Parameter("Maximum number of remaining duplicates to display"),
+    verbose=CommandLine.EntryPoint.Parameter("Display each package that is hoisted or removed"),
+)
+@CommandLine.Constraints(
+    working_dir=CommandLine.DirectoryTypeInfo(
+        arity="?",
+    ),
+    output_filename=CommandLine.FilenameTypeInfo(
+        ensure_exists=False,
+        arity="?",
+    ),
+    max_duplicates=CommandLine.IntTypeInfo(
+        min=0,
+        arity="?",
+    ),
+    output_stream=None,
+)
+def EntryPoint(
+    working_dir=None,
+    output_filename=None,
+    in_place=False,
+    max_duplicates=20,
+    verbose=False,
+    output_stream=sys.stdout,
+):
+    working_dir = working_dir or os.getcwd()
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        if output_filename and in_place:
+            dm.stream.write("ERROR: 'output_filename' and 'in_place' cannot both be provided.\n")
+            dm.result = -1
+
+            return dm.result
+
+        lockfile_filename = os.path.join(working_dir, "package-lock.json")
+        if not os.path.isfile(lockfile_filename):
+            dm.stream.write("ERROR: '{}' does not exist.\n".format(lockfile_filename))
+            dm.result = -1
+
+            return dm.result
+
+        dm.stream.write("Reading '{}'...".format(lockfile_filename))
+        with dm.stream.DoneManager() as this_dm:
+            lockfile = ReadLockfile(lockfile_filename)
+
+            if lockfile.packages is None:
+                this_dm.stream.write("ERROR: 'dependencies' or 'packages' was not found in the lockfile.\n")
+                this_dm.result = -1
+
+                return this_dm.result
+
+            root_requires = _GetRootRequires(working_dir, lockfile)
+
+        dm.stream.write("Planning...")
+        with dm.stream.DoneManager() as this_dm:
+            plan = CreatePlan(lockfile, root_requires)
+
+            if verbose:
+                for record, original_path in plan.hoists:
+                    this_dm.stream.write(
+                        "{}@{} [{}] -> [{}]\n".format(
+                            record.name,
+                            record.version,
+                            original_path,
+                            record.path,
+                        ),
+                    )
+
+                for record, replacement in plan.removals:
+                    if replacement is None:
+                        this_dm.stream.write(
+                            "{}@{} [{}] (removed with its parent)\n".format(
+                                record.name,
+                                record.version,
+                                record.path,
+                            ),
+                        )
+                    else:
+                        this_dm.stream.write(
+                            "{}@{} [{}] -> {} [{}]\n".format(
+                                record.name,
+                                record.version,
+                                record.path,
+                                replacement.version,
+                                replacement.path,
+                            ),
+                        )
+
+        if in_place:
+            output_filename = lockfile_filename
+
+        if output_filename:
+            if plan.operations or output_filename != lockfile_filename:
+                dm.stream.write("Writing '{}'...".format(output_filename))
+                with dm.stream.DoneManager():
+                    WriteLockfile(lockfile_filename, output_filename, plan)
+
+        elif plan.operations:
+            dm.stream.write(
+                "\nThe lockfile was not modified; provide '/output_filename=<filename>' or '/in_place' to write the deduplicated lockfile.\n",
+            )
+
+        num_packages = len(lockfile.packages)
+        num_removed = len(plan.removals)
+        num_hoisted = len(plan.hoists)
+
+        dm.stream.write(
+            textwrap.dedent(
+                """\
+
+                Packages:                           {num_packages}
+                Hoisted packages:                   {num_hoisted}
+                Removable copies:                   {num_removed} ({percent:.1f}%)
+                Disk savings:                       {disk}
+                Estimated install time savings:     {percent:.1f}% (fewer packages to fetch and extract)
+
+                """,
+            ).format(
+                num_packages=num_packages,
+                num_hoisted=num_hoisted,
+                num_removed=num_removed,
+                percent=num_removed * 100.0 / max(num_packages, 1),
+                disk=_GetDiskSavings(working_dir, plan),
+            ),
+        )
+
+        if plan.duplicates:
+            dm.stream.write(
+                "{} packages have multiple copies after deduplication{}:\n\n".format(
+                    len(plan.duplicates),
+                    "" if len(plan.duplicates) <= max_duplicates else " (displaying the first {})".format(max_duplicates),
+                ),
+            )
+
+            dm.stream.write(
+                "    {:<40} {:>6}  {:<30} {}\n".format("Name", "Copies", "Versions", "Single version"),
+            )
+
+            for info in plan.duplicates[:max_duplicates]:
+                dm.stream.write(
+                    "    {:<40} {:>6}  {:<30} {}\n".format(
+                        info.name,
+                        info.num_instances,
+                        ", ".join(info.versions),
+                        info.hoist_version or "-",
+                    ),
+                )
+
+            num_hoistable = sum(1 for info in plan.duplicates if info.hoist_version is not None)
+            if num_hoistable:
+                dm.stream.write(
+                    textwrap.dedent(
+                        """\
+
+                        The declared ranges of {} of these packages are satisfied by a single version
+                        ('Single version'), but hoisting that version would change how other packages
+                        resolve their dependencies to versions that don't satisfy the declared ranges.
+                        """,
+                    ).format(num_hoistable),
+                )
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _GetRootRequires(working_dir, lockfile):
+    results = {}
+
+    if lockfile.root_dependencies or lockfile.root_dev_dependencies or lockfile.root_optional_dependencies:
+        sources = [
+            lockfile.root_dependencies,
+            lockfile.root_dev_dependencies,
+            lockfile.root_optional_dependencies,
+        ]
+    else:
+        package_filename = os.path.join(working_dir, "package.json")
+        if not os.path.isfile(package_filename):
+            return results
+
+        with open(package_filename, encoding="utf-8") as f:
+            content = json.load(f)
+
+        sources = [
+            content.get("dependencies", {}),
+            content.get("devDependencies", {}),
+            content.get("optionalDependencies", {}),
+        ]
+
+    for source in sources:
+        results.update(source)
+
+    return results
+
+
+# ----------------------------------------------------------------------
+def _GetDiskSavings(working_dir, plan):
+    total_size = 0
+
+    for record, replacement in plan.removals:
+        # The package is included in the size of its removed parent
+        if replacement is None:
+            continue
+
+        package_dir = os.path.join(working_dir, *record.path.split("/"))
+        if not os.path.isdir(package_dir):
+            return "Unknown (install the packages to measure)"
+
+        total_size += _GetDirectorySize(package_dir)
+
+    return "{:.1f} MB".format(total_size / (1024.0 * 1024.0))
+
+
+# ----------------------------------------------------------------------
+def _GetDirectorySize(path):
+    size = 0
+    pending = [path]
+
+    while pending:
+        for item in os.scandir(pending.pop()):
+            if item.is_dir(follow_symlinks=False):
+                pending.append(item.path)
+            elif item.is_file(follow_symlinks=False):
+                size += item.stat(follow_symlinks=False).st_size
+
+    return size
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(
+            CommandLine.Main()
+        )
+    except KeyboardInterrupt:
+        pass
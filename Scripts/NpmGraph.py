@@ -0,0 +1,296 @@
+# ----------------------------------------------------------------------
+# |
+# |  NpmGraph.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 16:20:51
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Answers questions about a project's dependency graph using an index built from its
+'package-lock.json' file (the index is rebuilt automatically when the lockfile changes).
+"""
+
+import os
+import sys
+import time
+
+import CommonEnvironment
+from CommonEnvironment import CommandLine
+from CommonEnvironment.StreamDecorator import StreamDecorator
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = CommonEnvironment.ThisFullpath()
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+from Impl.DependencyGraph import DependencyGraph
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    working_dir=CommandLine.EntryPoint.Parameter("Directory that contains a 'package-lock.json' file"),
+    force=CommandLine.EntryPoint.Parameter("Rebuild the index even if the lockfile hasn't changed"),
+)
+@CommandLine.Constraints(
+    working_dir=CommandLine.DirectoryTypeInfo(
+        arity="?",
+    ),
+    output_stream=None,
+)
+def Build(
+    working_dir=None,
+    force=False,
+    output_stream=sys.stdout,
+):
+    """Builds the dependency graph index (if necessary)"""
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        graph = _OpenGraph(dm, working_dir, force)
+
+        try:
+            dm.stream.write(
+                "{} names, {} packages, {} edges.\n".format(*graph.GetStatistics()),
+            )
+        finally:
+            graph.Close()
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    name=CommandLine.EntryPoint.Parameter("Name of the package"),
+    version=CommandLine.EntryPoint.Parameter("Only consider this version of the package"),
+    working_dir=CommandLine.EntryPoint.Parameter("Directory that contains a 'package-lock.json' file"),
+)
+@CommandLine.Constraints(
+    name=CommandLine.StringTypeInfo(),
+    version=CommandLine.StringTypeInfo(
+        arity="?",
+    ),
+    working_dir=CommandLine.DirectoryTypeInfo(
+        arity="?",
+    ),
+    output_stream=None,
+)
+def Why(
+    name,
+    version=None,
+    working_dir=None,
+    output_stream=sys.stdout,
+):
+    """Displays the shortest dependency chain from the project to each instance of the package"""
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        graph = _OpenGraph(dm, working_dir)
+
+        try:
+            package_ids = _Find(dm, graph, name, version)
+
+            for package_id in package_ids:
+                start = time.perf_counter()
+                path = graph.GetShortestPath(package_id)
+                elapsed = time.perf_counter() - start
+
+                info = graph.GetInfo(path or [package_id])
+
+                dm.stream.write("\n{} ({:.1f} ms)\n".format(_FormatPackage(info[package_id]), elapsed * 1000))
+
+                if path is None:
+                    dm.stream.write("    The package is not reachable from the project.\n")
+                    continue
+
+                for depth, this_id in enumerate(path):
+                    dm.stream.write("    {}{}\n".format("  " * depth, _FormatPackage(info[this_id])))
+
+        finally:
+            graph.Close()
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    name=CommandLine.EntryPoint.Parameter("Name of the package"),
+    version=CommandLine.EntryPoint.Parameter("Only consider this version of the package"),
+    transitive=CommandLine.EntryPoint.Parameter("Include packages that depend on the package indirectly"),
+    working_dir=CommandLine.EntryPoint.Parameter("Directory that contains a 'package-lock.json' file"),
+)
+@CommandLine.Constraints(
+    name=CommandLine.StringTypeInfo(),
+    version=CommandLine.StringTypeInfo(
+        arity="?",
+    ),
+    working_dir=CommandLine.DirectoryTypeInfo(
+        arity="?",
+    ),
+    output_stream=None,
+)
+def Dependents(
+    name,
+    version=None,
+    transitive=False,
+    working_dir=None,
+    output_stream=sys.stdout,
+):
+    """Displays the packages that pull in the package"""
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        graph = _OpenGraph(dm, working_dir)
+
+        try:
+            package_ids = _Find(dm, graph, name, version)
+            if package_ids:
+                _DisplayPackages(
+                    dm,
+                    graph,
+                    lambda: graph.GetDependents(package_ids, transitive=transitive),
+                    "dependents",
+                )
+
+        finally:
+            graph.Close()
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    name=CommandLine.EntryPoint.Parameter("Name of the package"),
+    version=CommandLine.EntryPoint.Parameter("Only consider this version of the package"),
+    working_dir=CommandLine.EntryPoint.Parameter("Directory that contains a 'package-lock.json' file"),
+)
+@CommandLine.Constraints(
+    name=CommandLine.StringTypeInfo(),
+    version=CommandLine.StringTypeInfo(
+        arity="?",
+    ),
+    working_dir=CommandLine.DirectoryTypeInfo(
+        arity="?",
+    ),
+    output_stream=None,
+)
+def Closure(
+    name,
+    version=None,
+    working_dir=None,
+    output_stream=sys.stdout,
+):
+    """Displays the transitive dependencies of the package"""
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        graph = _OpenGraph(dm, working_dir)
+
+        try:
+            package_ids = _Find(dm, graph, name, version)
+            if package_ids:
+                _DisplayPackages(
+                    dm,
+                    graph,
+                    lambda: graph.GetClosure(package_ids),
+                    "dependencies",
+                )
+
+        finally:
+            graph.Close()
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _OpenGraph(dm, working_dir, force=False):
+    working_dir = working_dir or os.getcwd()
+
+    dm.stream.write("Opening the dependency graph index...")
+    with dm.stream.DoneManager() as this_dm:
+        start = time.perf_counter()
+
+        graph, was_rebuilt = DependencyGraph.Open(
+            working_dir,
+            force_rebuild=force,
+        )
+
+        this_dm.stream.write(
+            "{} ({:.1f} ms).\n".format(
+                "Rebuilt" if was_rebuilt else "Up to date",
+                (time.perf_counter() - start) * 1000,
+            ),
+        )
+
+    return graph
+
+
+# ----------------------------------------------------------------------
+def _Find(dm, graph, name, version):
+    package_ids = graph.Find(name, version)
+
+    if not package_ids:
+        dm.stream.write(
+            "ERROR: '{}' was not found.\n".format(
+                name if version is None else "{}@{}".format(name, version),
+            ),
+        )
+        dm.result = -1
+
+    return package_ids
+
+
+# ----------------------------------------------------------------------
+def _DisplayPackages(dm, graph, query_func, desc):
+    start = time.perf_counter()
+    package_ids = query_func()
+    elapsed = time.perf_counter() - start
+
+    info = graph.GetInfo(package_ids)
+
+    dm.stream.write("\n{} {} ({:.1f} ms):\n".format(len(package_ids), desc, elapsed * 1000))
+
+    for values in sorted(info.values(), key=lambda values: (values[0], values[2])):
+        dm.stream.write("    {}\n".format(_FormatPackage(values)))
+
+
+# ----------------------------------------------------------------------
+def _FormatPackage(values):
+    name, version, path, dev, _ = values
+
+    if not path:
+        return "{} (project)".format(name)
+
+    return "{}@{}{}  [{}]".format(name, version, " (dev)" if dev else "", path)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(
+            CommandLine.Main()
+        )
+    except KeyboardInterrupt:
+        pass
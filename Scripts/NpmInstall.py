@@ -15,17 +15,22 @@
 # ----------------------------------------------------------------------
 """Installs node modules via npm with only a package-lock.json file"""
 
+import contextlib
 import json
+import multiprocessing
 import os
+import re
 import sys
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 import six
 
 import CommonEnvironment
 from CommonEnvironment.CallOnExit import CallOnExit
 from CommonEnvironment import CommandLine
 from CommonEnvironment import FileSystem
-from CommonEnvironment import Process
 from CommonEnvironment.StreamDecorator import StreamDecorator
 
 # ----------------------------------------------------------------------
@@ -33,90 +38,781 @@ _script_fullpath                            = CommonEnvironment.ThisFullpath()
 _script_dir, _script_name                   = os.path.split(_script_fullpath)
 # ----------------------------------------------------------------------
 
-@CommandLine.EntryPoint
+from Impl.DirectoryCache import DirectoryCache
+from Impl import IncrementalInstall
+from Impl.LockfileReader import ReadLockfile
+from Impl.ManagedNpmCache import ManagedNpmCache
+from Impl.Metrics import Metrics, SUPPORTED_FORMATS as SUPPORTED_METRICS_FORMATS
+from Impl.NpmConfig import NpmConfig
+from Impl.PackageStore import PackageStore
+from Impl import ProcessRunner
+from Impl.TarballStore import TarballStore
+
+from NpmCache import DEFAULT_CACHE_DIR as DEFAULT_NPM_CACHE_DIR
+from NpmTarballStore import DEFAULT_STORE_DIR as DEFAULT_TARBALL_STORE_DIR
+
+_repo_root                                  = os.path.dirname(_script_dir)
+
+# Ensure that we are loading custom data from this dir and not some other repository.
+sys.modules.pop("_custom_data", None)
+
+sys.path.insert(0, _repo_root)
+from _custom_data import _CUSTOM_DATA
+del sys.path[0]
+
+# ----------------------------------------------------------------------
+DEFAULT_CACHE_DIR                           = os.path.join(_repo_root, "Generated", "NodeModulesCache")
+
+_TOOLCHAIN_KEY                              = ";".join(
+    "{}:{}".format(name, version) for name, version, _ in _CUSTOM_DATA
+)
+
+# Suffix of the original 'package.json' and 'package-lock.json' files while 'npm ci' runs with
+# generated versions of those files; it is specific to this script so that backups created by
+# other tools (or by the user) are never mistaken for files that this script must restore.
+_BACKUP_SUFFIX                              = ".NpmInstall.bak"
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    working_dir=CommandLine.EntryPoint.Parameter("Directories that contain a 'package-lock.json' file; the current directory is used if no directories are provided and 'search_root' isn't provided"),
+    search_root=CommandLine.EntryPoint.Parameter("Recursively search this directory for 'package-lock.json' files and install each project found"),
+    jobs=CommandLine.EntryPoint.Parameter("Number of projects to install concurrently"),
+    cache=CommandLine.EntryPoint.Parameter("Restore 'node_modules' from a snapshot keyed by the hash of 'package-lock.json' (and the Node version) when available"),
+    cache_dir=CommandLine.EntryPoint.Parameter("Directory that contains 'node_modules' snapshots"),
+    cache_max_size_mb=CommandLine.EntryPoint.Parameter("Maximum size of the snapshot cache; least recently used snapshots are evicted when this size is exceeded"),
+    npm_cache_dir=CommandLine.EntryPoint.Parameter("npm cache directory used by 'npm ci' (maintained by 'NpmCache.py')"),
+    tarball_store=CommandLine.EntryPoint.Parameter("Install offline using tarballs from this store (populated by 'NpmTarballStore.py Prefetch')"),
+    incremental=CommandLine.EntryPoint.Parameter("Only install the packages that changed since the last install, falling back to 'npm ci' when that isn't possible"),
+    package_store=CommandLine.EntryPoint.Parameter("Populate 'node_modules' with hardlinks to packages in this global, deduplicated package store rather than running 'npm ci'"),
+    resumable=CommandLine.EntryPoint.Parameter("Extract packages from their tarballs rather than running 'npm ci' and record each package as it is installed, so that an install that fails or is interrupted resumes where it left off"),
+    production=CommandLine.EntryPoint.Parameter("Only install the packages required at runtime (the closure of the project's production dependencies)"),
+    metrics_filename=CommandLine.EntryPoint.Parameter("Write the wall time, CPU time, and peak RSS of each install phase to this file"),
+    metrics_format=CommandLine.EntryPoint.Parameter("Format of the metrics file ('json' or 'prometheus'); based on the file's extension ('.prom' for Prometheus) if not provided"),
+)
 @CommandLine.Constraints(
     working_dir=CommandLine.DirectoryTypeInfo(
+        arity="*",
+    ),
+    search_root=CommandLine.DirectoryTypeInfo(
+        arity="?",
+    ),
+    jobs=CommandLine.IntTypeInfo(
+        min=1,
+        arity="?",
+    ),
+    cache_dir=CommandLine.DirectoryTypeInfo(
+        ensure_exists=False,
+        arity="?",
+    ),
+    cache_max_size_mb=CommandLine.IntTypeInfo(
+        min=1,
+        arity="?",
+    ),
+    npm_cache_dir=CommandLine.DirectoryTypeInfo(
+        ensure_exists=False,
+        arity="?",
+    ),
+    tarball_store=CommandLine.DirectoryTypeInfo(
+        arity="?",
+    ),
+    package_store=CommandLine.DirectoryTypeInfo(
+        ensure_exists=False,
+        arity="?",
+    ),
+    metrics_filename=CommandLine.FilenameTypeInfo(
+        ensure_exists=False,
+        arity="?",
+    ),
+    metrics_format=CommandLine.EnumTypeInfo(
+        SUPPORTED_METRICS_FORMATS,
         arity="?",
     ),
     output_stream=None,
 )
 def EntryPoint(
-    working_dir=os.getcwd(),
+    working_dir=None,
+    search_root=None,
+    jobs=multiprocessing.cpu_count(),
     preserve_package=False,
+    cache=False,
+    cache_dir=DEFAULT_CACHE_DIR,
+    cache_max_size_mb=4096,
+    npm_cache_dir=DEFAULT_NPM_CACHE_DIR,
+    tarball_store=None,
+    incremental=False,
+    package_store=None,
+    resumable=False,
+    production=False,
+    metrics_filename=None,
+    metrics_format=None,
     output_stream=sys.stdout,
     verbose=False,
 ):
-    with StreamDecorator(output_stream).DoneManager(
+    working_dirs = [os.path.realpath(directory) for directory in (working_dir or [])]
+
+    if search_root:
+        working_dirs += FindProjects(search_root)
+    elif not working_dirs:
+        working_dirs.append(os.getcwd())
+
+    if cache:
+        node_modules_cache = DirectoryCache(
+            cache_dir,
+            max_size=cache_max_size_mb * 1024 * 1024,
+        )
+    else:
+        node_modules_cache = None
+
+    if tarball_store is not None:
+        tarball_store = TarballStore(tarball_store)
+
+    if package_store is not None:
+        package_store = PackageStore(package_store)
+
+    metrics = Metrics("NpmInstall")
+
+    install_kwargs = {
+        "preserve_package": preserve_package,
+        "node_modules_cache": node_modules_cache,
+        "npm_cache": ManagedNpmCache(npm_cache_dir),
+        "tarball_store": tarball_store,
+        "incremental": incremental,
+        "package_store": package_store,
+        "resumable": resumable,
+        "production": production,
+        "metrics": metrics,
+        "verbose": verbose,
+        # A progress line is only meaningful when a single project is written to a terminal
+        "show_progress": (
+            len(working_dirs) == 1
+            and getattr(output_stream, "isatty", lambda: False)()
+        ),
+    }
+
+    if metrics_filename:
+        # The metrics are written even if the install fails
+        write_metrics_func = lambda: metrics.Write(metrics_filename, metrics_format)
+    else:
+        write_metrics_func = lambda: None
+
+    with CallOnExit(write_metrics_func), StreamDecorator(output_stream).DoneManager(
         line_prefix="",
         prefix="\nResults: ",
         suffix="\n",
     ) as dm:
-        prev_dir = os.getcwd()
-
-        os.chdir(working_dir)
-        with CallOnExit(lambda: os.chdir(prev_dir)):
-            dm.stream.write("Reading 'package-lock.json'...")
-            with dm.stream.DoneManager() as this_dm:
-                if not os.path.isfile("package-lock.json"):
-                    this_dm.stream.write("ERROR: 'package-lock.json' does not exist.\n")
-                    this_dm.result = -1
-
-                    return this_dm.result
-
-                with open("package-lock.json") as f:
-                    content = json.load(f)
-
-                if "dependencies" not in content:
-                    this_dm.stream.write("ERROR: 'dependencies' was not found.\n")
-                    this_dm.result = -1
-
-                    return this_dm.result
-
-                dependencies = content["dependencies"]
-
-            dm.stream.write("Creating 'package.json'...")
-            with dm.stream.DoneManager() as this_dm:
-                if os.path.isfile("package.json"):
-                    os.rename("package.json", "package.json.old")
-                    restore_file_func = lambda: os.rename("package.json.old", "package.json")
-                else:
-                    restore_file_func = lambda: None
-
-                for k, v in dependencies.items():
-                    dependencies[k] = "={}".format(v["version"])
-
-                with open("package.json", "w") as f:
-                    json.dump(
-                        {
-                            "dependencies": dependencies,
-                        },
-                        f,
+        if len(working_dirs) == 1:
+            dm.result = InstallProject(working_dirs[0], dm.stream, **install_kwargs)
+
+            return dm.result
+
+        if not working_dirs:
+            dm.stream.write("No projects were found.\n")
+            return dm.result
+
+        # ----------------------------------------------------------------------
+        def Impl(directory):
+            sink = six.moves.StringIO()
+
+            try:
+                result = InstallProject(directory, sink, **install_kwargs)
+            except Exception as ex:
+                sink.write("ERROR: {}\n".format(ex))
+                result = -1
+
+            return result, sink.getvalue()
+
+        # ----------------------------------------------------------------------
+
+        dm.stream.write(
+            "Installing {} projects ({} at a time)...".format(len(working_dirs), jobs),
+        )
+        with dm.stream.DoneManager() as this_dm:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                futures = [executor.submit(Impl, directory) for directory in working_dirs]
+
+                results = []
+
+                for directory, future in zip(working_dirs, futures):
+                    result, output = future.result()
+                    results.append(result)
+
+                    this_dm.stream.write(
+                        "\n{}\n{}\n{}".format(
+                            directory,
+                            "-" * len(directory),
+                            output,
+                        ),
                     )
 
-        with CallOnExit(restore_file_func):
-            if preserve_package:
-                remove_file_func = lambda: None
-            else:
-                remove_file_func = lambda: FileSystem.RemoveFile("package.json")
+            failures = [
+                directory for directory, result in zip(working_dirs, results) if result != 0
+            ]
 
-            with CallOnExit(remove_file_func):
-                dm.stream.write("Running 'npm ci'...")
-                with dm.stream.DoneManager() as this_dm:
-                    if verbose:
-                        this_output_stream = this_dm.stream
-                    else:
-                        this_output_stream = six.moves.StringIO()
+            this_dm.stream.write(
+                "\n{} succeeded, {} failed.\n".format(
+                    len(working_dirs) - len(failures),
+                    len(failures),
+                ),
+            )
 
-                    this_dm.result = Process.Execute("npm ci", this_output_stream)
-                    if this_dm.result != 0:
-                        if not verbose:
-                            this_dm.stream.write(this_output_stream.getvalue())
+            for directory in failures:
+                this_dm.stream.write("    FAILED: {}\n".format(directory))
 
-                        return this_dm.result
+            if failures:
+                this_dm.result = -1
 
         return dm.result
 
 
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def FindProjects(search_root):
+    """Returns all directories under `search_root` that contain a 'package-lock.json' file"""
+
+    results = []
+
+    for root, directories, filenames in os.walk(search_root):
+        directories[:] = [directory for directory in directories if directory != "node_modules"]
+
+        if "package-lock.json" in filenames:
+            results.append(os.path.realpath(root))
+
+    return sorted(results)
+
+
+# ----------------------------------------------------------------------
+def GetCacheKey(lockfile_filename, production=False):
+    """Returns the key of the 'node_modules' snapshot for the lockfile"""
+
+    return DirectoryCache.CreateKey(
+        [lockfile_filename],
+        _TOOLCHAIN_KEY,
+        *(["production"] if production else [])
+    )
+
+
+# ----------------------------------------------------------------------
+def InstallProject(
+    working_dir,
+    output_stream,
+    preserve_package=False,
+    node_modules_cache=None,
+    npm_cache=None,
+    tarball_store=None,
+    incremental=False,
+    package_store=None,
+    resumable=False,
+    production=False,
+    metrics=None,
+    verbose=False,
+    show_progress=False,
+):
+    """Installs the node modules for the project in `working_dir`; returns the result"""
+
+    lockfile_filename = os.path.join(working_dir, "package-lock.json")
+    node_modules_dir = os.path.join(working_dir, "node_modules")
+
+    metrics = (metrics or Metrics("NpmInstall")).Labeled(
+        project=working_dir,
+    )
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+    ) as dm, metrics.Phase("total"):
+        # The original files of an install that was killed before it could restore them are
+        # restored before anything else reads them; the files that exist in their place were
+        # generated by that install.
+        for filename in [os.path.join(working_dir, "package.json"), lockfile_filename]:
+            if os.path.isfile(filename + _BACKUP_SUFFIX):
+                dm.stream.write("Restoring '{}' from an interrupted install...\n".format(os.path.basename(filename)))
+                os.replace(filename + _BACKUP_SUFFIX, filename)
+
+        dm.stream.write("Reading 'package-lock.json'...")
+        with dm.stream.DoneManager() as this_dm, metrics.Phase("read_lockfile"):
+            if not os.path.isfile(lockfile_filename):
+                this_dm.stream.write("ERROR: 'package-lock.json' does not exist.\n")
+                this_dm.result = -1
+
+                return this_dm.result
+
+            lockfile = ReadLockfile(lockfile_filename)
+
+            if lockfile.packages is None:
+                this_dm.stream.write("ERROR: 'dependencies' or 'packages' was not found.\n")
+                this_dm.result = -1
+
+                return this_dm.result
+
+        if production:
+            dm.stream.write("Calculating the production dependencies...")
+            with dm.stream.DoneManager() as this_dm, metrics.Phase("production_closure"):
+                records = lockfile.GetProductionPackages()
+
+                this_dm.stream.write(
+                    "{} of {} packages are required in production.\n".format(
+                        len(records),
+                        len(lockfile.packages),
+                    ),
+                )
+        else:
+            records = lockfile.packages
+
+        if npm_cache is not None:
+            # Usage is recorded for every install (regardless of how the packages are
+            # installed), so that the cache's statistics reflect all installs and the tarballs
+            # of packages that are still in use aren't evicted.
+            dm.stream.write("Checking the npm cache...")
+            with dm.stream.DoneManager() as this_dm, metrics.Phase("check_npm_cache"):
+                hits, misses = npm_cache.RecordUsage(records, name=working_dir)
+
+                this_dm.stream.write(
+                    "{} hits, {} misses ({}).\n".format(
+                        hits,
+                        misses,
+                        "{:.1f}%".format(hits * 100.0 / (hits + misses)) if hits + misses else "N/A",
+                    ),
+                )
+
+        if node_modules_cache is not None:
+            cache_key = GetCacheKey(lockfile_filename, production)
+
+            dm.stream.write("Restoring 'node_modules' from the cache...")
+            with dm.stream.DoneManager() as this_dm, metrics.Phase("cache_restore"):
+                if node_modules_cache.Contains(cache_key):
+                    if os.path.isdir(node_modules_dir):
+                        FileSystem.RemoveTree(node_modules_dir)
+
+                    # The files are copied rather than linked, as packages may be modified in
+                    # place (by patch-package, build steps, etc.) and those changes must not
+                    # modify the snapshot restored by other projects.
+                    if node_modules_cache.Restore(cache_key, node_modules_dir, use_links=False):
+                        this_dm.stream.write("Cache hit ({}).\n".format(cache_key))
+                        return dm.result
+
+                this_dm.stream.write("Cache miss ({}).\n".format(cache_key))
+
+        result = None
+
+        if incremental or package_store is not None or resumable:
+            # Packages are downloaded with the settings in this project's '.npmrc'
+            download_store = TarballStore(
+                tarball_store.Root if tarball_store is not None else DEFAULT_TARBALL_STORE_DIR,
+                NpmConfig.Load(working_dir),
+            )
+
+        if incremental:
+            result = _InstallIncremental(
+                dm,
+                working_dir,
+                records,
+                download_store,
+                package_store,
+                metrics,
+                verbose,
+                show_progress,
+            )
+
+        if result is None and (package_store is not None or resumable):
+            result = _InstallLinked(
+                dm,
+                working_dir,
+                records,
+                download_store,
+                package_store,
+                resumable,
+                metrics,
+                verbose,
+                show_progress,
+            )
+
+        if result is None:
+            result = _InstallFull(
+                dm,
+                working_dir,
+                lockfile,
+                records,
+                production,
+                preserve_package,
+                npm_cache,
+                tarball_store,
+                metrics,
+                verbose,
+                show_progress,
+            )
+
+        if result != 0:
+            dm.result = result
+            return dm.result
+
+        if node_modules_cache is not None:
+            dm.stream.write("Storing 'node_modules' in the cache...")
+            with dm.stream.DoneManager(), metrics.Phase("cache_store"):
+                node_modules_cache.Store(cache_key, node_modules_dir)
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _InstallFull(dm, working_dir, lockfile, records, production, preserve_package, npm_cache, tarball_store, metrics, verbose, show_progress):
+    """Installs the packages via 'npm ci'"""
+
+    lockfile_filename = os.path.join(working_dir, "package-lock.json")
+    package_filename = os.path.join(working_dir, "package.json")
+    node_modules_dir = os.path.join(working_dir, "node_modules")
+
+    if tarball_store is not None:
+        dm.stream.write("Checking the tarball store...")
+        with dm.stream.DoneManager() as this_dm, metrics.Phase("check_tarball_store"):
+            missing = [
+                record for record in records
+                if record.resolved
+                and record.integrity
+                and not tarball_store.Contains(record.integrity)
+            ]
+
+            if missing:
+                for record in missing:
+                    this_dm.stream.write(
+                        "ERROR: '{}@{}' is not in the tarball store.\n".format(
+                            record.name,
+                            record.version,
+                        ),
+                    )
+
+                this_dm.stream.write("\nRun 'NpmTarballStore.py Prefetch' to populate the store.\n")
+
+                this_dm.result = -1
+                return this_dm.result
+
+    # The original files are restored when the install completes, fails, or is interrupted
+    # (Ctrl+C). The restore functions are registered as soon as the files are renamed, as
+    # writing the generated files can take a significant amount of time for large lockfiles.
+    with contextlib.ExitStack() as exit_stack:
+        dm.stream.write("Creating 'package.json'...")
+        with dm.stream.DoneManager(), metrics.Phase("create_package_json"):
+            if os.path.isfile(package_filename):
+                os.rename(package_filename, package_filename + _BACKUP_SUFFIX)
+                exit_stack.callback(os.rename, package_filename + _BACKUP_SUFFIX, package_filename)
+
+            if not preserve_package:
+                exit_stack.callback(FileSystem.RemoveFile, package_filename)
+
+            with open(package_filename, "w") as f:
+                json.dump(_CreatePackageJson(lockfile, records), f)
+
+        if tarball_store is not None:
+            dm.stream.write("Creating offline 'package-lock.json'...")
+            with dm.stream.DoneManager(), metrics.Phase("create_offline_lockfile"):
+                os.rename(lockfile_filename, lockfile_filename + _BACKUP_SUFFIX)
+                exit_stack.callback(os.replace, lockfile_filename + _BACKUP_SUFFIX, lockfile_filename)
+
+                _CreateOfflineLockfile(
+                    lockfile_filename + _BACKUP_SUFFIX,
+                    lockfile_filename,
+                    {
+                        record.resolved: tarball_store.GetFilename(record.integrity)
+                        for record in records
+                        if record.resolved and record.integrity
+                    },
+                )
+
+            npm_command_line = "npm ci --offline"
+        else:
+            npm_command_line = "npm ci"
+
+        if production:
+            npm_command_line += " --production"
+
+        if npm_cache is not None:
+            npm_command_line += ' --cache "{}"'.format(npm_cache.Root)
+
+        result = _RunNpm(dm, npm_command_line, working_dir, metrics, verbose, show_progress)
+        if result != 0:
+            return result
+
+    # npm doesn't create 'node_modules' when there aren't any packages to install
+    if os.path.isdir(node_modules_dir):
+        with metrics.Phase("write_state"):
+            IncrementalInstall.WriteState(node_modules_dir, records, _TOOLCHAIN_KEY)
+
+    return 0
+
+
+# ----------------------------------------------------------------------
+def _CreatePackageJson(lockfile, records):
+    """\
+    Returns the content of the 'package.json' file used by 'npm ci'.
+
+    'npm ci' (npm 7 and later) fails if the dependencies in 'package.json' don't match those
+    of the root entry in the lockfile, so they are used as-is when the root entry is
+    available. Lockfiles without a root entry (v1) don't distinguish the root project's
+    dependencies from hoisted packages, so each top-level package is pinned to its version.
+    """
+
+    content = OrderedDict()
+
+    if lockfile.name:
+        content["name"] = lockfile.name
+    if lockfile.version:
+        content["version"] = lockfile.version
+
+    if lockfile.has_root_entry:
+        for key, value in [
+            ("dependencies", lockfile.root_dependencies),
+            ("devDependencies", lockfile.root_dev_dependencies),
+            ("optionalDependencies", lockfile.root_optional_dependencies),
+        ]:
+            if value:
+                content[key] = value
+
+    else:
+        content["dependencies"] = OrderedDict(
+            (record.name, "={}".format(record.version))
+            for record in records
+            if record.IsTopLevel
+        )
+
+    return content
+
+
+# ----------------------------------------------------------------------
+def _InstallIncremental(dm, working_dir, records, tarball_store, package_store, metrics, verbose, show_progress):
+    """\
+    Installs the packages that have changed since the last install; returns None if the
+    delta can't be applied and a full install is required.
+    """
+
+    node_modules_dir = os.path.join(working_dir, "node_modules")
+
+    dm.stream.write("Calculating the lockfile delta...")
+    with dm.stream.DoneManager() as this_dm, metrics.Phase("calculate_delta"):
+        delta = IncrementalInstall.CalculateDelta(node_modules_dir, records, _TOOLCHAIN_KEY)
+
+        if isinstance(delta, str):
+            this_dm.stream.write("A full install is required: {}.\n".format(delta))
+            return None
+
+    if not delta.IsEmpty:
+        dm.stream.write("Applying the lockfile delta...")
+        with dm.stream.DoneManager() as this_dm, metrics.Phase("apply_delta"):
+            # Remove the state while the delta is being applied so that an interrupted install
+            # results in a full install the next time.
+            IncrementalInstall.RemoveState(node_modules_dir)
+
+            if package_store is not None:
+                package_store.SetReferences(node_modules_dir, (record.integrity for record in records))
+
+            try:
+                rebuild_names = IncrementalInstall.ApplyDelta(
+                    working_dir,
+                    delta,
+                    tarball_store,
+                    package_store=package_store,
+                )
+            except Exception as ex:
+                this_dm.stream.write(
+                    "The delta could not be applied; a full install is required ({}).\n".format(ex),
+                )
+                return None
+
+        if rebuild_names:
+            result = _RunNpm(
+                dm,
+                "npm rebuild {}".format(" ".join(rebuild_names)),
+                working_dir,
+                metrics,
+                verbose,
+                show_progress,
+            )
+            if result != 0:
+                return result
+
+        with metrics.Phase("write_state"):
+            IncrementalInstall.WriteState(node_modules_dir, records, _TOOLCHAIN_KEY)
+
+    dm.stream.write(
+        "{} packages reused, {} reinstalled ({} added, {} changed), {} removed.\n".format(
+            len(delta.reused),
+            len(delta.added) + len(delta.changed),
+            len(delta.added),
+            len(delta.changed),
+            len(delta.removed),
+        ),
+    )
+
+    return 0
+
+
+# ----------------------------------------------------------------------
+def _InstallLinked(dm, working_dir, records, tarball_store, package_store, resumable, metrics, verbose, show_progress):
+    """\
+    Populates 'node_modules' with links to packages in the package store (or with packages
+    extracted from their tarballs if a package store isn't provided); returns None if that
+    isn't possible and a full install is required.
+
+    Each package is recorded in a checkpoint once it has been installed; an install that
+    fails or is interrupted resumes from the checkpoint the next time, reinstalling only the
+    packages that weren't installed or that fail verification.
+    """
+
+    node_modules_dir = os.path.join(working_dir, "node_modules")
+
+    for record in records:
+        if not record.resolved or not record.integrity:
+            dm.stream.write(
+                "'{}' does not have a 'resolved' url or 'integrity' value; a full install is required.\n".format(
+                    record.path,
+                ),
+            )
+            return None
+
+    dm.stream.write("Reading the checkpoint...")
+    with dm.stream.DoneManager() as this_dm, metrics.Phase("read_checkpoint"):
+        resume_info = IncrementalInstall.CalculateResumeDelta(node_modules_dir, records, _TOOLCHAIN_KEY)
+
+        if resume_info is None:
+            this_dm.stream.write("There isn't an install to resume.\n")
+
+            delta = IncrementalInstall.Delta(list(records), [], [], [])
+            rebuild_names = []
+        else:
+            delta, rebuild_names = resume_info
+
+            this_dm.stream.write(
+                "Resuming the previous install: {} packages verified, {} corrupt, {} remaining.\n".format(
+                    len(delta.reused),
+                    len(delta.changed),
+                    len(delta.added),
+                ),
+            )
+
+    dm.stream.write(
+        "Linking packages from the package store..." if package_store is not None else "Extracting packages...",
+    )
+    with dm.stream.DoneManager() as this_dm, metrics.Phase("link_packages"):
+        if resume_info is None:
+            if os.path.isdir(node_modules_dir):
+                FileSystem.RemoveTree(node_modules_dir)
+
+            os.makedirs(node_modules_dir)
+
+        # Remove the state while packages are being installed so that an interrupted install
+        # is never mistaken for a complete one.
+        IncrementalInstall.RemoveState(node_modules_dir)
+
+        if package_store is not None:
+            package_store.SetReferences(node_modules_dir, (record.integrity for record in records))
+
+        checkpoint = IncrementalInstall.Checkpoint(node_modules_dir, _TOOLCHAIN_KEY)
+
+        try:
+            with CallOnExit(checkpoint.Close):
+                rebuild_names = sorted(
+                    set(rebuild_names).union(
+                        IncrementalInstall.ApplyDelta(
+                            working_dir,
+                            delta,
+                            tarball_store,
+                            package_store=package_store,
+                            checkpoint=checkpoint,
+                        ),
+                    ),
+                )
+        except Exception as ex:
+            if resumable:
+                this_dm.stream.write(
+                    "ERROR: The packages could not be installed ({}); run the install again to resume.\n".format(ex),
+                )
+                this_dm.result = -1
+
+                return this_dm.result
+
+            this_dm.stream.write(
+                "The packages could not be linked; a full install is required ({}).\n".format(ex),
+            )
+            return None
+
+        this_dm.stream.write(
+            "{} packages {}.\n".format(
+                len(delta.added) + len(delta.changed),
+                "linked" if package_store is not None else "extracted",
+            ),
+        )
+
+    if rebuild_names:
+        result = _RunNpm(
+            dm,
+            "npm rebuild {}".format(" ".join(rebuild_names)),
+            working_dir,
+            metrics,
+            verbose,
+            show_progress,
+        )
+        if result != 0:
+            return result
+
+    with metrics.Phase("write_state"):
+        IncrementalInstall.WriteState(node_modules_dir, records, _TOOLCHAIN_KEY)
+        IncrementalInstall.RemoveCheckpoint(node_modules_dir)
+
+    return 0
+
+
+# ----------------------------------------------------------------------
+def _RunNpm(dm, command_line, working_dir, metrics, verbose, show_progress):
+    dm.stream.write("Running '{}'...".format(command_line))
+    with dm.stream.DoneManager() as this_dm, metrics.Phase(
+        "npm",
+        npm_command=" ".join(command_line.split()[:2]),
+    ):
+        # Output is streamed rather than buffered; only the last lines are retained so that
+        # they can be displayed if npm fails.
+        this_dm.result, lines = ProcessRunner.Run(
+            command_line,
+            cwd=working_dir,
+            output_stream=this_dm.stream if verbose else None,
+            progress_stream=this_dm.stream if show_progress and not verbose else None,
+        )
+
+        if this_dm.result != 0 and not verbose:
+            this_dm.stream.write("".join("{}\n".format(line) for line in lines))
+
+        return this_dm.result
+
+
+# ----------------------------------------------------------------------
+_resolved_regex                             = re.compile(r'("resolved"\s*:\s*")([^"]+)(")')
+
+def _CreateOfflineLockfile(source_filename, dest_filename, filenames):
+    """\
+    Writes a copy of the lockfile where each 'resolved' url is replaced with the tarball's
+    location in the tarball store. The lockfile is processed line by line so that it is
+    never loaded in its entirety.
+    """
+
+    # ----------------------------------------------------------------------
+    def Replace(match):
+        filename = filenames.get(match.group(2), None)
+        if filename is None:
+            return match.group(0)
+
+        return "{}file:{}{}".format(
+            match.group(1),
+            filename.replace("\\", "/"),
+            match.group(3),
+        )
+
+    # ----------------------------------------------------------------------
+
+    with open(source_filename, encoding="utf-8") as source:
+        with open(dest_filename, "w", encoding="utf-8") as dest:
+            for line in source:
+                dest.write(_resolved_regex.sub(Replace, line))
+
+
 # ----------------------------------------------------------------------
 # ----------------------------------------------------------------------
 # ----------------------------------------------------------------------
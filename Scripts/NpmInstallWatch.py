@@ -0,0 +1,320 @@
+# ----------------------------------------------------------------------
+# |
+# |  NpmInstallWatch.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 18:09:12
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Watches the 'package-lock.json' files of one or more projects and installs the project's
+packages (via NpmInstall.py) when the content of its lockfile changes.
+
+The process remains resident so that subsequent installs don't pay for process startup or
+imports, and the stores and caches used by the installs are shared across installs. Lockfiles
+are polled with a (cheap) stat check; a changed lockfile is only installed once it has been
+stable for the debounce period and its hash differs from that of the last successful install.
+Failed installs are retried with an increasing delay until an install succeeds or the lockfile
+changes again.
+"""
+
+import hashlib
+import os
+import sys
+import time
+
+import CommonEnvironment
+from CommonEnvironment import CommandLine
+from CommonEnvironment.StreamDecorator import StreamDecorator
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = CommonEnvironment.ThisFullpath()
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+from Impl.DirectoryCache import DirectoryCache
+from Impl.ManagedNpmCache import ManagedNpmCache
+from Impl.Metrics import Metrics
+from Impl.PackageStore import PackageStore
+from Impl.TarballStore import TarballStore
+
+import NpmInstall
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    working_dir=CommandLine.EntryPoint.Parameter("Directories that contain a 'package-lock.json' file; the current directory is used if no directories are provided"),
+    poll_interval_ms=CommandLine.EntryPoint.Parameter("Interval at which lockfiles are checked for changes"),
+    debounce_ms=CommandLine.EntryPoint.Parameter("Time that a lockfile must remain unchanged before it is installed"),
+    install_on_start=CommandLine.EntryPoint.Parameter("Install each project when the watch begins"),
+    full_install=CommandLine.EntryPoint.Parameter("Always run 'npm ci' rather than only installing the packages that changed since the last install"),
+    cache=CommandLine.EntryPoint.Parameter("Restore 'node_modules' from a snapshot keyed by the hash of 'package-lock.json' (and the Node version) when available"),
+    cache_dir=CommandLine.EntryPoint.Parameter("Directory that contains 'node_modules' snapshots"),
+    cache_max_size_mb=CommandLine.EntryPoint.Parameter("Maximum size of the snapshot cache; least recently used snapshots are evicted when this size is exceeded"),
+    npm_cache_dir=CommandLine.EntryPoint.Parameter("npm cache directory used by 'npm ci' (maintained by 'NpmCache.py')"),
+    tarball_store=CommandLine.EntryPoint.Parameter("Install offline using tarballs from this store (populated by 'NpmTarballStore.py Prefetch')"),
+    package_store=CommandLine.EntryPoint.Parameter("Populate 'node_modules' with hardlinks to packages in this global, deduplicated package store rather than running 'npm ci'"),
+    production=CommandLine.EntryPoint.Parameter("Only install the packages required at runtime (the closure of the project's production dependencies)"),
+)
+@CommandLine.Constraints(
+    working_dir=CommandLine.DirectoryTypeInfo(
+        arity="*",
+    ),
+    poll_interval_ms=CommandLine.IntTypeInfo(
+        min=10,
+        arity="?",
+    ),
+    debounce_ms=CommandLine.IntTypeInfo(
+        min=0,
+        arity="?",
+    ),
+    cache_dir=CommandLine.DirectoryTypeInfo(
+        ensure_exists=False,
+        arity="?",
+    ),
+    cache_max_size_mb=CommandLine.IntTypeInfo(
+        min=1,
+        arity="?",
+    ),
+    npm_cache_dir=CommandLine.DirectoryTypeInfo(
+        ensure_exists=False,
+        arity="?",
+    ),
+    tarball_store=CommandLine.DirectoryTypeInfo(
+        arity="?",
+    ),
+    package_store=CommandLine.DirectoryTypeInfo(
+        ensure_exists=False,
+        arity="?",
+    ),
+    output_stream=None,
+)
+def EntryPoint(
+    working_dir=None,
+    poll_interval_ms=500,
+    debounce_ms=1000,
+    install_on_start=False,
+    full_install=False,
+    cache=False,
+    cache_dir=NpmInstall.DEFAULT_CACHE_DIR,
+    cache_max_size_mb=4096,
+    npm_cache_dir=NpmInstall.DEFAULT_NPM_CACHE_DIR,
+    tarball_store=None,
+    package_store=None,
+    production=False,
+    output_stream=sys.stdout,
+    verbose=False,
+):
+    working_dirs = [os.path.realpath(directory) for directory in (working_dir or [os.getcwd()])]
+
+    # These objects are created once and shared by all installs
+    install_kwargs = {
+        "node_modules_cache": DirectoryCache(
+            cache_dir,
+            max_size=cache_max_size_mb * 1024 * 1024,
+        ) if cache else None,
+        "npm_cache": ManagedNpmCache(npm_cache_dir),
+        "tarball_store": TarballStore(tarball_store) if tarball_store else None,
+        "incremental": not full_install,
+        "package_store": PackageStore(package_store) if package_store else None,
+        "production": production,
+        "verbose": verbose,
+    }
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        projects = [_Project(directory) for directory in working_dirs]
+
+        if not install_on_start:
+            # The lockfiles as they exist now are considered to be installed
+            for project in projects:
+                project.installed_hash = project.CalculateHash()
+
+        dm.stream.write(
+            "Watching {} (Ctrl+C to stop)...\n".format(
+                ", ".join("'{}'".format(project.lockfile_filename) for project in projects),
+            ),
+        )
+
+        try:
+            while True:
+                now = time.perf_counter()
+
+                for project in projects:
+                    if project.Poll(now):
+                        continue
+
+                    # Wait until the lockfile has been stable for the debounce period, as
+                    # lockfiles are often rewritten multiple times in rapid succession (for
+                    # example, when switching branches or running 'npm install').
+                    if project.changed_time is None or now - project.changed_time < debounce_ms / 1000.0:
+                        continue
+
+                    if project.retry_time is not None and now < project.retry_time:
+                        continue
+
+                    project.changed_time = None
+
+                    current_hash = project.CalculateHash()
+                    if current_hash is None or current_hash == project.installed_hash:
+                        continue
+
+                    dm.stream.write(
+                        "\n[{}] '{}' {}...\n".format(
+                            time.strftime("%H:%M:%S"),
+                            project.lockfile_filename,
+                            "changed; installing" if project.retry_time is None else "failed to install; retrying",
+                        ),
+                    )
+
+                    start = time.perf_counter()
+
+                    try:
+                        result = NpmInstall.InstallProject(
+                            project.working_dir,
+                            dm.stream,
+                            metrics=Metrics("NpmInstallWatch"),
+                            **install_kwargs
+                        )
+                    except Exception as ex:
+                        dm.stream.write("ERROR: {}\n".format(ex))
+                        result = -1
+
+                    dm.stream.write(
+                        "[{}] {} in {:.1f} seconds.\n".format(
+                            time.strftime("%H:%M:%S"),
+                            "Installed" if result == 0 else "FAILED",
+                            time.perf_counter() - start,
+                        ),
+                    )
+
+                    if result == 0:
+                        project.installed_hash = current_hash
+                        project.ResetRetry()
+                    else:
+                        dm.stream.write(
+                            "The install will be retried in {:.0f} seconds (or when the lockfile changes).\n".format(
+                                project.ScheduleRetry(time.perf_counter()),
+                            ),
+                        )
+
+                time.sleep(poll_interval_ms / 1000.0)
+
+        except KeyboardInterrupt:
+            dm.stream.write("\nThe watch has ended.\n")
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+class _Project(object):
+    """Watch state for a single project"""
+
+    # Delays between attempts to install a lockfile that failed to install; the delay doubles
+    # with each failure.
+    INITIAL_RETRY_DELAY                     = 5.0
+    MAX_RETRY_DELAY                         = 300.0
+
+    # ----------------------------------------------------------------------
+    def __init__(self, working_dir):
+        self.working_dir                    = working_dir
+        self.lockfile_filename              = os.path.join(working_dir, "package-lock.json")
+
+        self.installed_hash                 = None
+
+        # Time at which the most recent change was detected (or None if there are no pending
+        # changes). A project with an install pending on start is considered to have changed.
+        self.changed_time                   = 0.0
+
+        # Time before which a failed install isn't retried (or None if the last install didn't fail)
+        self.retry_time                     = None
+
+        self._retry_delay                   = self.INITIAL_RETRY_DELAY
+        self._stat                          = self._GetStat()
+
+    # ----------------------------------------------------------------------
+    def Poll(self, now):
+        """Returns True if the lockfile changed since the last poll"""
+
+        stat = self._GetStat()
+        if stat == self._stat:
+            return False
+
+        self._stat = stat
+        self.changed_time = now
+
+        # Changes are installed immediately (once they are stable), regardless of earlier failures
+        self.ResetRetry()
+
+        return True
+
+    # ----------------------------------------------------------------------
+    def ScheduleRetry(self, now):
+        """Keeps the change pending after a failed install; returns the delay before the retry"""
+
+        delay = self._retry_delay
+
+        self.changed_time = now
+        self.retry_time = now + delay
+        self._retry_delay = min(delay * 2, self.MAX_RETRY_DELAY)
+
+        return delay
+
+    # ----------------------------------------------------------------------
+    def ResetRetry(self):
+        self.retry_time = None
+        self._retry_delay = self.INITIAL_RETRY_DELAY
+
+    # ----------------------------------------------------------------------
+    def CalculateHash(self):
+        """Returns the hash of the lockfile or None if it doesn't exist"""
+
+        hasher = hashlib.sha256()
+
+        try:
+            with open(self.lockfile_filename, "rb") as f:
+                while True:
+                    content = f.read(1024 * 1024)
+                    if not content:
+                        break
+
+                    hasher.update(content)
+
+        except (IOError, OSError):
+            return None
+
+        return hasher.hexdigest()
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _GetStat(self):
+        try:
+            result = os.stat(self.lockfile_filename)
+        except (IOError, OSError):
+            return None
+
+        return (result.st_size, result.st_mtime_ns, result.st_ino)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(
+            CommandLine.Main()
+        )
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,450 @@
+# ----------------------------------------------------------------------
+# |
+# |  NpmIntegrityAudit.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 21:08:55
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Verifies that the packages installed in 'node_modules' match the 'integrity' values in
+'package-lock.json' without reinstalling them.
+
+The tarball of each package (from the tarball store or the npm cache) is verified against its
+integrity value and its content is compared with the installed files across a pool of
+processes. Results are cached per package and are reused until a file in the package is
+added, removed, or modified. Packages that differ can be repaired by extracting them from
+their tarballs again; packages whose files are hardlinked to a shared copy (in the package store
+or a 'node_modules' snapshot) are reported, as repairing the project doesn't repair that copy.
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+import textwrap
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import CommonEnvironment
+from CommonEnvironment import CommandLine
+from CommonEnvironment.StreamDecorator import StreamDecorator
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = CommonEnvironment.ThisFullpath()
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+from Impl.LockfileReader import ReadLockfile
+from Impl.ManagedNpmCache import ManagedNpmCache
+from Impl.PackageAuditor import AuditPackage, GetFingerprint, STATUS_CORRUPT_TARBALL, STATUS_DIFFERS, STATUS_MATCHES
+from Impl.PackageExtractor import ExtractPackage, RequiresRebuild
+from Impl.PackageStore import PackageStore
+from Impl import ProcessRunner
+from Impl.TarballStore import IntegrityException, TarballStore
+
+from NpmCache import DEFAULT_CACHE_DIR as DEFAULT_NPM_CACHE_DIR
+from NpmTarballStore import DEFAULT_STORE_DIR as DEFAULT_TARBALL_STORE_DIR
+
+# ----------------------------------------------------------------------
+AUDIT_CACHE_FILENAME                        = ".npm_integrity_audit.json"
+AUDIT_CACHE_FORMAT_VERSION                  = 1
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    working_dir=CommandLine.EntryPoint.Parameter("Directory that contains 'package-lock.json' and 'node_modules'"),
+    tarball_store=CommandLine.EntryPoint.Parameter("Tarball store searched for package tarballs"),
+    npm_cache_dir=CommandLine.EntryPoint.Parameter("npm cache searched for package tarballs that aren't in the tarball store"),
+    repair=CommandLine.EntryPoint.Parameter("Extract the packages that differ from their tarballs again"),
+    no_cache=CommandLine.EntryPoint.Parameter("Audit every package, ignoring the results of previous audits"),
+    jobs=CommandLine.EntryPoint.Parameter("Number of processes used to compare packages"),
+    verbose=CommandLine.EntryPoint.Parameter("Display the files that differ and the packages that couldn't be audited"),
+)
+@CommandLine.Constraints(
+    working_dir=CommandLine.DirectoryTypeInfo(
+        arity="?",
+    ),
+    tarball_store=CommandLine.DirectoryTypeInfo(
+        ensure_exists=False,
+        arity="?",
+    ),
+    npm_cache_dir=CommandLine.DirectoryTypeInfo(
+        ensure_exists=False,
+        arity="?",
+    ),
+    jobs=CommandLine.IntTypeInfo(
+        min=1,
+        arity="?",
+    ),
+    output_stream=None,
+)
+def EntryPoint(
+    working_dir=None,
+    tarball_store=DEFAULT_TARBALL_STORE_DIR,
+    npm_cache_dir=DEFAULT_NPM_CACHE_DIR,
+    repair=False,
+    no_cache=False,
+    jobs=multiprocessing.cpu_count(),
+    output_stream=sys.stdout,
+    verbose=False,
+):
+    working_dir = working_dir or os.getcwd()
+
+    lockfile_filename = os.path.join(working_dir, "package-lock.json")
+    node_modules_dir = os.path.join(working_dir, "node_modules")
+
+    tarball_store = TarballStore(tarball_store)
+    npm_cache = ManagedNpmCache(npm_cache_dir)
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        if not os.path.isfile(lockfile_filename):
+            dm.stream.write("ERROR: '{}' does not exist.\n".format(lockfile_filename))
+            dm.result = -1
+
+            return dm.result
+
+        if not os.path.isdir(node_modules_dir):
+            dm.stream.write("ERROR: '{}' does not exist.\n".format(node_modules_dir))
+            dm.result = -1
+
+            return dm.result
+
+        dm.stream.write("Reading 'package-lock.json'...")
+        with dm.stream.DoneManager() as this_dm:
+            lockfile = ReadLockfile(lockfile_filename)
+
+            if lockfile.packages is None:
+                this_dm.stream.write("ERROR: 'dependencies' or 'packages' was not found.\n")
+                this_dm.result = -1
+
+                return this_dm.result
+
+            records = [record for record in lockfile.packages if record.integrity]
+
+        dm.stream.write("Fingerprinting packages...")
+        with dm.stream.DoneManager():
+            # Fingerprinting is dominated by file system calls, which release the GIL
+            with ThreadPoolExecutor(max_workers=jobs * 2) as executor:
+                fingerprints = list(
+                    executor.map(
+                        lambda record: GetFingerprint(os.path.join(working_dir, *record.path.split("/"))),
+                        records,
+                    ),
+                )
+
+        audit_cache = {} if no_cache else _ReadAuditCache(node_modules_dir)
+
+        results = {}                        # path -> (status, differences)
+
+        not_installed = []
+        unverifiable = []
+        pending = []                        # [(record, tarball filename), ...]
+
+        for record, fingerprint in zip(records, fingerprints):
+            if fingerprint is None:
+                not_installed.append(record)
+                continue
+
+            cached = audit_cache.get(record.path, None)
+            if cached is not None and cached[:2] == [record.integrity, fingerprint]:
+                results[record.path] = (cached[2], [tuple(difference) for difference in cached[3]])
+                continue
+
+            tarball_filename = _FindTarball(record, tarball_store, npm_cache)
+            if tarball_filename is None:
+                unverifiable.append(record)
+                continue
+
+            pending.append((record, tarball_filename))
+
+        dm.stream.write(
+            "Auditing {} packages ({} cached results)...".format(len(pending), len(results)),
+        )
+        with dm.stream.DoneManager():
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                pending_results = list(
+                    executor.map(
+                        AuditPackage,
+                        [os.path.join(working_dir, *record.path.split("/")) for record, _ in pending],
+                        [tarball_filename for _, tarball_filename in pending],
+                        [record.integrity for record, _ in pending],
+                        chunksize=16,
+                    ),
+                )
+
+            for (record, _), result in zip(pending, pending_results):
+                results[record.path] = result
+
+        fingerprints_by_path = {record.path: fingerprint for record, fingerprint in zip(records, fingerprints)}
+        records_by_path = {record.path: record for record in records}
+
+        differing = []
+        corrupt_tarballs = []
+
+        for path, (status, differences) in results.items():
+            if status == STATUS_DIFFERS:
+                differing.append((records_by_path[path], differences))
+            elif status == STATUS_CORRUPT_TARBALL:
+                corrupt_tarballs.append(records_by_path[path])
+
+        differing.sort(key=lambda item: item[0].path)
+        corrupt_tarballs.sort(key=lambda record: record.path)
+
+        if differing:
+            dm.stream.write("\n{} packages differ from their tarballs:\n\n".format(len(differing)))
+
+            for record, differences in differing:
+                dm.stream.write(
+                    "    {}@{} [{}]: {} files modified, {} missing\n".format(
+                        record.name,
+                        record.version,
+                        record.path,
+                        sum(1 for _, kind in differences if kind == "modified"),
+                        sum(1 for _, kind in differences if kind == "missing"),
+                    ),
+                )
+
+                if verbose:
+                    for filename, kind in differences:
+                        dm.stream.write("        {}: {}\n".format(kind, filename))
+
+        # Modified files that are hardlinked were modified in every copy that shares them;
+        # this must be determined before the packages are repaired (which breaks the links).
+        linked = [
+            record
+            for record, differences in differing
+            if _IsLinked(os.path.join(working_dir, *record.path.split("/")), differences)
+        ]
+
+        if linked:
+            package_store = _GetPackageStore(node_modules_dir)
+
+            dm.stream.write(
+                textwrap.dedent(
+                    """\
+
+                    {} packages that differ share files (via hardlinks) with copies in {}.
+                    Those copies were modified as well and aren't repaired by '/repair'; remove them
+                    so that they are created again by the next install:
+
+                    """,
+                ).format(
+                    len(linked),
+                    "the package store '{}'".format(package_store.Root) if package_store else "the package store or a 'node_modules' snapshot",
+                ),
+            )
+
+            for record in linked:
+                entry_dir = package_store.GetEntryDir(record.integrity) if package_store else None
+
+                dm.stream.write(
+                    "    {}@{} [{}]{}\n".format(
+                        record.name,
+                        record.version,
+                        record.path,
+                        ": {}".format(entry_dir) if entry_dir and os.path.isdir(entry_dir) else "",
+                    ),
+                )
+
+        if corrupt_tarballs:
+            dm.stream.write(
+                "\n{} tarballs don't match their integrity values (the packages weren't audited):\n\n".format(
+                    len(corrupt_tarballs),
+                ),
+            )
+
+            for record in corrupt_tarballs:
+                dm.stream.write(
+                    "    {}@{}: {}\n".format(
+                        record.name,
+                        record.version,
+                        _FindTarball(record, tarball_store, npm_cache),
+                    ),
+                )
+
+        if verbose:
+            for title, these_records in [
+                ("not installed", not_installed),
+                ("could not be audited, as their tarballs were not found", unverifiable),
+            ]:
+                if not these_records:
+                    continue
+
+                dm.stream.write("\n{} packages {}:\n\n".format(len(these_records), title))
+
+                for record in these_records:
+                    dm.stream.write("    {}@{} [{}]\n".format(record.name, record.version, record.path))
+
+        repaired_paths = set()
+
+        if differing and repair:
+            dm.stream.write("\nRepairing packages...")
+            with dm.stream.DoneManager() as this_dm:
+                rebuild_names = set()
+
+                for record, _ in differing:
+                    package_dir = os.path.join(working_dir, *record.path.split("/"))
+
+                    ExtractPackage(_FindTarball(record, tarball_store, npm_cache), package_dir)
+                    repaired_paths.add(record.path)
+
+                    if RequiresRebuild(package_dir):
+                        rebuild_names.add(record.name)
+
+                this_dm.stream.write("{} packages extracted.\n".format(len(repaired_paths)))
+
+                if rebuild_names:
+                    command_line = "npm rebuild {}".format(" ".join(sorted(rebuild_names)))
+
+                    this_dm.stream.write("Running '{}'...".format(command_line))
+                    with this_dm.stream.DoneManager() as rebuild_dm:
+                        rebuild_dm.result, lines = ProcessRunner.Run(
+                            command_line,
+                            cwd=working_dir,
+                            output_stream=rebuild_dm.stream if verbose else None,
+                        )
+
+                        if rebuild_dm.result != 0:
+                            if not verbose:
+                                rebuild_dm.stream.write("".join("{}\n".format(line) for line in lines))
+
+                            this_dm.result = rebuild_dm.result
+                            dm.result = rebuild_dm.result
+
+        # Repaired packages are audited again the next time, as their fingerprints have changed.
+        # Corrupt tarballs are never cached, as the tarball (rather than the package) may be
+        # replaced.
+        _WriteAuditCache(
+            node_modules_dir,
+            {
+                path: [records_by_path[path].integrity, fingerprints_by_path[path], status, differences]
+                for path, (status, differences) in results.items()
+                if path not in repaired_paths and status in [STATUS_MATCHES, STATUS_DIFFERS]
+            },
+        )
+
+        dm.stream.write(
+            "\n{} packages match, {} differ{}, {} corrupt tarballs, {} not audited, {} not installed.\n".format(
+                len(results) - len(differing) - len(corrupt_tarballs),
+                len(differing),
+                " ({} repaired)".format(len(repaired_paths)) if repair else "",
+                len(corrupt_tarballs),
+                len(unverifiable),
+                len(not_installed),
+            ),
+        )
+
+        if (differing and not repair) or corrupt_tarballs or linked:
+            if differing and not repair:
+                dm.stream.write("\nRun with '/repair' to extract the packages that differ from their tarballs again.\n")
+
+            if dm.result == 0:
+                dm.result = -1
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _FindTarball(record, tarball_store, npm_cache):
+    try:
+        for filename in [
+            tarball_store.GetFilename(record.integrity),
+            npm_cache.GetContentFilename(record.integrity),
+        ]:
+            if os.path.isfile(filename):
+                return filename
+
+    except IntegrityException:
+        pass
+
+    return None
+
+
+# ----------------------------------------------------------------------
+def _IsLinked(package_dir, differences):
+    for filename, kind in differences:
+        if kind != "modified":
+            continue
+
+        try:
+            if os.stat(os.path.join(package_dir, *filename.split("/"))).st_nlink > 1:
+                return True
+        except OSError:
+            pass
+
+    return False
+
+
+# ----------------------------------------------------------------------
+def _GetPackageStore(node_modules_dir):
+    """Returns the PackageStore used to install the project (or None)"""
+
+    try:
+        with open(os.path.join(node_modules_dir, PackageStore.REFERENCES_FILENAME)) as f:
+            store = json.load(f)["store"]
+    except (IOError, ValueError, KeyError):
+        return None
+
+    if not os.path.isdir(store):
+        return None
+
+    return PackageStore(store)
+
+
+# ----------------------------------------------------------------------
+def _ReadAuditCache(node_modules_dir):
+    filename = os.path.join(node_modules_dir, AUDIT_CACHE_FILENAME)
+    if not os.path.isfile(filename):
+        return {}
+
+    try:
+        with open(filename) as f:
+            content = json.load(f)
+    except ValueError:
+        return {}
+
+    if content.get("format_version", None) != AUDIT_CACHE_FORMAT_VERSION:
+        return {}
+
+    return content["packages"]
+
+
+# ----------------------------------------------------------------------
+def _WriteAuditCache(node_modules_dir, packages):
+    temp_filename = os.path.join(node_modules_dir, AUDIT_CACHE_FILENAME + ".tmp")
+
+    with open(temp_filename, "w") as f:
+        json.dump(
+            {
+                "format_version": AUDIT_CACHE_FORMAT_VERSION,
+                "packages": packages,
+            },
+            f,
+        )
+
+    os.replace(temp_filename, os.path.join(node_modules_dir, AUDIT_CACHE_FILENAME))
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(
+            CommandLine.Main()
+        )
+    except KeyboardInterrupt:
+        pass
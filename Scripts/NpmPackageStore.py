@@ -0,0 +1,134 @@
+# ----------------------------------------------------------------------
+# |
+# |  NpmPackageStore.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 12:58:10
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Maintains the global, deduplicated package store that NpmInstall.py links 'node_modules'
+directories to (see NpmInstall's 'package_store' parameter).
+"""
+
+import os
+import sys
+
+import CommonEnvironment
+from CommonEnvironment import CommandLine
+from CommonEnvironment.StreamDecorator import StreamDecorator
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = CommonEnvironment.ThisFullpath()
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+from Impl.PackageStore import PackageStore
+
+# ----------------------------------------------------------------------
+DEFAULT_STORE_DIR                           = os.path.join(os.path.dirname(_script_dir), "Generated", "PackageStore")
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    store_dir=CommandLine.EntryPoint.Parameter("Root of the package store"),
+    dry_run=CommandLine.EntryPoint.Parameter("Display the entries that would be removed without removing them"),
+)
+@CommandLine.Constraints(
+    store_dir=CommandLine.DirectoryTypeInfo(
+        arity="?",
+    ),
+    output_stream=None,
+)
+def GarbageCollect(
+    store_dir=DEFAULT_STORE_DIR,
+    dry_run=False,
+    output_stream=sys.stdout,
+):
+    """Removes packages that are no longer referenced by any 'node_modules' directory installed from the store"""
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        dm.stream.write("Collecting unreferenced packages...")
+        with dm.stream.DoneManager() as this_dm:
+            num_removed, bytes_freed = PackageStore(store_dir).GarbageCollect(
+                dry_run=dry_run,
+            )
+
+            this_dm.stream.write(
+                "{} {} packages ({:.1f} MB).\n".format(
+                    "Would remove" if dry_run else "Removed",
+                    num_removed,
+                    bytes_freed / (1024.0 * 1024.0),
+                ),
+            )
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    store_dir=CommandLine.EntryPoint.Parameter("Root of the package store"),
+)
+@CommandLine.Constraints(
+    store_dir=CommandLine.DirectoryTypeInfo(
+        arity="?",
+    ),
+    output_stream=None,
+)
+def Statistics(
+    store_dir=DEFAULT_STORE_DIR,
+    output_stream=sys.stdout,
+):
+    """Displays the number and size of referenced and unreferenced packages in the store"""
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        dm.stream.write("Calculating statistics...")
+        with dm.stream.DoneManager() as this_dm:
+            referenced = [0, 0]
+            unreferenced = [0, 0]
+
+            for _, is_referenced, size in PackageStore(store_dir).EnumEntryInfo():
+                info = referenced if is_referenced else unreferenced
+
+                info[0] += 1
+                info[1] += size
+
+            for desc, (count, size) in [
+                ("Referenced", referenced),
+                ("Unreferenced", unreferenced),
+            ]:
+                this_dm.stream.write(
+                    "{:<14} {:>8} packages  {:>10.1f} MB\n".format(
+                        desc,
+                        count,
+                        size / (1024.0 * 1024.0),
+                    ),
+                )
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(
+            CommandLine.Main()
+        )
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,270 @@
+# ----------------------------------------------------------------------
+# |
+# |  NpmScaffold.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 17:31:46
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Creates new projects from the 'Templates' directory.
+
+'node_modules' is restored (via hardlinks when possible) from a snapshot keyed by the hash of
+the template's 'package-lock.json' file (and the Node version) rather than installed with
+'npm ci'. The snapshot is built the first time that a project is created (or explicitly via
+'BuildSnapshot') and is stored in the same cache used by 'NpmInstall.py /cache'.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import CommonEnvironment
+from CommonEnvironment import CommandLine
+from CommonEnvironment.StreamDecorator import StreamDecorator
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = CommonEnvironment.ThisFullpath()
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+from Impl.DirectoryCache import DirectoryCache
+from Impl.ManagedNpmCache import ManagedNpmCache
+
+import NpmInstall
+
+# ----------------------------------------------------------------------
+DEFAULT_TEMPLATE_DIR                        = os.path.join(os.path.dirname(_script_dir), "Templates")
+
+# Files required to install a template's packages
+_INSTALL_FILENAMES                          = ["package.json", "package-lock.json"]
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    output_dir=CommandLine.EntryPoint.Parameter("Directory of the new project"),
+    template_dir=CommandLine.EntryPoint.Parameter("Template to create the project from"),
+    cache_dir=CommandLine.EntryPoint.Parameter("Directory that contains 'node_modules' snapshots"),
+    npm_cache_dir=CommandLine.EntryPoint.Parameter("npm cache directory used by 'npm ci' (maintained by 'NpmCache.py')"),
+    force=CommandLine.EntryPoint.Parameter("Create the project even if the output directory isn't empty"),
+)
+@CommandLine.Constraints(
+    output_dir=CommandLine.DirectoryTypeInfo(
+        ensure_exists=False,
+    ),
+    template_dir=CommandLine.DirectoryTypeInfo(
+        arity="?",
+    ),
+    cache_dir=CommandLine.DirectoryTypeInfo(
+        ensure_exists=False,
+        arity="?",
+    ),
+    npm_cache_dir=CommandLine.DirectoryTypeInfo(
+        ensure_exists=False,
+        arity="?",
+    ),
+    output_stream=None,
+)
+def CreateProject(
+    output_dir,
+    template_dir=DEFAULT_TEMPLATE_DIR,
+    cache_dir=NpmInstall.DEFAULT_CACHE_DIR,
+    npm_cache_dir=NpmInstall.DEFAULT_NPM_CACHE_DIR,
+    force=False,
+    output_stream=sys.stdout,
+    verbose=False,
+):
+    """Creates a new project based on a template"""
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        start = time.perf_counter()
+
+        if os.path.isdir(output_dir) and os.listdir(output_dir) and not force:
+            dm.stream.write(
+                "ERROR: '{}' is not empty; use '/force' to create the project anyway.\n".format(output_dir),
+            )
+            dm.result = -1
+
+            return dm.result
+
+        dm.stream.write("Copying the template...")
+        with dm.stream.DoneManager():
+            _CopyTemplate(template_dir, output_dir)
+
+        node_modules_cache = DirectoryCache(cache_dir)
+        cache_key = NpmInstall.GetCacheKey(os.path.join(template_dir, "package-lock.json"))
+
+        node_modules_dir = os.path.join(output_dir, "node_modules")
+
+        dm.stream.write("Restoring 'node_modules' from the snapshot...")
+        with dm.stream.DoneManager() as this_dm:
+            if os.path.isdir(node_modules_dir):
+                shutil.rmtree(node_modules_dir)
+
+            # The files are copied rather than linked, as the project's packages may be modified
+            # (patched or rebuilt) and those changes must not modify the snapshot.
+            is_restored = node_modules_cache.Restore(
+                cache_key,
+                node_modules_dir,
+                use_links=False,
+            )
+
+            this_dm.stream.write("{} ({}).\n".format("Restored" if is_restored else "Not found", cache_key))
+
+        if not is_restored:
+            # Install the packages; the installation populates the snapshot used by the
+            # projects that follow.
+            dm.stream.write("Installing packages and building the snapshot...")
+            with dm.stream.DoneManager() as this_dm:
+                this_dm.result = NpmInstall.InstallProject(
+                    output_dir,
+                    this_dm.stream,
+                    node_modules_cache=node_modules_cache,
+                    npm_cache=ManagedNpmCache(npm_cache_dir),
+                    verbose=verbose,
+                )
+
+                if this_dm.result != 0:
+                    return this_dm.result
+
+        dm.stream.write(
+            "\n'{}' was created in {:.1f} seconds.\n".format(output_dir, time.perf_counter() - start),
+        )
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    template_dir=CommandLine.EntryPoint.Parameter("Template to build the snapshot for"),
+    cache_dir=CommandLine.EntryPoint.Parameter("Directory that contains 'node_modules' snapshots"),
+    npm_cache_dir=CommandLine.EntryPoint.Parameter("npm cache directory used by 'npm ci' (maintained by 'NpmCache.py')"),
+    force=CommandLine.EntryPoint.Parameter("Rebuild the snapshot even if it already exists"),
+)
+@CommandLine.Constraints(
+    template_dir=CommandLine.DirectoryTypeInfo(
+        arity="?",
+    ),
+    cache_dir=CommandLine.DirectoryTypeInfo(
+        ensure_exists=False,
+        arity="?",
+    ),
+    npm_cache_dir=CommandLine.DirectoryTypeInfo(
+        ensure_exists=False,
+        arity="?",
+    ),
+    output_stream=None,
+)
+def BuildSnapshot(
+    template_dir=DEFAULT_TEMPLATE_DIR,
+    cache_dir=NpmInstall.DEFAULT_CACHE_DIR,
+    npm_cache_dir=NpmInstall.DEFAULT_NPM_CACHE_DIR,
+    force=False,
+    output_stream=sys.stdout,
+    verbose=False,
+):
+    """Builds the 'node_modules' snapshot for a template (if necessary)"""
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        node_modules_cache = DirectoryCache(cache_dir)
+        cache_key = NpmInstall.GetCacheKey(os.path.join(template_dir, "package-lock.json"))
+
+        if node_modules_cache.Contains(cache_key):
+            if not force:
+                dm.stream.write("The snapshot is up to date ({}).\n".format(cache_key))
+                return dm.result
+
+            node_modules_cache.Remove(cache_key)
+
+        # Install in a temporary directory so that the template itself isn't modified
+        temp_dir = tempfile.mkdtemp()
+
+        try:
+            for filename in _INSTALL_FILENAMES:
+                shutil.copy2(os.path.join(template_dir, filename), temp_dir)
+
+            dm.stream.write("Installing packages and building the snapshot...")
+            with dm.stream.DoneManager() as this_dm:
+                this_dm.result = NpmInstall.InstallProject(
+                    temp_dir,
+                    this_dm.stream,
+                    node_modules_cache=node_modules_cache,
+                    npm_cache=ManagedNpmCache(npm_cache_dir),
+                    verbose=verbose,
+                )
+
+        finally:
+            shutil.rmtree(temp_dir)
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _CopyTemplate(template_dir, output_dir):
+    # Content that is ignored by the template's '.gitignore' file (installed packages, build
+    # output, etc.) isn't part of the template.
+    ignore_patterns = []
+
+    gitignore_filename = os.path.join(template_dir, ".gitignore")
+    if os.path.isfile(gitignore_filename):
+        with open(gitignore_filename) as f:
+            for line in f.readlines():
+                line = line.strip().rstrip("/")
+                if line and not line.startswith("#"):
+                    ignore_patterns.append(line)
+
+    ignore_func = shutil.ignore_patterns(*ignore_patterns)
+
+    # shutil.copytree requires that the destination doesn't exist prior to python 3.8
+    pending = [(template_dir, output_dir)]
+
+    while pending:
+        source_dir, dest_dir = pending.pop()
+
+        if not os.path.isdir(dest_dir):
+            os.makedirs(dest_dir)
+
+        names = os.listdir(source_dir)
+        ignored_names = ignore_func(source_dir, names)
+
+        for name in names:
+            if name in ignored_names:
+                continue
+
+            source = os.path.join(source_dir, name)
+            dest = os.path.join(dest_dir, name)
+
+            if os.path.isdir(source) and not os.path.islink(source):
+                pending.append((source, dest))
+            else:
+                shutil.copy2(source, dest, follow_symlinks=False)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(
+            CommandLine.Main()
+        )
+    except KeyboardInterrupt:
+        pass
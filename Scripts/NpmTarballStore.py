@@ -0,0 +1,212 @@
+# ----------------------------------------------------------------------
+# |
+# |  NpmTarballStore.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 10:57:21
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Populates and verifies a local, content-addressed store of package tarballs so that
+NpmInstall.py can install packages without network access (see NpmInstall's
+'tarball_store' parameter).
+"""
+
+import multiprocessing
+import os
+import sys
+import threading
+
+import CommonEnvironment
+from CommonEnvironment import CommandLine
+from CommonEnvironment.StreamDecorator import StreamDecorator
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = CommonEnvironment.ThisFullpath()
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+from Impl.LockfileReader import ReadLockfile
+from Impl.NpmConfig import NpmConfig
+from Impl.TarballStore import TarballStore
+
+# ----------------------------------------------------------------------
+DEFAULT_STORE_DIR                           = os.path.join(os.path.dirname(_script_dir), "Generated", "TarballStore")
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    working_dir=CommandLine.EntryPoint.Parameter("Directories that contain a 'package-lock.json' file"),
+    store_dir=CommandLine.EntryPoint.Parameter("Root of the tarball store"),
+    registry=CommandLine.EntryPoint.Parameter("Registry url or local directory used in place of the registry in each package's 'resolved' url"),
+    download_jobs=CommandLine.EntryPoint.Parameter("Number of concurrent downloads"),
+    verify_jobs=CommandLine.EntryPoint.Parameter("Number of processes used to verify integrity"),
+)
+@CommandLine.Constraints(
+    working_dir=CommandLine.DirectoryTypeInfo(
+        arity="+",
+    ),
+    store_dir=CommandLine.DirectoryTypeInfo(
+        ensure_exists=False,
+        arity="?",
+    ),
+    registry=CommandLine.StringTypeInfo(
+        arity="?",
+    ),
+    download_jobs=CommandLine.IntTypeInfo(
+        min=1,
+        arity="?",
+    ),
+    verify_jobs=CommandLine.IntTypeInfo(
+        min=1,
+        arity="?",
+    ),
+    output_stream=None,
+)
+def Prefetch(
+    working_dir,
+    store_dir=DEFAULT_STORE_DIR,
+    registry=None,
+    download_jobs=16,
+    verify_jobs=multiprocessing.cpu_count(),
+    output_stream=sys.stdout,
+    verbose=False,
+):
+    """Downloads and verifies the tarballs referenced by one or more lockfiles"""
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        records = []
+        records_by_dir = []
+        integrities = set()
+
+        dm.stream.write("Reading lockfiles...")
+        with dm.stream.DoneManager() as this_dm:
+            for directory in working_dir:
+                lockfile_filename = os.path.join(directory, "package-lock.json")
+
+                if not os.path.isfile(lockfile_filename):
+                    this_dm.stream.write("ERROR: '{}' does not exist.\n".format(lockfile_filename))
+                    this_dm.result = -1
+
+                    return this_dm.result
+
+                lockfile = ReadLockfile(lockfile_filename)
+                records += lockfile.packages or []
+                records_by_dir.append(
+                    (
+                        directory,
+                        [record for record in lockfile.packages or [] if record.integrity not in integrities],
+                    ),
+                )
+
+                integrities.update(record.integrity for record in lockfile.packages or [])
+
+        dm.stream.write("Prefetching tarballs...")
+        with dm.stream.DoneManager() as this_dm:
+            output_lock = threading.Lock()
+
+            # ----------------------------------------------------------------------
+            def OnProgress(record, exception):
+                if exception is None and not verbose:
+                    return
+
+                with output_lock:
+                    if exception is None:
+                        this_dm.stream.write("{}@{}\n".format(record.name, record.version))
+                    else:
+                        this_dm.stream.write(
+                            "ERROR: {}@{}: {}\n".format(record.name, record.version, exception),
+                        )
+
+            # ----------------------------------------------------------------------
+
+            errors = []
+
+            # Packages are downloaded with the settings in the '.npmrc' of the first project that
+            # references them.
+            for directory, directory_records in records_by_dir:
+                errors += TarballStore(store_dir, NpmConfig.Load(directory)).Prefetch(
+                    directory_records,
+                    registry=registry,
+                    download_jobs=download_jobs,
+                    verify_jobs=verify_jobs,
+                    on_progress=OnProgress,
+                )
+
+            if errors:
+                this_dm.result = -1
+
+            this_dm.stream.write(
+                "{} packages referenced, {} failed.\n".format(len(records), len(errors)),
+            )
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    store_dir=CommandLine.EntryPoint.Parameter("Root of the tarball store"),
+    jobs=CommandLine.EntryPoint.Parameter("Number of processes used to verify integrity"),
+    remove_corrupt=CommandLine.EntryPoint.Parameter("Remove tarballs that fail verification"),
+)
+@CommandLine.Constraints(
+    store_dir=CommandLine.DirectoryTypeInfo(
+        arity="?",
+    ),
+    jobs=CommandLine.IntTypeInfo(
+        min=1,
+        arity="?",
+    ),
+    output_stream=None,
+)
+def Verify(
+    store_dir=DEFAULT_STORE_DIR,
+    jobs=multiprocessing.cpu_count(),
+    remove_corrupt=False,
+    output_stream=sys.stdout,
+):
+    """Verifies the integrity of every tarball in the store"""
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        dm.stream.write("Verifying tarballs...")
+        with dm.stream.DoneManager() as this_dm:
+            corrupt_filenames = TarballStore(store_dir).Verify(
+                jobs=jobs,
+            )
+
+            for filename in corrupt_filenames:
+                this_dm.stream.write("CORRUPT: {}\n".format(filename))
+
+                if remove_corrupt:
+                    os.remove(filename)
+
+            if corrupt_filenames and not remove_corrupt:
+                this_dm.result = -1
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(
+            CommandLine.Main()
+        )
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,228 @@
+# ----------------------------------------------------------------------
+# |
+# |  SnowpackBuild.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 17:52:30
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Builds projects created from 'Templates' ('npm run build'), restoring the build output from a
+cache when none of the build's inputs have changed.
+
+The cache key is based on the content (and relative paths) of the project's sources and
+configuration files, its lockfile, and the Node version.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import CommonEnvironment
+from CommonEnvironment import CommandLine
+from CommonEnvironment import FileSystem
+from CommonEnvironment.StreamDecorator import StreamDecorator
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = CommonEnvironment.ThisFullpath()
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+from Impl.DirectoryCache import DirectoryCache
+from Impl import ProcessRunner
+
+# ----------------------------------------------------------------------
+DEFAULT_CACHE_DIR                           = os.path.join(os.path.dirname(_script_dir), "Generated", "BuildCache")
+
+# Directories whose content is an input to the build
+INPUT_DIRS                                  = ["src", "public", "types"]
+
+# Files that are inputs to the build (if they exist)
+INPUT_FILENAMES                             = [
+    "package.json",
+    "package-lock.json",
+    "snowpack.config.js",
+    "svelte.config.js",
+    "tailwind.config.js",
+    "postcss.config.js",
+    "tsconfig.json",
+    "babel.config.json",
+    ".babelrc",
+]
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    working_dir=CommandLine.EntryPoint.Parameter("Directory of the project to build"),
+    output_dir=CommandLine.EntryPoint.Parameter("Name of the directory (relative to the project) that contains the build output"),
+    no_cache=CommandLine.EntryPoint.Parameter("Always build, without reading from or writing to the cache"),
+    cache_dir=CommandLine.EntryPoint.Parameter("Directory that contains cached build output"),
+    cache_max_size_mb=CommandLine.EntryPoint.Parameter("Maximum size of the cache; least recently used build output is evicted when this size is exceeded"),
+)
+@CommandLine.Constraints(
+    working_dir=CommandLine.DirectoryTypeInfo(
+        arity="?",
+    ),
+    output_dir=CommandLine.StringTypeInfo(
+        arity="?",
+    ),
+    cache_dir=CommandLine.DirectoryTypeInfo(
+        ensure_exists=False,
+        arity="?",
+    ),
+    cache_max_size_mb=CommandLine.IntTypeInfo(
+        min=1,
+        arity="?",
+    ),
+    output_stream=None,
+)
+def EntryPoint(
+    working_dir=None,
+    output_dir="build",
+    no_cache=False,
+    cache_dir=DEFAULT_CACHE_DIR,
+    cache_max_size_mb=1024,
+    output_stream=sys.stdout,
+    verbose=False,
+):
+    working_dir = working_dir or os.getcwd()
+    output_dir = os.path.join(working_dir, output_dir)
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        start = time.perf_counter()
+
+        if no_cache:
+            build_cache = None
+        else:
+            build_cache = DirectoryCache(
+                cache_dir,
+                max_size=cache_max_size_mb * 1024 * 1024,
+            )
+
+            dm.stream.write("Calculating the fingerprint...")
+            with dm.stream.DoneManager() as this_dm:
+                node_version = _GetNodeVersion()
+                if node_version is None:
+                    this_dm.stream.write("ERROR: The Node version could not be determined.\n")
+                    this_dm.result = -1
+
+                    return this_dm.result
+
+                cache_key = CreateFingerprint(working_dir, node_version)
+
+            dm.stream.write("Restoring '{}' from the cache...".format(output_dir))
+            with dm.stream.DoneManager() as this_dm:
+                is_restored = False
+
+                if build_cache.Contains(cache_key):
+                    if os.path.isdir(output_dir):
+                        FileSystem.RemoveTree(output_dir)
+
+                    # The build output is copied rather than linked, as it is often modified by
+                    # the steps that follow a build (deployment, compression, etc.).
+                    is_restored = build_cache.Restore(cache_key, output_dir, use_links=False)
+
+                this_dm.stream.write(
+                    "Cache {} ({}).\n".format("hit" if is_restored else "miss", cache_key),
+                )
+
+            if is_restored:
+                dm.stream.write("\nCompleted in {:.1f} seconds.\n".format(time.perf_counter() - start))
+                return dm.result
+
+        dm.stream.write("Running 'npm run build'...")
+        with dm.stream.DoneManager() as this_dm:
+            this_dm.result, lines = ProcessRunner.Run(
+                "npm run build",
+                cwd=working_dir,
+                output_stream=this_dm.stream if verbose else None,
+            )
+
+            if this_dm.result != 0:
+                if not verbose:
+                    this_dm.stream.write("".join("{}\n".format(line) for line in lines))
+
+                return this_dm.result
+
+        if build_cache is not None:
+            if not os.path.isdir(output_dir):
+                dm.stream.write("WARNING: '{}' was not created by the build.\n".format(output_dir))
+            else:
+                dm.stream.write("Storing '{}' in the cache...".format(output_dir))
+                with dm.stream.DoneManager():
+                    build_cache.Store(cache_key, output_dir)
+
+        dm.stream.write("\nCompleted in {:.1f} seconds.\n".format(time.perf_counter() - start))
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def CreateFingerprint(working_dir, node_version):
+    """Returns a key based on the inputs to the build"""
+
+    relative_filenames = []
+
+    for input_dir in INPUT_DIRS:
+        for root, directories, filenames in os.walk(os.path.join(working_dir, input_dir)):
+            directories.sort()
+
+            for filename in sorted(filenames):
+                relative_filenames.append(
+                    os.path.relpath(os.path.join(root, filename), working_dir).replace(os.path.sep, "/"),
+                )
+
+    for filename in INPUT_FILENAMES:
+        if os.path.isfile(os.path.join(working_dir, filename)):
+            relative_filenames.append(filename)
+
+    # Environment files read by '@snowpack/plugin-dotenv'
+    relative_filenames += sorted(
+        filename
+        for filename in os.listdir(working_dir)
+        if filename.startswith(".env") and os.path.isfile(os.path.join(working_dir, filename))
+    )
+
+    return DirectoryCache.CreateKey(
+        [os.path.join(working_dir, filename) for filename in relative_filenames],
+        node_version,
+        os.getenv("NODE_ENV", ""),
+        root_dir=working_dir,
+    )
+
+
+# ----------------------------------------------------------------------
+def _GetNodeVersion():
+    try:
+        return subprocess.check_output(
+            "node --version",
+            shell=True,
+            stderr=subprocess.STDOUT,
+        ).decode("utf-8").strip()
+    except subprocess.CalledProcessError:
+        return None
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(
+            CommandLine.Main()
+        )
+    except KeyboardInterrupt:
+        pass
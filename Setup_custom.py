@@ -133,10 +133,53 @@ def GetCustomActions(debug, verbose, explicit_configurations):
         install_filename = os.path.join(this_dir, "Install.7z")
         assert os.path.isfile(install_filename), install_filename
 
+        # The archive is verified here (with a multi-threaded hashing engine and a cache keyed
+        # by the archive's size and modification time) rather than by AcquireBinaries.py via
+        # '/unique_id_is_hash'.
+        actions += [
+            CurrentShell.Commands.Execute(
+                'python "{script}" Verify "{filename}" "{version}"'.format(
+                    script=os.path.join(_script_dir, "_archive_hash.py"),
+                    filename=install_filename,
+                    version=version,
+                ),
+            ),
+            CurrentShell.Commands.ExitOnError(),
+        ]
+
+        if os.getenv("COMMON_NODEJS_LAZY_TOOLCHAIN", "0") == "1":
+            # Register the archive rather than extracting it; the archive is extracted the first
+            # time that node, npm, or npx is invoked (see _lazy_toolchain.py).
+            actions += [
+                CurrentShell.Commands.Execute(
+                    'python "{script}" Register "{name}" "{filename}" "{dir}" "{version}"'.format(
+                        script=os.path.join(_script_dir, "_lazy_toolchain.py"),
+                        name=name,
+                        filename=install_filename,
+                        dir=this_dir,
+                        version=version,
+                    ),
+                ),
+            ]
+
+            continue
+
+        # Remove the registration of a toolchain that was previously set up for lazy
+        # extraction so that activation doesn't use its shims.
+        actions += [
+            CurrentShell.Commands.Execute(
+                'python "{script}" Unregister "{dir}"'.format(
+                    script=os.path.join(_script_dir, "_lazy_toolchain.py"),
+                    dir=this_dir,
+                ),
+            ),
+            CurrentShell.Commands.ExitOnError(),
+        ]
+
         # Install the file
         actions += [
             CurrentShell.Commands.Execute(
-                'python "{script}" Install "{name}" "{uri}" "{dir}" "/unique_id={version}" /unique_id_is_hash'.format(
+                'python "{script}" Install "{name}" "{uri}" "{dir}" "/unique_id={version}"'.format(
                     script=os.path.join(
                         os.getenv("DEVELOPMENT_ENVIRONMENT_FUNDAMENTAL"),
                         "RepositoryBootstrap",
@@ -151,6 +194,36 @@ def GetCustomActions(debug, verbose, explicit_configurations):
                     version=version,
                 ),
             ),
+            # Record the installed content so that activation can verify it cheaply
+            CurrentShell.Commands.Execute(
+                'python "{script}" Create "{dir}" "{version}"'.format(
+                    script=os.path.join(_script_dir, "_verification_manifest.py"),
+                    dir=this_dir,
+                    version=version,
+                ),
+            ),
+        ]
+
+    if os.getenv("COMMON_NODEJS_TEMPLATE_SNAPSHOT", "0") == "1":
+        # Build the 'node_modules' snapshot used when creating projects from 'Templates' (see
+        # Scripts/NpmScaffold.py) now rather than when the first project is created.
+        _, _, path_parts = _CUSTOM_DATA[-1]
+        this_dir = os.path.join(*[_script_dir] + path_parts)
+
+        if os.getenv("COMMON_NODEJS_LAZY_TOOLCHAIN", "0") == "1":
+            node_dir = os.path.join(_script_dir, "Generated", "LazyToolchainShims", "_".join(path_parts))
+        elif CurrentShell.CategoryName == "Windows":
+            node_dir = this_dir
+        else:
+            node_dir = os.path.join(this_dir, "bin")
+
+        actions += [
+            CurrentShell.Commands.AugmentPath(node_dir),
+            CurrentShell.Commands.Execute(
+                'python "{script}" BuildSnapshot'.format(
+                    script=os.path.join(_script_dir, "Scripts", "NpmScaffold.py"),
+                ),
+            ),
         ]
 
     return actions
@@ -0,0 +1,290 @@
+# ----------------------------------------------------------------------
+# |
+# |  _archive_hash.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 13:48:27
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Hashes (and verifies) large archives used by Setup_custom.py.
+
+I/O and hashing are pipelined across threads: a reader thread fills a small pool of large
+buffers (or walks a memory map) while the calling thread hashes the previous chunk. Both
+file reads and hashlib release the GIL for large buffers, so the work overlaps. Results are
+cached against the file's size and modification time.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import sys
+import threading
+
+from six.moves import queue
+
+import CommonEnvironment
+from CommonEnvironment import CommandLine
+from CommonEnvironment.StreamDecorator import StreamDecorator
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = CommonEnvironment.ThisFullpath()
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+DEFAULT_CACHE_FILENAME                      = os.path.join(_script_dir, "Generated", "ArchiveHashes.json")
+DEFAULT_CHUNK_SIZE                          = 8 * 1024 * 1024
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    filename=CommandLine.EntryPoint.Parameter("Archive to verify"),
+    expected_hash=CommandLine.EntryPoint.Parameter("Expected hex digest of the archive"),
+    algorithm=CommandLine.EntryPoint.Parameter("Hash algorithm"),
+    no_cache=CommandLine.EntryPoint.Parameter("Always hash the file, ignoring cached results"),
+)
+@CommandLine.Constraints(
+    filename=CommandLine.FilenameTypeInfo(),
+    expected_hash=CommandLine.StringTypeInfo(),
+    algorithm=CommandLine.StringTypeInfo(
+        arity="?",
+    ),
+    output_stream=None,
+)
+def Verify(
+    filename,
+    expected_hash,
+    algorithm="sha256",
+    no_cache=False,
+    output_stream=sys.stdout,
+):
+    """Verifies that the archive's content matches the expected hash"""
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        dm.stream.write("Verifying '{}'...".format(filename))
+        with dm.stream.DoneManager() as this_dm:
+            actual_hash = HashFile(
+                filename,
+                algorithm=algorithm,
+                cache_filename=None if no_cache else DEFAULT_CACHE_FILENAME,
+            )
+
+            if actual_hash.lower() != expected_hash.lower():
+                this_dm.stream.write(
+                    "ERROR: The hash '{}' does not match the expected value '{}'.\n".format(
+                        actual_hash,
+                        expected_hash,
+                    ),
+                )
+                this_dm.result = -1
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def HashFile(
+    filename,
+    algorithm="sha256",
+    cache_filename=DEFAULT_CACHE_FILENAME,
+    use_mmap=True,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+):
+    """Returns the hex digest of the file, using a cached value when the file hasn't changed"""
+
+    filename = os.path.realpath(filename)
+    stat_result = os.stat(filename)
+
+    cache_key = "{}:{}".format(algorithm, filename)
+    cache_value = [stat_result.st_size, stat_result.st_mtime_ns]
+
+    cache = _ReadCache(cache_filename) if cache_filename else {}
+
+    cached = cache.get(cache_key, None)
+    if cached is not None and cached[:2] == cache_value:
+        return cached[2]
+
+    digest = None
+
+    if use_mmap:
+        try:
+            digest = HashFileMmap(filename, algorithm, chunk_size)
+        except (OSError, ValueError, OverflowError):
+            # The file can't be mapped (for example, it is too large for the address space)
+            pass
+
+    if digest is None:
+        digest = HashFilePipelined(filename, algorithm, chunk_size)
+
+    if cache_filename:
+        # Re-read the cache in case it was updated by another process in the meantime
+        cache = _ReadCache(cache_filename)
+        cache[cache_key] = cache_value + [digest]
+
+        _WriteCache(cache_filename, cache)
+
+    return digest
+
+
+# ----------------------------------------------------------------------
+def HashFilePipelined(
+    filename,
+    algorithm="sha256",
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    num_buffers=3,
+):
+    """Hashes the file with large reads performed on a separate thread"""
+
+    hasher = hashlib.new(algorithm)
+
+    buffers = [bytearray(chunk_size) for _ in range(num_buffers)]
+
+    free_buffers = queue.Queue()
+    for index in range(num_buffers):
+        free_buffers.put(index)
+
+    filled_buffers = queue.Queue()
+    exceptions = []
+
+    # ----------------------------------------------------------------------
+    def Reader():
+        try:
+            with open(filename, "rb", buffering=0) as f:
+                while True:
+                    index = free_buffers.get()
+
+                    # The consumer stopped (it completed or raised an exception)
+                    if index is None:
+                        break
+
+                    num_read = f.readinto(buffers[index])
+                    if not num_read:
+                        break
+
+                    filled_buffers.put((index, num_read))
+
+        except Exception as ex:
+            exceptions.append(ex)
+
+        finally:
+            filled_buffers.put(None)
+
+    # ----------------------------------------------------------------------
+
+    # The thread is a daemon so that it can never keep the process alive
+    thread = threading.Thread(target=Reader)
+    thread.daemon = True
+    thread.start()
+
+    try:
+        while True:
+            item = filled_buffers.get()
+            if item is None:
+                break
+
+            index, num_read = item
+
+            hasher.update(memoryview(buffers[index])[:num_read])
+            free_buffers.put(index)
+
+    finally:
+        # Wake the reader if it is waiting for a buffer that the consumer will never return
+        # (for example, when `hasher.update` is interrupted by Ctrl+C).
+        free_buffers.put(None)
+        thread.join()
+
+    if exceptions:
+        raise exceptions[0]
+
+    return hasher.hexdigest()
+
+
+# ----------------------------------------------------------------------
+def HashFileMmap(
+    filename,
+    algorithm="sha256",
+    chunk_size=DEFAULT_CHUNK_SIZE,
+):
+    """Hashes the file through a memory map, asking the OS to read ahead of the hasher"""
+
+    hasher = hashlib.new(algorithm)
+
+    with open(filename, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return hasher.hexdigest()
+
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            madvise = getattr(mapped, "madvise", None)
+
+            if madvise is not None and hasattr(mmap, "MADV_SEQUENTIAL"):
+                madvise(mmap.MADV_SEQUENTIAL)
+
+            view = memoryview(mapped)
+            try:
+                for offset in range(0, size, chunk_size):
+                    next_offset = offset + chunk_size
+
+                    # Prefetch the next chunk while this one is hashed
+                    if madvise is not None and hasattr(mmap, "MADV_WILLNEED") and next_offset < size:
+                        madvise(mmap.MADV_WILLNEED, next_offset, min(chunk_size, size - next_offset))
+
+                    hasher.update(view[offset:next_offset])
+            finally:
+                view.release()
+
+        finally:
+            mapped.close()
+
+    return hasher.hexdigest()
+
+
+# ----------------------------------------------------------------------
+def _ReadCache(cache_filename):
+    if not os.path.isfile(cache_filename):
+        return {}
+
+    try:
+        with open(cache_filename) as f:
+            return json.load(f)
+    except ValueError:
+        return {}
+
+
+# ----------------------------------------------------------------------
+def _WriteCache(cache_filename, cache):
+    dirname = os.path.dirname(cache_filename)
+    if not os.path.isdir(dirname):
+        os.makedirs(dirname)
+
+    temp_filename = "{}.{}".format(cache_filename, os.getpid())
+
+    with open(temp_filename, "w") as f:
+        json.dump(cache, f)
+
+    os.replace(temp_filename, cache_filename)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(
+            CommandLine.Main()
+        )
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,405 @@
+# ----------------------------------------------------------------------
+# |
+# |  _lazy_toolchain.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 14:31:09
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Lazy materialization of the Node toolchains listed in _custom_data.py.
+
+When the environment variable 'COMMON_NODEJS_LAZY_TOOLCHAIN' is set to '1' during Setup,
+archives are registered rather than extracted and shims for 'node', 'npm', and 'npx' are
+generated. The first time a shim is invoked, the archive is extracted (with progress); after
+that, the shims are replaced with links to the extracted binaries so that subsequent invocations
+don't pay for an additional shell process (on Windows, 'node.exe' is hard linked alongside the
+'node.cmd' shim; 'npm' and 'npx' are batch files and are called within the shim's process).
+
+The archive is extracted to a temporary sibling directory and its content is moved into the
+tool directory once extraction succeeds. A completion marker is written after the content and
+its verification manifest are in place; the toolchain is only considered to be materialized
+when the marker exists, so an interrupted extraction is never mistaken for a complete one.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import textwrap
+import time
+
+import CommonEnvironment
+from CommonEnvironment import CommandLine
+from CommonEnvironment.Shell.All import CurrentShell
+from CommonEnvironment.StreamDecorator import StreamDecorator
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = CommonEnvironment.ThisFullpath()
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+import _verification_manifest
+
+# ----------------------------------------------------------------------
+REGISTRATION_FILENAME                       = ".lazy_toolchain.json"
+LOCK_FILENAME                               = ".lazy_toolchain.lock"
+COMPLETE_FILENAME                           = ".lazy_toolchain.complete"
+
+SHIMS_ROOT                                  = os.path.join(_script_dir, "Generated", "LazyToolchainShims")
+
+TOOL_NAMES                                  = ["node", "npm", "npx"]
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    name=CommandLine.EntryPoint.Parameter("Name of the toolchain"),
+    archive=CommandLine.EntryPoint.Parameter("Archive that contains the toolchain"),
+    tool_dir=CommandLine.EntryPoint.Parameter("Directory where the toolchain will be extracted"),
+    version=CommandLine.EntryPoint.Parameter("Version (unique id) of the toolchain"),
+)
+@CommandLine.Constraints(
+    name=CommandLine.StringTypeInfo(),
+    archive=CommandLine.FilenameTypeInfo(),
+    tool_dir=CommandLine.DirectoryTypeInfo(),
+    version=CommandLine.StringTypeInfo(),
+    output_stream=None,
+)
+def Register(
+    name,
+    archive,
+    tool_dir,
+    version,
+    output_stream=sys.stdout,
+):
+    """Registers the archive for lazy extraction and generates shims"""
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        dm.stream.write("Registering '{}'...".format(name))
+        with dm.stream.DoneManager():
+            # Content extracted for a different version must be extracted again
+            if os.path.isfile(os.path.join(tool_dir, COMPLETE_FILENAME)) and not IsMaterialized(tool_dir, version):
+                os.remove(os.path.join(tool_dir, COMPLETE_FILENAME))
+
+            with open(os.path.join(tool_dir, REGISTRATION_FILENAME), "w") as f:
+                json.dump(
+                    {
+                        "name": name,
+                        "archive": os.path.realpath(archive),
+                        "version": version,
+                    },
+                    f,
+                )
+
+            _CreateShims(tool_dir)
+
+            if IsMaterialized(tool_dir, version):
+                _LinkShims(tool_dir)
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    tool_dir=CommandLine.EntryPoint.Parameter("Directory of a toolchain that may have been registered"),
+)
+@CommandLine.Constraints(
+    tool_dir=CommandLine.DirectoryTypeInfo(),
+    output_stream=None,
+)
+def Unregister(
+    tool_dir,
+    output_stream=sys.stdout,
+):
+    """Removes the registration, completion marker, and shims (invoked when the toolchain is installed eagerly)"""
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        for filename in [REGISTRATION_FILENAME, COMPLETE_FILENAME]:
+            filename = os.path.join(tool_dir, filename)
+
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+        shims_dir = GetShimsDir(tool_dir)
+
+        if os.path.isdir(shims_dir):
+            shutil.rmtree(shims_dir)
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    tool_dir=CommandLine.EntryPoint.Parameter("Directory of a registered toolchain"),
+)
+@CommandLine.Constraints(
+    tool_dir=CommandLine.DirectoryTypeInfo(),
+    output_stream=None,
+)
+def Materialize(
+    tool_dir,
+    output_stream=sys.stderr,
+):
+    """Extracts a registered toolchain (invoked by the shims on first use)"""
+
+    # Output is written to stderr by default so that it doesn't interfere with the output of
+    # the tool that was invoked.
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        registration = ReadRegistration(tool_dir)
+        if registration is None:
+            dm.stream.write("ERROR: '{}' has not been registered.\n".format(tool_dir))
+            dm.result = -1
+
+            return dm.result
+
+        lock_filename = os.path.join(tool_dir, LOCK_FILENAME)
+
+        # Another process may be extracting the toolchain
+        while True:
+            if IsMaterialized(tool_dir, registration["version"]):
+                return dm.result
+
+            try:
+                lock_handle = os.open(lock_filename, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except OSError:
+                # Assume that a lock that is older than 10 minutes was abandoned
+                try:
+                    if time.time() - os.path.getmtime(lock_filename) > 10 * 60:
+                        os.remove(lock_filename)
+                        continue
+                except OSError:
+                    pass
+
+                time.sleep(0.25)
+
+        temp_dir = "{}.extracting".format(tool_dir)
+
+        try:
+            # Remove the content of an extraction that was interrupted
+            if os.path.isdir(temp_dir):
+                shutil.rmtree(temp_dir)
+
+            dm.stream.write("Extracting '{}' (first use)...".format(registration["name"]))
+            with dm.stream.DoneManager() as this_dm:
+                this_dm.result = _Extract(registration["archive"], temp_dir, this_dm.stream)
+                if this_dm.result != 0:
+                    return this_dm.result
+
+                # Move the content into place; content that exists was moved by an attempt
+                # that was interrupted before it could write the completion marker.
+                for item in os.listdir(temp_dir):
+                    dest = os.path.join(tool_dir, item)
+
+                    if os.path.isdir(dest) and not os.path.islink(dest):
+                        shutil.rmtree(dest)
+                    elif os.path.lexists(dest):
+                        os.remove(dest)
+
+                    os.rename(os.path.join(temp_dir, item), dest)
+
+            dm.stream.write("Creating the verification manifest...")
+            with dm.stream.DoneManager():
+                _verification_manifest.CreateManifest(tool_dir, registration["version"])
+
+            with open(os.path.join(tool_dir, COMPLETE_FILENAME), "w") as f:
+                f.write(registration["version"])
+
+            _LinkShims(tool_dir)
+
+        finally:
+            if os.path.isdir(temp_dir):
+                shutil.rmtree(temp_dir)
+
+            os.close(lock_handle)
+            os.remove(lock_filename)
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def ReadRegistration(tool_dir):
+    filename = os.path.join(tool_dir, REGISTRATION_FILENAME)
+    if not os.path.isfile(filename):
+        return None
+
+    with open(filename) as f:
+        return json.load(f)
+
+
+# ----------------------------------------------------------------------
+def IsMaterialized(tool_dir, version=None):
+    """Returns True if the toolchain was extracted completely (for `version`, if provided)"""
+
+    filename = os.path.join(tool_dir, COMPLETE_FILENAME)
+    if not os.path.isfile(filename):
+        return False
+
+    if version is None:
+        return True
+
+    with open(filename) as f:
+        return f.read() == version
+
+
+# ----------------------------------------------------------------------
+def GetShimsDir(tool_dir):
+    # This value must remain in sync with the shims directory in Activate_custom.py
+    return os.path.join(
+        SHIMS_ROOT,
+        os.path.relpath(tool_dir, _script_dir).replace(os.path.sep, "_"),
+    )
+
+
+# ----------------------------------------------------------------------
+def _GetToolFilename(tool_dir, tool_name):
+    if CurrentShell.CategoryName == "Windows":
+        return os.path.join(tool_dir, "node.exe" if tool_name == "node" else "{}.cmd".format(tool_name))
+
+    return os.path.join(tool_dir, "bin", tool_name)
+
+
+# ----------------------------------------------------------------------
+def _CreateShims(tool_dir):
+    shims_dir = GetShimsDir(tool_dir)
+
+    if os.path.isdir(shims_dir):
+        shutil.rmtree(shims_dir)
+
+    os.makedirs(shims_dir)
+
+    for tool_name in TOOL_NAMES:
+        tool_filename = _GetToolFilename(tool_dir, tool_name)
+
+        if CurrentShell.CategoryName == "Windows":
+            shim_filename = os.path.join(shims_dir, "{}.cmd".format(tool_name))
+
+            content = textwrap.dedent(
+                """\
+                @echo off
+                if not exist "{complete}" (
+                    python "{script}" Materialize "{tool_dir}" || exit /b
+                )
+                call "{tool}" %*
+                """,
+            )
+        else:
+            shim_filename = os.path.join(shims_dir, tool_name)
+
+            content = textwrap.dedent(
+                """\
+                #!/bin/sh
+                if [ ! -f "{complete}" ]; then
+                    python "{script}" Materialize "{tool_dir}" || exit $?
+                fi
+                exec "{tool}" "$@"
+                """,
+            )
+
+        with open(shim_filename, "w") as f:
+            f.write(
+                content.format(
+                    complete=os.path.join(tool_dir, COMPLETE_FILENAME),
+                    script=_script_fullpath,
+                    tool_dir=tool_dir,
+                    tool=tool_filename,
+                ),
+            )
+
+        if CurrentShell.CategoryName != "Windows":
+            os.chmod(shim_filename, 0o755)
+
+
+# ----------------------------------------------------------------------
+def _LinkShims(tool_dir):
+    """Replaces the shims with links to the extracted binaries"""
+
+    shims_dir = GetShimsDir(tool_dir)
+
+    if CurrentShell.CategoryName == "Windows":
+        # The 'node.cmd' shim may be running (it invokes Materialize), so it can't be removed;
+        # 'node.exe' takes precedence over 'node.cmd' in the same directory. Hard links require
+        # the shims directory and the tool directory to be on the same volume; the shim is
+        # used when that isn't the case.
+        shim_filename = os.path.join(shims_dir, "node.exe")
+
+        if not os.path.isfile(shim_filename):
+            try:
+                os.link(_GetToolFilename(tool_dir, "node"), shim_filename)
+            except OSError:
+                pass
+
+        return
+
+    for tool_name in TOOL_NAMES:
+        shim_filename = os.path.join(shims_dir, tool_name)
+        temp_filename = "{}.{}.tmp".format(shim_filename, os.getpid())
+
+        # Replace the shim atomically, as it may be in use by other processes
+        os.symlink(_GetToolFilename(tool_dir, tool_name), temp_filename)
+        os.replace(temp_filename, shim_filename)
+
+
+# ----------------------------------------------------------------------
+def _Extract(archive, tool_dir, output_stream):
+    """Extracts the archive with 7zip, streaming its progress output"""
+
+    for executable in ["7z", "7za", "7zr"]:
+        executable = shutil.which(executable)
+        if executable:
+            break
+    else:
+        output_stream.write("ERROR: 7zip ('7z', '7za', or '7zr') was not found.\n")
+        return -1
+
+    process = subprocess.Popen(
+        [executable, "x", "-y", "-bsp1", "-bso0", "-o{}".format(tool_dir), archive],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+
+    # 7zip updates its progress in place with backspaces; display each update as it arrives
+    while True:
+        content = process.stdout.read1(4096) if hasattr(process.stdout, "read1") else process.stdout.read(4096)
+        if not content:
+            break
+
+        output_stream.write(content.decode("utf-8", errors="replace").replace("\b\b\b\b", " ").replace("\b", "").replace("\r\n", "\n"))
+        output_stream.flush()
+
+    process.stdout.close()
+
+    return process.wait()
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(
+            CommandLine.Main()
+        )
+    except KeyboardInterrupt:
+        pass
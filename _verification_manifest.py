@@ -0,0 +1,386 @@
+# ----------------------------------------------------------------------
+# |
+# |  _verification_manifest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 13:20:52
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Creates and verifies manifests of installed tool directories (used by Setup_custom.py and
+Activate_custom.py).
+
+A manifest records the size, modification time, and hash of every file in a tool directory
+when it is installed. Verification compares a stat-based fingerprint with the manifest and
+only re-hashes files whose size or modification time has changed, which is much cheaper than
+verifying the entire directory during every activation.
+
+Files added to the tool directory after it was installed are not errors, as 'npm install -g'
+installs packages into the toolchain. Files added to the global package directories are ignored
+and any other added files are reported as warnings.
+"""
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+
+import CommonEnvironment
+from CommonEnvironment.CallOnExit import CallOnExit
+from CommonEnvironment import CommandLine
+from CommonEnvironment.StreamDecorator import StreamDecorator
+
+# ----------------------------------------------------------------------
+_script_fullpath                            = CommonEnvironment.ThisFullpath()
+_script_dir, _script_name                   = os.path.split(_script_fullpath)
+# ----------------------------------------------------------------------
+
+sys.path.insert(0, os.path.join(_script_dir, "Scripts"))
+from Impl.Metrics import Metrics
+del sys.path[0]
+
+MANIFEST_FILENAME                           = ".verification_manifest.json"
+MANIFEST_FORMAT_VERSION                     = 1
+
+# When set, Verify writes metrics for each tool to this directory (as Prometheus textfile-collector
+# files unless 'COMMON_NODEJS_METRICS_FORMAT' is set to 'json').
+METRICS_DIR_ENVIRONMENT_VARIABLE            = "COMMON_NODEJS_METRICS_DIR"
+METRICS_FORMAT_ENVIRONMENT_VARIABLE         = "COMMON_NODEJS_METRICS_FORMAT"
+
+# Files in the tool directory that are not part of the installed content
+EXCLUDED_FILENAMES                          = set(
+    [
+        MANIFEST_FILENAME,
+        MANIFEST_FILENAME + ".tmp",
+        "Install.7z",
+        ".lazy_toolchain.json",
+        ".lazy_toolchain.lock",
+        ".lazy_toolchain.complete",
+    ],
+)
+
+# Directories (relative to the tool directory) populated by 'npm install -g'; files added to these
+# directories after the manifest was created are ignored ('lib/node_modules' and 'bin' on Linux
+# and macOS, 'node_modules' on Windows).
+GLOBAL_PACKAGE_DIRS                         = [
+    "lib/node_modules/",
+    "bin/",
+    "node_modules/",
+]
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    tool_dir=CommandLine.EntryPoint.Parameter("Directory that contains the installed tool"),
+    version=CommandLine.EntryPoint.Parameter("Version (unique id) of the installed content"),
+)
+@CommandLine.Constraints(
+    tool_dir=CommandLine.DirectoryTypeInfo(),
+    version=CommandLine.StringTypeInfo(),
+    output_stream=None,
+)
+def Create(
+    tool_dir,
+    version,
+    output_stream=sys.stdout,
+):
+    """Creates a manifest for the content of the tool directory"""
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        dm.stream.write("Creating the verification manifest for '{}'...".format(tool_dir))
+        with dm.stream.DoneManager():
+            CreateManifest(tool_dir, version)
+
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+@CommandLine.EntryPoint(
+    name=CommandLine.EntryPoint.Parameter("Name of the tool"),
+    tool_dir=CommandLine.EntryPoint.Parameter("Directory that contains the installed tool"),
+    version=CommandLine.EntryPoint.Parameter("Version (unique id) of the installed content"),
+    metrics_filename=CommandLine.EntryPoint.Parameter("Write the wall time, CPU time, and peak RSS of each verification phase to this file ('.prom' for a Prometheus textfile-collector file, json otherwise)"),
+)
+@CommandLine.Constraints(
+    name=CommandLine.StringTypeInfo(),
+    tool_dir=CommandLine.DirectoryTypeInfo(),
+    version=CommandLine.StringTypeInfo(),
+    metrics_filename=CommandLine.FilenameTypeInfo(
+        ensure_exists=False,
+        arity="?",
+    ),
+    output_stream=None,
+)
+def Verify(
+    name,
+    tool_dir,
+    version,
+    metrics_filename=None,
+    output_stream=sys.stdout,
+):
+    """\
+    Verifies the tool directory against its manifest. When a manifest doesn't exist (or was
+    created for a different version), the full verification provided by AcquireBinaries.py is
+    performed and a manifest is created if that verification succeeds.
+    """
+
+    if metrics_filename is None and os.getenv(METRICS_DIR_ENVIRONMENT_VARIABLE):
+        metrics_filename = os.path.join(
+            os.getenv(METRICS_DIR_ENVIRONMENT_VARIABLE),
+            "common_nodejs_verify_{}.{}".format(
+                re.sub(r"[^a-zA-Z0-9_.]+", "_", name).strip("_"),
+                "json" if os.getenv(METRICS_FORMAT_ENVIRONMENT_VARIABLE) == "json" else "prom",
+            ),
+        )
+
+    metrics = Metrics(
+        "Verify",
+        tool=name,
+    )
+
+    if metrics_filename:
+        write_metrics_func = lambda: metrics.Write(metrics_filename)
+    else:
+        write_metrics_func = lambda: None
+
+    with CallOnExit(write_metrics_func), metrics.Phase("total"):
+        return _Verify(name, tool_dir, version, metrics, output_stream)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def CreateManifest(tool_dir, version):
+    files = {}
+
+    for relative_path, result in _EnumFiles(tool_dir):
+        files[relative_path] = [
+            result.st_size,
+            result.st_mtime_ns,
+            _HashFile(os.path.join(tool_dir, relative_path)),
+        ]
+
+    _WriteManifest(
+        tool_dir,
+        {
+            "format_version": MANIFEST_FORMAT_VERSION,
+            "version": version,
+            "fingerprint": _CalculateFingerprint(
+                (relative_path, size, mtime) for relative_path, (size, mtime, _) in files.items()
+            ),
+            "files": files,
+        },
+    )
+
+
+# ----------------------------------------------------------------------
+def ReadManifest(tool_dir, version):
+    """Returns the manifest or None if it doesn't exist or doesn't apply to this version"""
+
+    filename = os.path.join(tool_dir, MANIFEST_FILENAME)
+    if not os.path.isfile(filename):
+        return None
+
+    try:
+        with open(filename) as f:
+            manifest = json.load(f)
+    except ValueError:
+        return None
+
+    if manifest.get("format_version", None) != MANIFEST_FORMAT_VERSION:
+        return None
+
+    if manifest.get("version", None) != version:
+        return None
+
+    return manifest
+
+
+# ----------------------------------------------------------------------
+def VerifyManifest(tool_dir, manifest):
+    """\
+    Returns (errors, warnings); files that were touched but not modified are updated in the
+    manifest. Files that were added to the tool directory after the manifest was created are
+    warnings (or ignored when they are in a global package directory).
+    """
+
+    stats = dict(_EnumFiles(tool_dir))
+    errors = []
+    warnings = []
+
+    for relative_path in manifest["files"].keys():
+        if relative_path not in stats:
+            errors.append("'{}' does not exist".format(relative_path))
+
+    for relative_path in sorted(set(stats) - set(manifest["files"])):
+        if not any(relative_path.startswith(global_dir) for global_dir in GLOBAL_PACKAGE_DIRS):
+            warnings.append("'{}' has been added".format(relative_path))
+
+    if errors:
+        return errors, warnings
+
+    # Only the files in the manifest contribute to the fingerprint, so that added files don't
+    # cause the content to be re-hashed during every activation.
+    fingerprint = _CalculateFingerprint(
+        (relative_path, stats[relative_path].st_size, stats[relative_path].st_mtime_ns)
+        for relative_path in manifest["files"].keys()
+    )
+
+    if fingerprint == manifest["fingerprint"]:
+        return [], warnings
+
+    # Re-hash the files that appear to have changed
+    updated = False
+
+    for relative_path, (size, mtime, hash_value) in manifest["files"].items():
+        result = stats[relative_path]
+
+        if result.st_size == size and result.st_mtime_ns == mtime:
+            continue
+
+        if result.st_size != size or _HashFile(os.path.join(tool_dir, relative_path)) != hash_value:
+            errors.append("'{}' has been modified".format(relative_path))
+            continue
+
+        # The content is the same; record the new modification time so that this file isn't
+        # hashed again.
+        manifest["files"][relative_path] = [size, result.st_mtime_ns, hash_value]
+        updated = True
+
+    if updated and not errors:
+        manifest["fingerprint"] = fingerprint
+        _WriteManifest(tool_dir, manifest)
+
+    return errors, warnings
+
+
+# ----------------------------------------------------------------------
+def _Verify(name, tool_dir, version, metrics, output_stream):
+    with metrics.Phase("read_manifest"):
+        manifest = ReadManifest(tool_dir, version)
+
+    if manifest is None:
+        with metrics.Phase("acquire_binaries_verify"):
+            result = subprocess.call(
+                [
+                    sys.executable,
+                    os.path.join(
+                        os.getenv("DEVELOPMENT_ENVIRONMENT_FUNDAMENTAL"),
+                        "RepositoryBootstrap",
+                        "SetupAndActivate",
+                        "AcquireBinaries.py",
+                    ),
+                    "Verify",
+                    name,
+                    tool_dir,
+                    version,
+                ],
+            )
+
+        if result == 0:
+            with metrics.Phase("create_manifest"):
+                CreateManifest(tool_dir, version)
+
+        return result
+
+    with metrics.Phase("verify_manifest"):
+        errors, warnings = VerifyManifest(tool_dir, manifest)
+
+    if warnings:
+        output_stream.write("WARNING: Files have been added to '{}' ({}) since it was installed:\n".format(tool_dir, name))
+
+        for warning in warnings:
+            output_stream.write("    - {}\n".format(warning))
+
+        output_stream.write("\n")
+
+    if not errors:
+        return 0
+
+    with StreamDecorator(output_stream).DoneManager(
+        line_prefix="",
+        prefix="\nResults: ",
+        suffix="\n",
+    ) as dm:
+        dm.stream.write("ERROR: The content of '{}' ({}) has changed:\n".format(tool_dir, name))
+
+        for error in errors:
+            dm.stream.write("    - {}\n".format(error))
+
+        dm.stream.write("\nPlease run Setup to restore the original content.\n")
+
+        dm.result = -1
+        return dm.result
+
+
+# ----------------------------------------------------------------------
+def _EnumFiles(tool_dir):
+    for root, _, filenames in os.walk(tool_dir):
+        for filename in filenames:
+            fullpath = os.path.join(root, filename)
+            relative_path = os.path.relpath(fullpath, tool_dir).replace(os.path.sep, "/")
+
+            if relative_path in EXCLUDED_FILENAMES or os.path.islink(fullpath):
+                continue
+
+            yield relative_path, os.stat(fullpath)
+
+
+# ----------------------------------------------------------------------
+def _CalculateFingerprint(items):
+    hasher = hashlib.sha256()
+
+    for relative_path, size, mtime in sorted(items):
+        hasher.update("{}\0{}\0{}\n".format(relative_path, size, mtime).encode("utf-8"))
+
+    return hasher.hexdigest()
+
+
+# ----------------------------------------------------------------------
+def _HashFile(filename):
+    hasher = hashlib.sha256()
+
+    with open(filename, "rb") as f:
+        while True:
+            content = f.read(1024 * 1024)
+            if not content:
+                break
+
+            hasher.update(content)
+
+    return hasher.hexdigest()
+
+
+# ----------------------------------------------------------------------
+def _WriteManifest(tool_dir, manifest):
+    filename = os.path.join(tool_dir, MANIFEST_FILENAME)
+    temp_filename = filename + ".tmp"
+
+    with open(temp_filename, "w") as f:
+        json.dump(manifest, f)
+
+    os.replace(temp_filename, filename)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    try:
+        sys.exit(
+            CommandLine.Main()
+        )
+    except KeyboardInterrupt:
+        pass